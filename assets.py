@@ -0,0 +1,385 @@
+"""
+Shared asset cache.
+
+- Images, sounds and fonts are loaded once and reused by every sprite and session.
+- Scaled variants are cached per (path, size) so restarts never touch the disk.
+- Tinted and rotated variants are cached per source surface, so only pass
+  long-lived cached surfaces: every new source adds entries that never go away.
+- Cached surfaces are shared: callers must copy() before modifying them.
+- Preloader decodes a batch of assets on a background thread (e.g. behind the intro
+  or while the level before the boss is still being played).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+import pygame
+
+# Posted by Preloader after each asset (and once more when finished)
+PRELOAD_PROGRESS = pygame.event.custom_type()
+
+_images = {}
+_sounds = {}
+_fonts = {}
+_texts = {}
+_rotations = {}
+_tints = {}
+_pending = []  # Preloaders that have started but not been collected yet
+_mute_depth = 0  # > 0 while inside muted()
+_sound_hook = None  # Set by redirect_sounds()
+
+# Lookup / miss counters per cache (read by the metrics endpoint)
+cache_lookups = {"images": 0, "rotations": 0, "texts": 0}
+cache_misses = {"images": 0, "rotations": 0, "texts": 0}
+
+
+def image_key(path, size=None, alpha=True, smooth=False):
+    """
+    Normalized cache key for an image request (see load_image()).
+    """
+    return (path, size, alpha, smooth)
+
+
+def _scale(image, size, smooth):
+    """
+    Scale a surface to size; a height of None keeps the aspect ratio.
+    """
+    if size is None:
+        return image
+    width, height = size
+    if height is None:
+        height = int(width * (image.get_height() / image.get_width()))
+    scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+    return scale(image, (width, height))
+
+
+def load_image(path, size=None, alpha=True, smooth=False):
+    """
+    Load (and optionally scale) an image, returning the cached surface.
+
+    If a running Preloader has already decoded this image, takes it from
+    there. Otherwise decodes it right away: it never waits for the rest of
+    a Preloader's batch.
+
+    Both paths scale the decoded file first and convert the scaled copy, so
+    a cache key holds the same pixels whichever path filled it.
+
+    Args:
+        path (str): Image file path.
+        size (tuple): Optional (width, height) to scale to. A height of None
+            scales to the given width and keeps the aspect ratio.
+        alpha (bool): Use convert_alpha() instead of convert().
+        smooth (bool): Use smoothscale instead of scale.
+
+    Returns:
+        Surface: Shared surface. Do not modify in place.
+    """
+    key = (path, size, alpha, smooth)
+    image = _images.get(key)
+    cache_lookups["images"] += 1
+    if image is None:
+        cache_misses["images"] += 1
+        for loader in list(_pending):
+            image = loader.take(key)
+            if image is not None:
+                return image
+
+        # Decode the full-size file without caching it; only the scaled copy is kept
+        image = _scale(pygame.image.load(path), size, smooth)
+        image = image.convert_alpha() if alpha else image.convert()
+        _images[key] = image
+    return image
+
+
+def rotate(image, angle, step=0):
+    """
+    Rotate an image, optionally reusing cached frames at quantized angles.
+
+    Args:
+        image (Surface): Source surface (should be a long-lived cached one).
+        angle (float): Counter-clockwise angle in degrees (as pygame.transform.rotate).
+        step (int): Quantization in degrees. 0 rotates exactly, uncached.
+
+    Returns:
+        Surface: Rotated surface. Shared when step > 0; do not modify.
+    """
+    if not step:
+        return pygame.transform.rotate(image, angle)
+
+    quantized = int(round(angle / step) * step) % 360
+    key = (image, quantized)
+    rotated = _rotations.get(key)
+    cache_lookups["rotations"] += 1
+    if rotated is None:
+        cache_misses["rotations"] += 1
+        rotated = pygame.transform.rotate(image, quantized)
+        _rotations[key] = rotated
+    return rotated
+
+
+def tint(image, color, flags=pygame.BLEND_RGBA_ADD):
+    """
+    Color-blended copy of an image, cached per (image, color, flags).
+
+    Args:
+        image (Surface): Source surface (a long-lived cached one).
+        color (tuple): RGBA value blended into every pixel.
+        flags (int): pygame blend mode (add by default, e.g. BLEND_RGBA_MULT to dye).
+
+    Returns:
+        Surface: Shared tinted surface; do not modify.
+    """
+    key = (image, color, flags)
+    tinted = _tints.get(key)
+    if tinted is None:
+        tinted = image.copy()
+        tinted.fill(color, special_flags=flags)
+        _tints[key] = tinted
+    return tinted
+
+
+def load_sound(path, volume=None):
+    """
+    Load a sound once and return the cached Sound.
+
+    Args:
+        path (str): Sound file path.
+        volume (float): Optional volume applied on first load.
+
+    Returns:
+        Sound: Shared sound object.
+    """
+    sound = _sounds.get(path)
+    if sound is None:
+        sound = pygame.mixer.Sound(path)
+        if volume is not None:
+            sound.set_volume(volume)
+        _sounds[path] = sound
+    return sound
+
+
+def play_sound(sound):
+    """
+    Play a sound unless playback is muted (see muted()) or redirected (see redirect_sounds()).
+    """
+    if _mute_depth:
+        return
+    if _sound_hook is not None:
+        _sound_hook(sound)
+    else:
+        sound.play()
+
+
+def redirect_sounds(hook):
+    """
+    Hand every play_sound() to hook(sound) instead of playing it.
+
+    Lets a simulation running in another process tell the renderer what to
+    play. Pass None to play sounds again.
+    """
+    global _sound_hook
+    _sound_hook = hook
+
+
+@contextmanager
+def muted():
+    """
+    Silence play_sound() inside the block, e.g. while simulating frames that are never shown.
+    """
+    global _mute_depth
+    _mute_depth += 1
+    try:
+        yield
+    finally:
+        _mute_depth -= 1
+
+
+def get_font(size, bold=False):
+    """
+    Return a cached system font (SysFont enumeration only happens once).
+
+    Args:
+        size (int): Point size.
+        bold (bool): Bold variant.
+
+    Returns:
+        Font: Shared font object.
+    """
+    key = (size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(None, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """
+    Render a piece of static text once and return the cached surface.
+
+    Only use this for text that doesn't change every frame (titles, captions);
+    every distinct string stays cached until clear().
+
+    Args:
+        font (Font): Font to render with.
+        text (str): Text to render.
+        color (tuple): RGB color.
+        antialias (bool): Antialiased rendering.
+
+    Returns:
+        Surface: Shared text surface.
+    """
+    key = (font, text, color, antialias)
+    surface = _texts.get(key)
+    cache_lookups["texts"] += 1
+    if surface is None:
+        cache_misses["texts"] += 1
+        surface = font.render(text, antialias, color)
+        _texts[key] = surface
+    return surface
+
+
+def clear():
+    """
+    Drop every cached asset (e.g. after the display is recreated).
+    """
+    _images.clear()
+    _sounds.clear()
+    _fonts.clear()
+    _texts.clear()
+    _rotations.clear()
+    _tints.clear()
+
+
+# --- Background Preloading ---
+
+class Preloader:
+    """
+    Decode fonts, sounds and images on a worker thread.
+
+    The worker only does the slow, display-independent part (font discovery,
+    mixer init, file decode and scaling). finish() runs on the main thread and
+    converts the decoded images to the display format before caching them.
+    """
+
+    def __init__(self, images=(), sounds=(), fonts=()):
+        """
+        Args:
+            images: Iterable of (path, size, alpha[, smooth]) tuples.
+            sounds: Iterable of (path, volume) tuples.
+            fonts: Iterable of (size, bold) tuples.
+        """
+        self.images = [key for key in (image_key(*item) for item in images) if key not in _images]
+        self.sounds = [item for item in sounds if item[0] not in _sounds]
+        self.fonts = [item for item in fonts if item not in _fonts]
+
+        self.total = len(self.images) + len(self.sounds) + len(self.fonts)
+        self.done = 0
+        self.finished = False
+        self.timings = {}
+
+        self._decoded = {}  # Image key -> decoded, scaled, not yet converted surface
+        self._error = None
+        self._collected = False
+        self._thread = threading.Thread(target=self._run, name="asset-preloader", daemon=True)
+
+    def start(self):
+        """Start the worker thread. Returns self for chaining."""
+        _pending.append(self)
+        self._thread.start()
+        return self
+
+    def poll(self):
+        """
+        Collect the results if the worker is done, without ever blocking.
+
+        Call once per frame while playing.
+
+        Returns:
+            bool: True once everything is in the cache.
+        """
+        if self._collected:
+            return True
+        if self.finished:
+            self.finish()
+            return True
+        return False
+
+    @property
+    def progress(self):
+        """Fraction of assets decoded, from 0.0 to 1.0."""
+        return self.done / self.total if self.total else 1.0
+
+    def _advance(self):
+        self.done += 1
+        pygame.event.post(pygame.event.Event(PRELOAD_PROGRESS, done=self.done, total=self.total))
+
+    def _run(self):
+        try:
+            start = time.perf_counter()
+            for size, bold in self.fonts:
+                get_font(size, bold)
+                self._advance()
+            self.timings["font discovery"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if self.sounds and not pygame.mixer.get_init():
+                pygame.mixer.init()
+            for path, volume in self.sounds:
+                load_sound(path, volume)
+                self._advance()
+            self.timings["audio init"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for key in self.images:
+                if key not in _images:  # Not already loaded on the main thread meanwhile
+                    path, size, alpha, smooth = key
+                    self._decoded[key] = _scale(pygame.image.load(path), size, smooth)
+                self._advance()
+            self.timings["asset decode"] = time.perf_counter() - start
+        except Exception as error:
+            self._error = error
+        finally:
+            self.finished = True
+            pygame.event.post(pygame.event.Event(PRELOAD_PROGRESS, done=self.done, total=self.total))
+
+    def take(self, key):
+        """
+        Convert and cache one image if the worker has already decoded it.
+
+        Never blocks, so a load_image() of one pending key doesn't wait for
+        the whole batch.
+
+        Returns:
+            Surface or None: The cached surface, None if it isn't decoded (yet).
+        """
+        image = self._decoded.pop(key, None)
+        if image is None:
+            return None
+        image = image.convert_alpha() if key[2] else image.convert()
+        _images[key] = image
+        return image
+
+    def finish(self):
+        """
+        Wait for the worker, then convert and cache the decoded images.
+
+        Returns:
+            dict: Phase name -> seconds.
+        """
+        if self._collected:
+            return self.timings
+        self._thread.join()
+        self._collected = True
+        if self in _pending:
+            _pending.remove(self)
+        if self._error is not None:
+            raise self._error
+
+        start = time.perf_counter()
+        for key, image in self._decoded.items():
+            if key not in _images:
+                _images[key] = image.convert_alpha() if key[2] else image.convert()
+        self._decoded.clear()
+        self.timings["convert"] = time.perf_counter() - start
+        return self.timings
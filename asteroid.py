@@ -9,12 +9,27 @@ Defines the Asteroid class for destructible, rotating, and splitting space rocks
 
 import pygame
 import random
+import assets
 from circleshape import CircleShape
 from constants import ASTEROID_MIN_RADIUS
 from devtools import SHOW_HITBOXES
+from governor import quality
+from profiler import profiled
+from telemetry import telemetry, SPLIT
 
 # --- Asteroid Tier System ---
 TIERS = [50, 20, 10]  # Large, Medium, Small
+VISUAL_SCALE = 3.5    # Image diameter relative to tier radius
+
+
+def image_size(base_radius):
+    """Scaled (width, height) of the asteroid image for a tier."""
+    diameter = int(base_radius * VISUAL_SCALE)
+    return (diameter, diameter)
+
+
+# Scaled images this module uses (preloaded at startup)
+IMAGES = [("assets/asteroid.png", image_size(radius)) for radius in TIERS]
 
 
 class Asteroid(CircleShape):
@@ -36,11 +51,8 @@ class Asteroid(CircleShape):
         self.base_radius = base_radius
         self.wrap_count = 0  # Track how many times the asteroid wraps around the screen
 
-        # Load and scale the asteroid image
-        original_image = pygame.image.load("assets/asteroid.png").convert_alpha()
-        visual_scale = 3.5
-        diameter = base_radius * visual_scale
-        self.image = pygame.transform.scale(original_image, (int(diameter), int(diameter)))
+        # Scaled asteroid image (shared through the asset cache)
+        self.image = assets.load_image("assets/asteroid.png", image_size(base_radius))
 
         # Set hitbox radius to half the final image size (for a perfect visual match)
         self.radius = self.image.get_width() // 2.2
@@ -52,6 +64,7 @@ class Asteroid(CircleShape):
         self.rotation = 0
         self.rotation_speed = random.uniform(-90, 90)
 
+    @profiled("Asteroid.draw")
     def draw(self, screen):
         """
         Draw the asteroid with its current rotation and optional hitbox.
@@ -59,11 +72,11 @@ class Asteroid(CircleShape):
         Args:
             screen (Surface): The Pygame screen surface to draw on.
         """
-        rotated_image = pygame.transform.rotate(self.image, -self.rotation)
+        rotated_image = assets.rotate(self.image, -self.rotation, quality.rotation_step)
         rect = rotated_image.get_rect(center=(int(self.position.x), int(self.position.y)))
         screen.blit(rotated_image, rect)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(
                 screen,
                 (255, 0, 0),
@@ -72,6 +85,7 @@ class Asteroid(CircleShape):
                 1
             )
 
+    @profiled("Asteroid.update")
     def update(self, dt):
         """
         Update the asteroid's position, rotation, and screen wrapping.
@@ -100,6 +114,7 @@ class Asteroid(CircleShape):
         Large splits into medium, medium into small, small disappears.
         """
         self.kill()
+        telemetry.emit(SPLIT, self.position.x, self.position.y, self.base_radius)
 
         # Only split if the size is in TIERS
         if self.base_radius not in TIERS:
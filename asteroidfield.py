@@ -3,6 +3,8 @@ import random
 from asteroid import Asteroid, TIERS
 from constants import *
 from enemy import Enemy
+from profiler import profiled
+from telemetry import telemetry, SPAWN, LEVEL_UP
 
 class AsteroidField(pygame.sprite.Sprite):
     """
@@ -42,6 +44,11 @@ class AsteroidField(pygame.sprite.Sprite):
         self.level = 1
         self.max_enemies = 3  # Limit on concurrent Mikitos
 
+    @property
+    def max_asteroids(self):
+        """Limit on concurrent asteroids at the current level."""
+        return min(3 + self.level, 10)
+
     def spawn(self, radius, position, velocity):
         """
         Spawn a new asteroid unless it's too close to the player.
@@ -57,8 +64,9 @@ class AsteroidField(pygame.sprite.Sprite):
 
         asteroid = Asteroid(position.x, position.y, radius)
         asteroid.velocity = velocity
-        print(f"Spawning asteroid | Radius: {radius:.1f} | Pos: {position} | Speed: {velocity.length():.1f}")
+        telemetry.emit(SPAWN, position.x, position.y, radius, velocity.length())
 
+    @profiled("AsteroidField.update")
     def update(self, dt):
         """
         Called each frame to potentially spawn new asteroids and enemies.
@@ -73,7 +81,7 @@ class AsteroidField(pygame.sprite.Sprite):
         # Level progression based on time survived
         if self.elapsed_time > self.level * 15:
             self.level += 1
-            print(f"🚀 Level up! Now at level {self.level}")
+            telemetry.emit(LEVEL_UP, self.level)
 
         # --- Asteroid Spawning ---
 
@@ -83,8 +91,7 @@ class AsteroidField(pygame.sprite.Sprite):
         if self.spawn_timer > spawn_rate:
             self.spawn_timer = 0
 
-            max_asteroids = min(3 + self.level, 10)
-            if len(self.asteroid_group) >= max_asteroids:
+            if len(self.asteroid_group) >= self.max_asteroids:
                 return  # Skip if too many asteroids already
 
             # Choose a random edge to spawn from
@@ -0,0 +1,213 @@
+"""
+Autopilot input source for deterministic load generation.
+
+Drives the Player like a (decent) human would: dodges whatever is on a
+collision course, otherwise turns toward the nearest target with lead and
+closes in, and keeps the fire button held the whole time.
+
+- skill: reaction time, aim error and how far ahead it looks for collisions.
+- aggression: how close it gets to targets, how fast it flies and how much
+  room it leaves when dodging.
+
+Decisions only depend on the world state and the autopilot's own seeded
+Random, so a seeded World plus a seeded Autopilot replays identically.
+"""
+
+import math
+import random
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SHOOT_SPEED, PLAYER_TURN_SPEED
+from controls import Controls
+
+# (skill, aggression) presets
+DIFFICULTIES = {
+    "easy": (0.3, 0.3),
+    "normal": (0.6, 0.5),
+    "hard": (0.9, 0.8),
+}
+
+UP = pygame.Vector2(0, -1)
+
+
+def heading_to(direction):
+    """Player rotation (degrees) that points the ship along direction."""
+    return UP.angle_to(direction)
+
+
+def angle_diff(target, current):
+    """Signed smallest difference target - current, in (-180, 180]."""
+    return (target - current + 180) % 360 - 180
+
+
+def body_radius(sprite):
+    """Collision radius (half the width for rectangle sprites like the boss)."""
+    radius = getattr(sprite, "radius", None)
+    return radius if radius is not None else sprite.width / 2
+
+
+class Autopilot:
+    """
+    Input source (see controls.py) that plays the game on its own.
+    """
+
+    def __init__(self, world, skill=0.6, aggression=0.5, seed=None):
+        """
+        Args:
+            world (World): Session to read threats and targets from.
+            skill (float): 0..1, reaction time and aim precision.
+            aggression (float): 0..1, engagement distance, cruise speed, dodge margin.
+            seed (int): Seed for the aim-error jitter (None = unseeded).
+        """
+        self.world = world
+        self.skill = skill
+        self.aggression = aggression
+        self.rng = random.Random(seed)
+
+        self.reaction = 0.25 - 0.2 * skill          # Seconds between decisions
+        self.aim_error = 12.0 * (1 - skill)          # Std-dev of aim jitter, degrees
+        self.aim_tolerance = 2.0 + 6.0 * (1 - skill)
+        self.lookahead = 0.4 + 0.8 * skill           # Seconds of collision prediction
+        self.engage_range = 500 - 300 * aggression
+        self.cruise_speed = 150 + 200 * aggression
+        self.margin = 20 + 60 * (1 - aggression)
+
+        self._timer = 0.0
+        self._heading = None
+        self._thrust = False
+
+    @classmethod
+    def preset(cls, world, difficulty="normal", seed=None):
+        """Autopilot with one of the DIFFICULTIES presets."""
+        skill, aggression = DIFFICULTIES[difficulty]
+        return cls(world, skill, aggression, seed)
+
+    # --- Input Source ---
+
+    def read(self, player, dt):
+        """
+        Controls for this frame. Re-plans every `reaction` seconds and steers
+        toward the planned heading in between.
+        """
+        self._timer -= dt
+        if self._timer <= 0:
+            self._timer = self.reaction
+            self._plan(player)
+
+        left = right = False
+        if self._heading is not None:
+            diff = angle_diff(self._heading, player.rotation)
+            # Don't turn if one frame of turning would overshoot the tolerance band
+            if abs(diff) > max(self.aim_tolerance, PLAYER_TURN_SPEED * dt / 2):
+                right, left = diff > 0, diff < 0
+
+        # The Player swaps left/right while dizzy; a skilled pilot compensates
+        if player.dizzy and self.skill >= 0.5:
+            left, right = right, left
+
+        return Controls(left, right, self._thrust, True)
+
+    # --- Planning ---
+
+    def _delta(self, player, position):
+        """Vector from the player to position (shortest way round when wrapping)."""
+        dx = position.x - player.position.x
+        dy = position.y - player.position.y
+        if not player.disable_wrap:
+            dx = (dx + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+            dy = (dy + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2
+        return pygame.Vector2(dx, dy)
+
+    def _threats(self):
+        world = self.world
+        yield from world.asteroids
+        yield from world.enemies
+        yield from world.mikito_bullets
+        yield from world.boss_bullets
+        if world.boss is not None and world.boss.alive():
+            yield world.boss
+
+    def _targets(self):
+        world = self.world
+        yield from world.asteroids
+        yield from world.enemies
+        yield from world.mikito_bullets
+        if world.boss is not None and world.boss.alive():
+            yield world.boss
+
+    def _plan(self, player):
+        escape = self._escape_direction(player)
+        if escape is not None:
+            self._heading = heading_to(escape)
+            self._thrust = abs(angle_diff(self._heading, player.rotation)) < 70
+            return
+
+        target, rel, distance = self._nearest_target(player)
+        if target is None:
+            self._heading = None
+            self._thrust = False
+            return
+
+        # Lead the target by the shot's travel time
+        lead = rel + target.velocity * (distance / PLAYER_SHOOT_SPEED)
+        self._heading = heading_to(lead) + self.rng.gauss(0, self.aim_error) if lead.length_squared() else None
+        # Never close in on the boss itself: it's big and touching it costs a life
+        engage_range = self.engage_range + (body_radius(target) * 2 if target is self.world.boss else 0)
+        self._thrust = (
+            distance > engage_range
+            and player.velocity.length() < self.cruise_speed
+            and self._heading is not None
+            and abs(angle_diff(self._heading, player.rotation)) < 30
+        )
+
+    def _escape_direction(self, player):
+        """
+        Weighted direction away from everything on a collision course within the
+        lookahead, or None if nothing is.
+        """
+        escape = pygame.Vector2(0, 0)
+        danger = False
+        for threat in self._threats():
+            rel = self._delta(player, threat.position)
+            reach = player.radius + body_radius(threat) + self.margin
+            rel_velocity = threat.velocity - player.velocity
+            speed_sq = rel_velocity.length_squared()
+
+            # Time of closest approach (0 if it's moving away or already closest)
+            t = max(0.0, -rel.dot(rel_velocity) / speed_sq) if speed_sq else 0.0
+            if t > self.lookahead:
+                continue
+            closest = rel + rel_velocity * t
+            miss = closest.length()
+            if miss >= reach:
+                continue
+
+            danger = True
+            away = -closest if miss > 1e-6 else pygame.Vector2(-rel_velocity.y, rel_velocity.x)
+            if away.length_squared() == 0:
+                away = -rel if rel.length_squared() else pygame.Vector2(1, 0)
+            escape += away.normalize() * (1.0 / (t + 0.1)) * (reach - miss) / reach
+
+        if not danger or escape.length_squared() == 0:
+            return None
+
+        # Keep out of the walls during the boss fight
+        if player.disable_wrap:
+            margin = player.radius * 2
+            if player.position.x < margin:
+                escape.x = abs(escape.x) + 1
+            elif player.position.x > SCREEN_WIDTH - margin:
+                escape.x = -abs(escape.x) - 1
+            if player.position.y < margin:
+                escape.y = abs(escape.y) + 1
+            elif player.position.y > SCREEN_HEIGHT - margin:
+                escape.y = -abs(escape.y) - 1
+        return escape
+
+    def _nearest_target(self, player):
+        best, best_rel, best_distance = None, None, math.inf
+        for target in self._targets():
+            rel = self._delta(player, target.position)
+            distance = rel.length()
+            if distance < best_distance:
+                best, best_rel, best_distance = target, rel, distance
+        return best, best_rel, best_distance
@@ -0,0 +1,260 @@
+"""
+Headless batch runs of autopilot games, written to a columnar ResultStore.
+
+Every game is a seeded World flown by an Autopilot preset until game over,
+boss kill or a time limit. Two tables are filled:
+
+    runs     one row per game: seed, difficulty, start level, outcome,
+             level reached, score, game seconds, boss time-to-kill (NaN
+             unless the boss died) and lives lost to each damage source
+    levels   one row per level played: seed, difficulty, level, seconds
+             spent in it, score when it ended and lives lost in it
+
+Games run on a process pool. Each worker process appends to its own shard
+of each table (see resultstore.py), so nothing is sent back but a count.
+
+Usage:
+    python batch.py run --runs 1000 --difficulty normal hard --workers 8
+    python batch.py run --runs 200 --level 9 --max-seconds 300
+    python batch.py summary                  # aggregates from the columns it needs
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from autopilot import Autopilot, DIFFICULTIES
+from constants import FIXED_DT
+from resultstore import ResultStore
+from telemetry import telemetry, SOURCES
+from world import GAME_OVER, VICTORY
+
+DEFAULT_STORE = "results"
+CHUNK = 4  # Games per pool task
+OUTCOMES = ("timeout", GAME_OVER, VICTORY)
+
+RUNS = {
+    "seed": "<u8",
+    "difficulty": ("u1", list(DIFFICULTIES)),
+    "start_level": "u1",
+    "outcome": ("u1", OUTCOMES),
+    "level": "u1",
+    "score": "<i8",
+    "seconds": "<f4",
+    "boss_seconds": "<f4",
+    **{f"lives_lost_{source}": "u1" for source in SOURCES},
+}
+
+LEVELS = {
+    "seed": "<u8",
+    "difficulty": ("u1", list(DIFFICULTIES)),
+    "level": "u1",
+    "seconds": "<f4",
+    "score": "<i8",
+    "lives_lost": "u1",
+}
+
+
+def open_store(path):
+    """ResultStore with the runs and levels tables defined."""
+    store = ResultStore(path)
+    store.define("runs", RUNS)
+    store.define("levels", LEVELS)
+    return store
+
+
+# --- Simulation (runs in worker processes) ---
+
+def play(seed, difficulty, start_level, max_ticks, runs, levels):
+    """
+    Play one autopilot game and append its rows.
+
+    Args:
+        seed (int): Seed for the World and the Autopilot.
+        difficulty (str): Autopilot preset.
+        start_level (int): Level the asteroid field starts at.
+        max_ticks (int): Tick limit (the outcome is "timeout" when reached).
+        runs, levels (ShardWriter): Where the rows go.
+
+    Returns:
+        int: Ticks simulated.
+    """
+    import headless
+
+    world = headless.new_world(seed, god_mode=False)
+    headless.set_level(world, start_level)
+    world.set_input(Autopilot.preset(world, difficulty, seed))
+    code = list(DIFFICULTIES).index(difficulty)
+
+    level = start_level
+    level_start = 0
+    level_lives = 0
+    boss_start = None
+    boss_ticks = None
+    outcome = "timeout"
+    tick = 0
+    with telemetry.muted():
+        while tick < max_ticks:
+            result = world.step(FIXED_DT)
+            tick += 1
+            if world.boss_active and boss_start is None:
+                boss_start = tick
+            current = world.asteroid_field.level
+            if result or current != level:
+                lost = sum(world.lives_lost)
+                levels.append({"seed": seed, "difficulty": code, "level": level,
+                               "seconds": (tick - level_start) * FIXED_DT, "score": world.score,
+                               "lives_lost": lost - level_lives})
+                level, level_start, level_lives = current, tick, lost
+            if result:
+                outcome = result
+                if result == VICTORY:
+                    boss_ticks = tick - boss_start
+                break
+
+    if outcome == "timeout" and tick > level_start:
+        # The level the game was still in when it ran out of time
+        levels.append({"seed": seed, "difficulty": code, "level": level,
+                       "seconds": (tick - level_start) * FIXED_DT, "score": world.score,
+                       "lives_lost": sum(world.lives_lost) - level_lives})
+
+    row = {"seed": seed, "difficulty": code, "start_level": start_level, "outcome": OUTCOMES.index(outcome),
+           "level": world.asteroid_field.level, "score": world.score, "seconds": tick * FIXED_DT,
+           "boss_seconds": boss_ticks * FIXED_DT if boss_ticks is not None else np.nan}
+    for source, count in zip(SOURCES, world.lives_lost):
+        row[f"lives_lost_{source}"] = count
+    runs.append(row)
+    return tick
+
+
+_writers = None
+
+
+def _init_worker(path, shard):
+    global _writers
+    import headless
+
+    headless.init()
+    headless.preload()
+    store = ResultStore(path)
+    shard = f"{shard}-{os.getpid()}"
+    _writers = (store.writer("runs", shard), store.writer("levels", shard))
+
+
+def _play_chunk(games, start_level, max_ticks):
+    """Play a few games, then commit their rows. Returns (games, ticks)."""
+    runs, levels = _writers
+    ticks = 0
+    for seed, difficulty in games:
+        ticks += play(seed, difficulty, start_level, max_ticks, runs, levels)
+    runs.flush()
+    levels.flush()
+    return len(games), ticks
+
+
+def run(path, runs, difficulties=("normal",), start_level=1, max_seconds=600.0, seed=1, workers=None):
+    """
+    Play `runs` games per difficulty on a process pool.
+
+    Args:
+        path (str): Store directory.
+        runs (int): Games per difficulty (seeds seed, seed + 1, ...).
+        difficulties (tuple): Autopilot presets.
+        start_level (int): Level every game starts at.
+        max_seconds (float): Game-time limit per game.
+        seed (int): First seed.
+        workers (int): Processes (default: one per CPU).
+    """
+    open_store(path)
+    games = [(seed + index, difficulty) for difficulty in difficulties for index in range(runs)]
+    chunks = [games[index:index + CHUNK] for index in range(0, len(games), CHUNK)]
+    max_ticks = round(max_seconds / FIXED_DT)
+    shard = time.strftime("%Y%m%d-%H%M%S")
+
+    started = time.perf_counter()
+    played = ticks = 0
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=_init_worker,
+                             initargs=(path, shard)) as pool:
+        for count, chunk_ticks in pool.map(_play_chunk, chunks, [start_level] * len(chunks),
+                                           [max_ticks] * len(chunks)):
+            played += count
+            ticks += chunk_ticks
+    elapsed = time.perf_counter() - started
+    print(f"{played} games in {elapsed:.1f} s: {played / elapsed:.1f} games/s, {ticks / elapsed:,.0f} ticks/s")
+
+
+# --- Analysis ---
+
+def summary(path):
+    """Print per-difficulty aggregates, loading only the columns they use."""
+    started = time.perf_counter()
+    store = ResultStore(path)
+    if "runs" not in store.tables or not store.rows("runs"):
+        print(f"No runs in {path}/")
+        return
+    causes = [f"lives_lost_{source}" for source in SOURCES]
+    runs = store.load("runs", ["difficulty", "outcome", "level", "score", "boss_seconds"] + causes)
+    levels = store.load("levels", ["difficulty", "level", "seconds"])
+    labels = store.labels("runs", "difficulty")
+    victory = OUTCOMES.index(VICTORY)
+
+    print(f"{len(runs['score']):,} runs, {len(levels['level']):,} level rows")
+    for code, difficulty in enumerate(labels):
+        mask = runs["difficulty"] == code
+        count = int(mask.sum())
+        if not count:
+            continue
+        boss = runs["boss_seconds"][mask]
+        boss = boss[~np.isnan(boss)]
+        deaths = np.array([runs[name][mask].sum(dtype=np.int64) for name in causes])
+        print(f"\n{difficulty}: {count:,} runs, score mean {runs['score'][mask].mean():,.0f} "
+              f"(p90 {np.percentile(runs['score'][mask], 90):,.0f}), level mean {runs['level'][mask].mean():.2f}, "
+              f"victories {(runs['outcome'][mask] == victory).mean():.1%}")
+        if len(boss):
+            print(f"  boss time-to-kill: median {np.median(boss):.1f} s, p90 {np.percentile(boss, 90):.1f} s")
+        if deaths.sum():
+            shares = ", ".join(f"{source} {share:.0%}" for source, share in zip(SOURCES, deaths / deaths.sum()) if share)
+            print(f"  lives lost ({deaths.sum():,}): {shares}")
+
+        level_mask = levels["difficulty"] == code
+        played = levels["level"][level_mask]
+        seconds = levels["seconds"][level_mask]
+        if len(played):
+            counts = np.bincount(played)
+            means = np.bincount(played, weights=seconds) / np.maximum(counts, 1)
+            print("  seconds per level: " + ", ".join(f"{level}: {means[level]:.0f}"
+                                                     for level in np.flatnonzero(counts)))
+    print(f"\nLoaded and aggregated in {time.perf_counter() - started:.2f} s")
+
+
+# --- Command Line ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch autopilot runs into a columnar results store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("run", help="Play games on every CPU and append their rows")
+    batch.add_argument("--runs", type=int, default=100, help="Games per difficulty")
+    batch.add_argument("--difficulty", nargs="+", default=["normal"], choices=DIFFICULTIES)
+    batch.add_argument("--level", type=int, default=1, help="Starting level")
+    batch.add_argument("--max-seconds", type=float, default=600.0, help="Game-time limit per game")
+    batch.add_argument("--seed", type=int, default=1, help="First seed")
+    batch.add_argument("--workers", type=int, default=None)
+
+    report = commands.add_parser("summary", help="Aggregate stored runs")
+
+    for command in (batch, report):
+        command.add_argument("--out", default=DEFAULT_STORE, help="Store directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args.out, args.runs, tuple(args.difficulty), args.level, args.max_seconds, args.seed, args.workers)
+    else:
+        summary(args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
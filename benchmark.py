@@ -0,0 +1,268 @@
+"""
+Scenario benchmark suite.
+
+Runs named, seeded scenarios headless for a fixed number of frames and reports
+mean / p99 / max frame time split into update, collision and render. Results can
+be saved as a JSON baseline and later runs are compared against it.
+
+Usage:
+    python benchmark.py                      # run all, compare with baseline if present
+    python benchmark.py stress_500 shot_spam # run some scenarios
+    python benchmark.py --save               # run all and store as the new baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+import pygame
+import assets
+import headless
+from autopilot import Autopilot, DIFFICULTIES
+from governor import QUALITY_LEVELS, set_quality
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BOSS_STAGE2_HEALTH, COOKIE_DAMAGE
+from asteroid import Asteroid, TIERS
+from enemy import Enemy
+from shot import Shot
+from finalboss import CookieBullet
+
+DT = 1 / 60
+WARMUP_FRAMES = 30
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+PHASES = ("update", "collision", "render", "frame")
+
+
+# --- Scenario Setup ---
+
+def _random_velocity(speed_min=40, speed_max=120):
+    return pygame.Vector2(random.uniform(speed_min, speed_max), 0).rotate(random.uniform(0, 360))
+
+
+def _spawn_asteroids(world, count, radii=TIERS):
+    for _ in range(count):
+        asteroid = Asteroid(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT), random.choice(radii))
+        asteroid.velocity = _random_velocity()
+
+
+def _spawn_mikitos(world, count):
+    for _ in range(count):
+        world.enemies.add(Enemy(
+            random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT),
+            world.player, world.mikito_bullets, dizzy_only=True
+        ))
+
+
+def setup_early(world):
+    """Level 2, field spawning normally."""
+    headless.set_level(world, 2)
+
+
+def setup_level9_cap(world):
+    """Level 9 with the asteroid cap reached and Mikitos out."""
+    headless.set_level(world, 9)
+    _spawn_asteroids(world, world.asteroid_field.max_asteroids)
+    _spawn_mikitos(world, world.asteroid_field.max_enemies)
+
+
+def setup_stress_500(world):
+    """500 asteroids of mixed tiers."""
+    headless.set_level(world, 9)
+    _spawn_asteroids(world, 500)
+
+
+def setup_boss_stage2(world):
+    """Boss in stage 2 with a swarm of Mikitos and cookies."""
+    headless.set_level(world, 10)
+    world.start_boss()
+    world.boss.health = BOSS_STAGE2_HEALTH
+    world.boss.stage2_triggered = True
+    world.boss.stage = 2
+    world.boss.image = world.boss.image_stage2
+    world.boss.position.x = 1080
+    _spawn_mikitos(world, 40)
+    for _ in range(10):
+        world.boss_bullets.add(CookieBullet(
+            random.uniform(600, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT),
+            pygame.Vector2(-200, 0), world.boss.cookie_img, COOKIE_DAMAGE, health=3
+        ))
+
+
+SHOT_SPAM_COUNT = 3000
+
+
+def _spawn_shots(count):
+    for _ in range(count):
+        Shot(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT), _random_velocity(300, 500))
+
+
+def setup_shot_spam(world):
+    """Thousands of live player shots over a capped field (refilled every frame)."""
+    headless.set_level(world, 9)
+    _spawn_asteroids(world, 10)
+    _spawn_shots(SHOT_SPAM_COUNT)
+
+    def refill(world):
+        # Shots that flew off screen or hit something are replaced, so every frame times SHOT_SPAM_COUNT
+        _spawn_shots(SHOT_SPAM_COUNT - len(world.shots))
+
+    return refill
+
+
+def setup_autopilot_run(world):
+    """Level 8 flown by the hard autopilot, through level 9 and into the boss fight."""
+    headless.set_level(world, 8)
+    world.set_input(Autopilot.preset(world, "hard", seed=8))
+
+
+SCENARIOS = {
+    "early": (setup_early, 1200),
+    "level9_cap": (setup_level9_cap, 1200),
+    "stress_500": (setup_stress_500, 300),
+    "boss_stage2": (setup_boss_stage2, 900),
+    "shot_spam": (setup_shot_spam, 300),
+    "autopilot_run": (setup_autopilot_run, 1800),
+}
+
+
+# --- Running ---
+
+def run_scenario(name, screen, frames=None, seed=1234, difficulty=None):
+    """
+    Run one scenario headless and time each phase per frame.
+
+    Args:
+        name (str): Key in SCENARIOS.
+        screen (Surface): Render target.
+        frames (int): Override the scenario's frame count.
+        seed (int): Seed for the random module.
+        difficulty (str): Fly the player with this autopilot preset (None = idle player).
+
+    Returns:
+        dict: phase -> {"mean", "p99", "max"} in milliseconds, plus "frames".
+    """
+    setup, default_frames = SCENARIOS[name]
+    frames = frames or default_frames
+
+    world = headless.new_world(seed)
+    if difficulty:
+        world.set_input(Autopilot.preset(world, difficulty, seed))
+    before_frame = setup(world)  # Optional per-frame hook, run outside the timed phases
+
+    background = assets.load_image("assets/background.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+    font = assets.get_font(32)
+    life_icon = assets.load_image("assets/ship.png", (24, 24))
+
+    samples = np.zeros((frames, len(PHASES)))
+    perf_counter = time.perf_counter
+
+    for frame in range(WARMUP_FRAMES + frames):
+        if before_frame:
+            before_frame(world)
+        t0 = perf_counter()
+        world.update(DT)
+        t1 = perf_counter()
+        world.handle_collisions()
+        t2 = perf_counter()
+        screen.blit(background, (0, 0))
+        world.draw(screen, font, life_icon)
+        pygame.display.flip()
+        t3 = perf_counter()
+
+        if frame >= WARMUP_FRAMES:
+            samples[frame - WARMUP_FRAMES] = (t1 - t0, t2 - t1, t3 - t2, t3 - t0)
+
+    samples *= 1000
+    result = {"frames": frames}
+    for i, phase in enumerate(PHASES):
+        column = samples[:, i]
+        result[phase] = {
+            "mean": float(column.mean()),
+            "p99": float(np.percentile(column, 99)),
+            "max": float(column.max()),
+        }
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """
+    Flag scenario phases whose mean or p99 grew by more than `tolerance`.
+
+    Returns:
+        list: Human-readable regression lines (empty if none).
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for phase in PHASES:
+            for stat in ("mean", "p99"):
+                old = base[phase][stat]
+                new = result[phase][stat]
+                # Ignore sub-0.05 ms noise
+                if new > old * (1 + tolerance) and new - old > 0.05:
+                    regressions.append(f"{name}.{phase}.{stat}: {old:.3f} -> {new:.3f} ms (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'scenario':<14}{'phase':<11}{'mean':>9}{'p99':>9}{'max':>9}  (ms)")
+    for name, result in results.items():
+        for phase in PHASES:
+            stats = result[phase]
+            print(f"{name:<14}{phase:<11}{stats['mean']:9.3f}{stats['p99']:9.3f}{stats['max']:9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless gameplay benchmarks.")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, help="Override frames per scenario")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown before flagging (0.15 = 15%%)")
+    parser.add_argument("--quality", type=int, default=0, choices=range(len(QUALITY_LEVELS)),
+                        help="Fixed governor quality level (0 = high)")
+    parser.add_argument("--autopilot", choices=DIFFICULTIES, help="Fly every scenario with this autopilot preset")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    screen = headless.init()
+    headless.preload()
+    set_quality(args.quality)
+    results = {name: run_scenario(name, screen, args.frames, args.seed, args.autopilot) for name in names}
+    print_table(results)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
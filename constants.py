@@ -8,6 +8,9 @@ Organized by category for easy maintenance and clarity.
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+# --- Simulation ---
+FIXED_DT = 1 / 60  # Seconds per simulation tick (frames may run several ticks)
+
 # --- Asteroid Settings ---
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3  # Number of size tiers: large, medium, small
@@ -0,0 +1,57 @@
+"""
+Player input sources.
+
+Player.update asks its input source for a Controls tuple each frame instead of
+reading the keyboard directly, so the ship can be driven by the keyboard, the
+autopilot or a replay interchangeably.
+
+An input source is any object with read(player, dt) -> Controls.
+"""
+
+from collections import namedtuple
+import pygame
+
+# Raw control state for one frame (before the dizzy left/right swap)
+Controls = namedtuple("Controls", "left right thrust fire")
+
+NO_INPUT = Controls(False, False, False, False)
+
+
+def to_bits(controls):
+    """Pack Controls into 4 bits (left=1, right=2, thrust=4, fire=8)."""
+    return controls.left | controls.right << 1 | controls.thrust << 2 | controls.fire << 3
+
+
+# Every 4-bit pattern decoded once
+_FROM_BITS = tuple(Controls(bool(b & 1), bool(b & 2), bool(b & 4), bool(b & 8)) for b in range(16))
+
+
+def from_bits(bits):
+    """Inverse of to_bits()."""
+    return _FROM_BITS[bits & 0xF]
+
+
+class KeyboardInput:
+    """
+    Arrow keys to turn and thrust, space to fire.
+    """
+
+    def read(self, player, dt):
+        keys = pygame.key.get_pressed()
+        return Controls(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_UP], keys[pygame.K_SPACE])
+
+
+class HeldInput:
+    """
+    Returns the same Controls every tick (e.g. to predict ahead with the current keys).
+    """
+
+    def __init__(self, controls=NO_INPUT):
+        self.controls = controls
+
+    def read(self, player, dt):
+        return self.controls
+
+
+# Default source for new Players
+KEYBOARD = KeyboardInput()
@@ -18,3 +18,29 @@ FAST_RESPAWN = False   # Speeds up cooldowns or enemy spawns (optional)
 # --- Visual Debugging ---
 
 SHOW_HITBOXES = False  # Show hitboxes for all entities (if implemented)
+
+# --- Performance ---
+
+ADAPTIVE_QUALITY = False # Lower rotation quality / overlays / shot cap when frames run over budget
+PROFILE = False          # Time main-loop phases and sprite methods (F3 overlay, F9 Chrome trace dump)
+SLOW_FRAME_WATCHDOG = False  # Sample stacks and write a report to spikes/ for every slow frame
+SLOW_FRAME_MS = 50           # Frame time that counts as a spike
+MEMORY_STATS = False         # F4 toggles live sprite / surface memory accounting
+MEMORY_DUMP_SECONDS = 0      # Append memory accounting to memstats.jsonl every N seconds (0 = off)
+GC_MONITOR = False           # Record every GC pause and print a frame-impact histogram on exit
+FRAME_AWARE_GC = False       # Freeze loaded objects, disable automatic GC and collect between frames
+INPUT_LATENCY = False        # Measure key press -> presented frame latency, report printed on exit
+VSYNC = False                # Request vsync from SDL (uses a SCALED window)
+FRAME_PACING = "tick"        # "tick" (sleep to 60 FPS), "busy" (spin to 60 FPS) or "none" (uncapped)
+RUN_AHEAD = 0                # Draw the World this many ticks ahead of the simulation (0 = off, 1-2 cut latency)
+SPLIT_PROCESSES = False      # Simulate in a second process, draw from shared memory (no replays / rewind / run-ahead)
+
+# --- Telemetry ---
+
+TELEMETRY = "off"        # "off", "info" (hits, level-ups, boss, game over) or "debug" (+ spawns, splits, kills)
+TELEMETRY_BINARY = False # Write telemetry.bin records instead of telemetry.jsonl
+TELEMETRY_ECHO = False   # Also print info events to the console (from the writer thread)
+METRICS_PORT = 0         # Serve Prometheus metrics on http://127.0.0.1:<port>/metrics (0 = off)
+RECORD_REPLAYS = False   # Record every session to replays/ (inputs + keyframes, see replay.py)
+REWIND = False           # Keep recent play in memory: BACKSPACE rewinds 1 s, kill-cam before game over
+REWIND_SECONDS = 5       # How far back the rewind buffer reaches
@@ -14,9 +14,21 @@ EnemyBullet:
 import pygame
 import random
 import math
+import assets
 from circleshape import CircleShape
 from constants import ENEMY_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT
 from devtools import SHOW_HITBOXES
+from governor import quality
+from profiler import profiled
+
+MIKITO_DIAMETER = ENEMY_RADIUS * 5.0
+BULLET_SIZE = (24, 24)
+
+# Scaled images this module uses (preloaded at startup)
+IMAGES = [
+    ("assets/mikito.png", (int(MIKITO_DIAMETER), int(MIKITO_DIAMETER))),
+    ("assets/mikitoshot.png", BULLET_SIZE),
+]
 
 # --- Harmless enemy that shoots dizzy-inducing poop bullets ---
 
@@ -37,9 +49,8 @@ class Enemy(CircleShape):
             bullet_group (Group): Group to store poop bullets.
             dizzy_only (bool): Always True for Mikito (bullets only cause dizzy effect).
         """
-        image = pygame.image.load("assets/mikito.png").convert_alpha()
-        diameter = ENEMY_RADIUS * 5.0
-        self.image = pygame.transform.scale(image, (int(diameter), int(diameter)))
+        diameter = MIKITO_DIAMETER
+        self.image = assets.load_image("assets/mikito.png", (int(diameter), int(diameter)))
 
         super().__init__(x, y, diameter // 2.2)
 
@@ -52,6 +63,7 @@ class Enemy(CircleShape):
         self.shoot_timer = random.uniform(3.0, 5.0)
         self.wobble_time = 0.0  # For animated wobble effect
 
+    @profiled("Enemy.update")
     def update(self, dt):
         """
         Update Mikito's position, wobble animation, and shooting timer.
@@ -95,15 +107,16 @@ class Enemy(CircleShape):
         )
         self.bullet_group.add(bullet)
 
+    @profiled("Enemy.draw")
     def draw(self, screen):
         """
         Draw the rotated Mikito and its hitbox if debugging is enabled.
         """
-        rotated_image = pygame.transform.rotate(self.image, -self.rotation)
+        rotated_image = assets.rotate(self.image, -self.rotation, quality.rotation_step)
         rect = rotated_image.get_rect(center=(int(self.position.x), int(self.position.y)))
         screen.blit(rotated_image, rect)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(screen, (255, 0, 0), (int(self.position.x), int(self.position.y)), int(self.radius), 1)
 
 
@@ -129,9 +142,9 @@ class EnemyBullet(CircleShape):
         self.velocity = velocity
         self.is_dizzy = is_dizzy
 
-        self.image = pygame.image.load("assets/mikitoshot.png").convert_alpha()
-        self.image = pygame.transform.scale(self.image, (24, 24))
+        self.image = assets.load_image("assets/mikitoshot.png", BULLET_SIZE)
 
+    @profiled("EnemyBullet.update")
     def update(self, dt):
         """
         Move the bullet and kill it if far off-screen.
@@ -149,6 +162,7 @@ class EnemyBullet(CircleShape):
         ):
             self.kill()
 
+    @profiled("EnemyBullet.draw")
     def draw(self, screen):
         """
         Draw the bullet and hitbox if enabled.
@@ -156,5 +170,5 @@ class EnemyBullet(CircleShape):
         rect = self.image.get_rect(center=(int(self.position.x), int(self.position.y)))
         screen.blit(self.image, rect)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(screen, (255, 0, 0), (int(self.position.x), int(self.position.y)), int(self.radius), 1)
@@ -11,6 +11,7 @@ FinalBoss and its bullet classes.
 
 import pygame
 import random
+import assets
 from circleshape import CircleShape
 from rectangleshape import RectangleShape
 from constants import (
@@ -21,7 +22,22 @@ from constants import (
     BONE_OFFSET_Y, COOKIE_OFFSET_Y
 )
 from devtools import SHOW_HITBOXES
+from governor import quality
 from enemy import Enemy
+from profiler import profiled
+from telemetry import telemetry, BOSS_STAGE
+
+BOSS_IMAGE_SIZE = (400, 500)
+COOKIE_SIZE = (100, 100)
+BONE_SIZE = (120, 80)
+
+# Scaled images this module uses (prefetched while level 9 is played)
+IMAGES = [
+    ("assets/boss_stage_1.png", BOSS_IMAGE_SIZE),
+    ("assets/boss_stage_2.png", BOSS_IMAGE_SIZE),
+    ("assets/cookiebullet.png", COOKIE_SIZE),
+    ("assets/bonebullet.png", BONE_SIZE),
+]
 
 # --- Final Boss Class ---
 
@@ -51,12 +67,8 @@ class FinalBoss(RectangleShape):
             mikito_bullets (Group): Passed to new Mikitos for poop bullets.
         """
         # Load and scale boss images
-        self.image_stage1 = pygame.transform.scale(
-            pygame.image.load("assets/boss_stage_1.png").convert_alpha(), (400, 500)
-        )
-        self.image_stage2 = pygame.transform.scale(
-            pygame.image.load("assets/boss_stage_2.png").convert_alpha(), (400, 500)
-        )
+        self.image_stage1 = assets.load_image("assets/boss_stage_1.png", BOSS_IMAGE_SIZE)
+        self.image_stage2 = assets.load_image("assets/boss_stage_2.png", BOSS_IMAGE_SIZE)
         self.image = self.image_stage1
 
         # Set up hitbox smaller than image
@@ -87,9 +99,10 @@ class FinalBoss(RectangleShape):
         self.active = True
 
         # Bullets
-        self.cookie_img = pygame.transform.scale(pygame.image.load("assets/cookiebullet.png").convert_alpha(), (100, 100))
-        self.bone_img = pygame.transform.scale(pygame.image.load("assets/bonebullet.png").convert_alpha(), (120, 80))
+        self.cookie_img = assets.load_image("assets/cookiebullet.png", COOKIE_SIZE)
+        self.bone_img = assets.load_image("assets/bonebullet.png", BONE_SIZE)
 
+    @profiled("FinalBoss.update")
     def update(self, dt):
         """
         Update movement, phase transitions, and attack patterns.
@@ -136,6 +149,7 @@ class FinalBoss(RectangleShape):
 
         if self.health <= BOSS_STAGE2_HEALTH and not self.stage2_triggered:
             self.stage2_triggered = True
+            telemetry.emit(BOSS_STAGE, 2, self.health)
             self.transitioning = True
             self.transition_timer = 0
 
@@ -188,6 +202,7 @@ class FinalBoss(RectangleShape):
         if self.health <= 0:
             self.active = False
 
+    @profiled("FinalBoss.draw")
     def draw(self, screen):
         """
         Draw the boss, its health bar, and (optionally) hitbox.
@@ -215,7 +230,7 @@ class FinalBoss(RectangleShape):
             pygame.draw.rect(screen, (255, 255, 255), bar_rect, 2)
             pygame.draw.rect(screen, (255, 0, 0), (bar_rect.left, bar_rect.top, fill, bar_height))
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.rect(screen, (0, 255, 255), self.get_rect(), 2)
 
 # --- Boss Projectile: Bone Bullet ---
@@ -234,6 +249,7 @@ class BoneBullet(CircleShape):
         self.angle = 0
         self.rotation_speed = 180
 
+    @profiled("BoneBullet.update")
     def update(self, dt):
         self.position += self.velocity * dt
         self.angle = (self.angle + self.rotation_speed * dt) % 360
@@ -241,12 +257,13 @@ class BoneBullet(CircleShape):
         if self.position.x < -50 or self.position.x > SCREEN_WIDTH + 50:
             self.kill()
 
+    @profiled("BoneBullet.draw")
     def draw(self, screen):
-        rotated = pygame.transform.rotate(self.image, self.angle)
+        rotated = assets.rotate(self.image, self.angle, quality.rotation_step)
         rect = rotated.get_rect(center=(int(self.position.x), int(self.position.y)))
         screen.blit(rotated, rect)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(screen, (255, 255, 0), (int(self.position.x), int(self.position.y)), self.radius, 1)
 
 # --- Boss Projectile: Cookie Bomb ---
@@ -265,15 +282,17 @@ class CookieBullet(CircleShape):
         self.damage = damage
         self.health = health
 
+    @profiled("CookieBullet.update")
     def update(self, dt):
         self.position += self.velocity * dt
 
         if self.position.x < -50:
             self.kill()
 
+    @profiled("CookieBullet.draw")
     def draw(self, screen):
         rect = self.image.get_rect(center=(int(self.position.x), int(self.position.y)))
         screen.blit(self.image, rect)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(screen, (255, 0, 255), (int(self.position.x), int(self.position.y)), self.radius, 2)
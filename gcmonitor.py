@@ -0,0 +1,218 @@
+"""
+Garbage-collector pause measurement and frame-aware collection.
+
+- GCMonitor hooks gc.callbacks and records every collection: generation,
+  pause length, objects collected and the frame it landed in.
+- It also keeps per-frame GC time next to frame time, so report() can show a
+  histogram of how much GC costs the frames it hits.
+- FrameGC is an optional policy: after assets load it collects and freezes
+  everything alive (cached surfaces, fonts, modules) so later passes skip it,
+  turns automatic collection off and instead collects young generations between
+  frames when there is time left in the budget, and does full passes only when
+  a new session starts from the intro.
+"""
+
+import gc
+import time
+import numpy as np
+
+# Upper edges (ms) of the GC-time-per-frame histogram buckets
+HISTOGRAM_EDGES_MS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, float("inf"))
+
+
+class GCMonitor:
+    """
+    Ring buffer of GC pauses plus per-frame GC totals.
+    """
+
+    def __init__(self, capacity=4096, frames=1 << 14):
+        """
+        Args:
+            capacity (int): GC events kept before the oldest are overwritten.
+            frames (int): Frames of (frame time, GC time) kept.
+        """
+        self.capacity = capacity
+        self.generations = np.zeros(capacity, dtype=np.int8)
+        self.pauses = np.zeros(capacity, dtype=np.float64)
+        self.collected = np.zeros(capacity, dtype=np.int32)
+        self.event_frames = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+
+        self.frame_capacity = frames
+        self.frame_times = np.zeros(frames, dtype=np.float64)
+        self.frame_gc = np.zeros(frames, dtype=np.float64)
+
+        self.frame = 0
+        self._frame_gc = 0.0
+        self._start = 0.0
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            gc.callbacks.append(self._callback)
+            self.installed = True
+        return self
+
+    def uninstall(self):
+        if self.installed:
+            gc.callbacks.remove(self._callback)
+            self.installed = False
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+
+        pause = time.perf_counter() - self._start
+        i = self.count % self.capacity
+        self.generations[i] = info["generation"]
+        self.pauses[i] = pause
+        self.collected[i] = info["collected"]
+        self.event_frames[i] = self.frame
+        self.count += 1
+        self._frame_gc += pause
+
+    def end_frame(self, frame_time):
+        """
+        Close the current frame.
+
+        Args:
+            frame_time (float): Seconds the frame took (GC included).
+        """
+        i = self.frame % self.frame_capacity
+        self.frame_times[i] = frame_time
+        self.frame_gc[i] = self._frame_gc
+        self._frame_gc = 0.0
+        self.frame += 1
+
+    # --- Reading ---
+
+    def events(self):
+        """
+        Recorded GC events, oldest first.
+
+        Returns:
+            list: (frame, generation, pause seconds, objects collected) tuples.
+        """
+        n = min(self.count, self.capacity)
+        order = (np.arange(n) + (self.count - n)) % self.capacity
+        return [(int(self.event_frames[i]), int(self.generations[i]), float(self.pauses[i]), int(self.collected[i]))
+                for i in order]
+
+    def report(self):
+        """
+        Summarize pauses per generation and GC impact on frame time.
+
+        Returns:
+            dict: "generations" -> {gen: {"count", "total_ms", "max_ms"}},
+                  "histogram" -> [(bucket label, frames, mean frame ms)],
+                  "frames", "frames_with_gc".
+        """
+        n = min(self.count, self.capacity)
+        generations = {}
+        for gen in range(3):
+            pauses = self.pauses[:n][self.generations[:n] == gen]
+            if len(pauses):
+                generations[gen] = {
+                    "count": int(len(pauses)),
+                    "total_ms": float(pauses.sum() * 1000),
+                    "max_ms": float(pauses.max() * 1000),
+                }
+
+        frames = min(self.frame, self.frame_capacity)
+        gc_ms = self.frame_gc[:frames] * 1000
+        frame_ms = self.frame_times[:frames] * 1000
+
+        none = gc_ms == 0
+        histogram = [("no GC", int(none.sum()), float(frame_ms[none].mean()) if none.any() else 0.0)]
+        lower = 0.0
+        for upper in HISTOGRAM_EDGES_MS:
+            mask = (gc_ms > lower) & (gc_ms <= upper)
+            label = f"<= {upper:g} ms" if upper != float("inf") else f"> {lower:g} ms"
+            histogram.append((label, int(mask.sum()), float(frame_ms[mask].mean()) if mask.any() else 0.0))
+            lower = upper
+
+        return {
+            "generations": generations,
+            "histogram": histogram,
+            "frames": frames,
+            "frames_with_gc": int((gc_ms > 0).sum()),
+        }
+
+    def print_report(self):
+        report = self.report()
+        print(f"GC: {report['frames_with_gc']} of {report['frames']} frames had a collection")
+        for gen, stats in report["generations"].items():
+            print(f"  gen {gen}: {stats['count']:6d} passes  total {stats['total_ms']:8.1f} ms  max {stats['max_ms']:6.2f} ms")
+        print("  GC time per frame      frames  mean frame ms")
+        for label, frames, mean in report["histogram"]:
+            print(f"  {label:<20}{frames:8d}{mean:14.2f}")
+
+
+class FrameGC:
+    """
+    Frame-aware collection policy: no automatic GC, collect between frames.
+    """
+
+    def __init__(self, budget=1 / 60, min_slack=0.004, young_every=30, middle_every=600, pressure=10):
+        """
+        Args:
+            budget (float): Target frame time in seconds.
+            min_slack (float): Only collect if at least this much of the budget is left.
+            young_every (int): Collect generation 0 at most this many frames apart.
+            middle_every (int): Collect generation 1 at most this many frames apart.
+            pressure (int): Collect gen 0 regardless of slack once allocations reach
+                this many times the normal gen-0 threshold.
+        """
+        self.budget = budget
+        self.min_slack = min_slack
+        self.young_every = young_every
+        self.middle_every = middle_every
+        self.pressure = pressure
+        self.threshold = gc.get_threshold()[0]
+        self._young = 0
+        self._middle = 0
+        self.enabled = False
+
+    def freeze(self):
+        """
+        Collect, move every live object to the permanent generation and turn
+        automatic collection off. Call once assets are loaded, before the World
+        is built (frozen objects are never collected).
+        """
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self.enabled = True
+
+    def between_frames(self, frame_time):
+        """
+        Run the young-generation collections that are due, if the frame left room.
+
+        Args:
+            frame_time (float): Seconds the frame took so far.
+        """
+        if not self.enabled:
+            return
+
+        self._young += 1
+        self._middle += 1
+        slack = self.budget - frame_time
+        allocations = gc.get_count()[0]
+        over_pressure = allocations > self.threshold * self.pressure
+
+        if slack < self.min_slack and not over_pressure:
+            return
+        if self._middle >= self.middle_every:
+            gc.collect(1)
+            self._young = self._middle = 0
+        elif self._young >= self.young_every or over_pressure:
+            gc.collect(0)
+            self._young = 0
+
+    def full_collect(self):
+        """
+        Full collection at a point where a pause doesn't matter (screen changes).
+        """
+        if self.enabled:
+            gc.collect()
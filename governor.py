@@ -0,0 +1,136 @@
+"""
+Adaptive frame-budget governor.
+
+- Measures how long each frame's work takes (excluding the clock.tick() sleep).
+- Steps quality down when frames go over budget and back up when there's headroom.
+- Sprites read the live settings from the module-level `quality` object.
+"""
+
+from collections import deque
+
+HISTORY = 64  # Quality changes kept in FrameGovernor.changes
+
+
+class QualityLevel:
+    """
+    One step of the quality ladder.
+    """
+
+    def __init__(self, name, rotation_step, hitboxes, max_shots):
+        """
+        Args:
+            name (str): Label used in logs.
+            rotation_step (int): Rotation quantization in degrees (0 = exact angle every frame).
+            hitboxes (bool): Allow SHOW_HITBOXES overlays.
+            max_shots (int or None): Cap on concurrent player shots (None = no cap).
+        """
+        self.name = name
+        self.rotation_step = rotation_step
+        self.hitboxes = hitboxes
+        self.max_shots = max_shots
+
+
+# Best quality first
+QUALITY_LEVELS = [
+    QualityLevel("high", rotation_step=0, hitboxes=True, max_shots=None),
+    QualityLevel("medium", rotation_step=3, hitboxes=True, max_shots=None),
+    QualityLevel("low", rotation_step=8, hitboxes=False, max_shots=40),
+    QualityLevel("lowest", rotation_step=15, hitboxes=False, max_shots=20),
+]
+
+# Live settings read by sprites. Updated in place so `from governor import quality` stays valid.
+quality = QualityLevel(**vars(QUALITY_LEVELS[0]))
+
+
+def set_quality(index):
+    """
+    Apply a quality level to the shared `quality` settings.
+
+    Args:
+        index (int): Index into QUALITY_LEVELS.
+    """
+    for field, value in vars(QUALITY_LEVELS[index]).items():
+        setattr(quality, field, value)
+
+
+def quality_index():
+    """
+    Index into QUALITY_LEVELS of the live settings.
+
+    Returns:
+        int: Current quality level.
+    """
+    return _INDEX[quality.name]
+
+
+_INDEX = {level.name: i for i, level in enumerate(QUALITY_LEVELS)}
+
+
+class FrameGovernor:
+    """
+    Watches frame work time and moves along QUALITY_LEVELS.
+
+    Frame times are averaged over a window of frames. One slow window steps
+    quality down right away; it only steps back up after several windows in
+    a row with plenty of headroom, so it doesn't oscillate.
+    """
+
+    def __init__(self, budget=1 / 60, window=30, headroom=0.6, recover_windows=4, log=print):
+        """
+        Args:
+            budget (float): Target frame work time in seconds.
+            window (int): Frames averaged per decision.
+            headroom (float): Step up only when the average is below budget * headroom.
+            recover_windows (int): Consecutive fast windows needed to step up.
+            log (callable): Receives a message for every quality change.
+        """
+        self.budget = budget
+        self.window = window
+        self.headroom = headroom
+        self.recover_windows = recover_windows
+        self.log = log
+
+        self.level = 0
+        self.changes = deque(maxlen=HISTORY)  # (frame number, old level name, new level name, window average)
+        self._frames = 0
+        self._total = 0.0
+        self._count = 0
+        self._fast_windows = 0
+        set_quality(self.level)
+
+    def frame(self, frame_time):
+        """
+        Record one frame and adjust quality at the end of each window.
+
+        Args:
+            frame_time (float): Seconds spent on this frame's work.
+        """
+        self._frames += 1
+        self._total += frame_time
+        self._count += 1
+        if self._count < self.window:
+            return
+
+        average = self._total / self._count
+        self._total = 0.0
+        self._count = 0
+
+        if average > self.budget:
+            self._fast_windows = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self._change(self.level + 1, average)
+        elif average < self.budget * self.headroom:
+            self._fast_windows += 1
+            if self._fast_windows >= self.recover_windows and self.level > 0:
+                self._fast_windows = 0
+                self._change(self.level - 1, average)
+        else:
+            self._fast_windows = 0
+
+    def _change(self, level, average):
+        old = QUALITY_LEVELS[self.level].name
+        new = QUALITY_LEVELS[level].name
+        self.level = level
+        set_quality(level)
+        self.changes.append((self._frames, old, new, average))
+        self.log(f"Quality {old} -> {new} (avg frame {average * 1000:.1f} ms, budget {self.budget * 1000:.1f} ms)")
@@ -0,0 +1,63 @@
+"""
+Helpers for running the game without a window (benchmarks, soak tests, tools).
+
+- Uses SDL's dummy video/audio drivers unless the caller already chose drivers.
+- Builds a World with the real sounds and sprites, seeded for repeatable runs.
+"""
+
+import os
+import random
+import pygame
+import assets
+import finalboss
+import main
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from world import World
+
+
+def init():
+    """
+    Initialize pygame against dummy drivers and create an off-screen display.
+
+    Returns:
+        Surface: The (invisible) display surface.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def preload():
+    """
+    Load every gameplay and boss image up front so runs never time disk I/O.
+    """
+    assets.Preloader(main.GAMEPLAY_IMAGES + finalboss.IMAGES, main.GAMEPLAY_SOUNDS).start().finish()
+
+
+def new_world(seed=None, god_mode=True):
+    """
+    Create a World seeded for a repeatable run.
+
+    Args:
+        seed (int): Seed for the random module (None leaves it alone).
+        god_mode (bool): Keep the player alive regardless of hits.
+
+    Returns:
+        World: A fresh session at level 1.
+    """
+    if seed is not None:
+        random.seed(seed)
+    world = World(assets.load_sound("assets/shoot.wav", 0.4), assets.load_sound("assets/nomanches.wav", 0.7))
+    set_level(world, 1)
+    world.god_mode = god_mode
+    return world
+
+
+def set_level(world, level):
+    """
+    Jump the asteroid field to a level (ignoring DEV_MODE's SKIP_TO_LEVEL).
+    """
+    world.asteroid_field.level = level
+    world.asteroid_field.elapsed_time = (level - 1) * 15
+    world.previous_level = level
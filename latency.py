@@ -0,0 +1,141 @@
+"""
+Input-to-photon latency measurement.
+
+Each KEYDOWN for a control key is timestamped when the loop pulls it off the
+event queue, then followed until the simulation first shows the action
+(ship rotated, thrust applied, Shot spawned) and then until the display.flip()
+that presents that frame returns.
+
+Two numbers per action:
+    sim    - key down -> simulation reflects it (end of world.step)
+    photon - key down -> frame containing it handed to the display
+
+Events are timestamped on the game thread, so time spent sitting in SDL's
+queue before the pump is included only up to when the loop gets to it; the
+number is a lower bound, which is what comparing loop orderings needs.
+"""
+
+import json
+import time
+from collections import deque
+import numpy as np
+import pygame
+
+ROTATE = "rotate"
+THRUST = "thrust"
+SHOOT = "shoot"
+
+ACTIONS = {
+    pygame.K_LEFT: ROTATE,
+    pygame.K_RIGHT: ROTATE,
+    pygame.K_UP: THRUST,
+    pygame.K_SPACE: SHOOT,
+}
+
+
+class InputLatencyTracker:
+    """
+    Follows control key presses to the first presented frame that reflects them.
+    """
+
+    def __init__(self, label="", timeout=0.5, capacity=4096):
+        """
+        Args:
+            label (str): Configuration name printed with the report (vsync, pacing...).
+            timeout (float): Seconds after which an unreflected press counts as missed
+                (e.g. a tap released before the next get_pressed()).
+            capacity (int): Samples kept per action.
+        """
+        self.label = label
+        self.timeout = timeout
+        self.pending = {}     # action -> key-down time
+        self.reflected = {}   # action -> (key-down time, sim time)
+        self.samples = {action: deque(maxlen=capacity) for action in (ROTATE, THRUST, SHOOT)}
+        self.missed = {action: 0 for action in self.samples}
+        self._rotation = 0.0
+        self._shots_fired = 0
+
+    def key_down(self, key, now=None):
+        """
+        Record a KEYDOWN (ignored for non-control keys or while one is in flight).
+        """
+        action = ACTIONS.get(key)
+        if action is None or action in self.pending or action in self.reflected:
+            return
+        self.pending[action] = time.perf_counter() if now is None else now
+
+    def before_step(self, player):
+        """Remember the player state the next step will be compared against."""
+        self._rotation = player.rotation
+        self._shots_fired = player.shots_fired
+
+    def after_step(self, player, now=None):
+        """
+        Mark pending actions the last step made visible in the simulation.
+        """
+        if not self.pending:
+            return
+        now = time.perf_counter() if now is None else now
+        done = {
+            ROTATE: player.rotation != self._rotation,
+            THRUST: player.thrusting,
+            SHOOT: player.shots_fired > self._shots_fired,
+        }
+        for action, pressed in list(self.pending.items()):
+            if done[action]:
+                self.reflected[action] = (pressed, now)
+                del self.pending[action]
+            elif now - pressed > self.timeout:
+                self.missed[action] += 1
+                del self.pending[action]
+
+    def frame_presented(self, now=None):
+        """
+        Call right after display.flip(): closes every action reflected this frame.
+        """
+        if not self.reflected:
+            return
+        now = time.perf_counter() if now is None else now
+        for action, (pressed, simulated) in self.reflected.items():
+            self.samples[action].append((simulated - pressed, now - pressed))
+        self.reflected.clear()
+
+    # --- Reporting ---
+
+    def report(self):
+        """
+        Latency distribution per action.
+
+        Returns:
+            dict: action -> {"count", "missed", "sim": (p50, p95, p99, max), "photon": (...)} in ms.
+        """
+        result = {}
+        for action, samples in self.samples.items():
+            entry = {"count": len(samples), "missed": self.missed[action]}
+            if samples:
+                values = np.array(samples) * 1000
+                for i, name in enumerate(("sim", "photon")):
+                    column = values[:, i]
+                    entry[name] = tuple(float(v) for v in np.percentile(column, (50, 95, 99))) + (float(column.max()),)
+            result[action] = entry
+        return result
+
+    def print_report(self):
+        print(f"Input latency{f' ({self.label})' if self.label else ''}, ms:")
+        print(f"  {'action':<8}{'n':>6}{'miss':>6}  {'sim p50/p95/p99/max':<26}{'photon p50/p95/p99/max'}")
+        for action, entry in self.report().items():
+            if not entry["count"]:
+                print(f"  {action:<8}{0:6d}{entry['missed']:6d}")
+                continue
+            sim = "/".join(f"{v:.1f}" for v in entry["sim"])
+            photon = "/".join(f"{v:.1f}" for v in entry["photon"])
+            print(f"  {action:<8}{entry['count']:6d}{entry['missed']:6d}  {sim:<26}{photon}")
+
+    def dump(self, path):
+        """Write the report and raw samples as JSON (for comparing configurations)."""
+        with open(path, "w") as file:
+            json.dump({
+                "label": self.label,
+                "report": self.report(),
+                "samples": {action: list(samples) for action, samples in self.samples.items()},
+            }, file)
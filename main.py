@@ -1,265 +1,399 @@
+import random
+import time
+_import_start = time.perf_counter()
+
 import pygame
+import assets
+import asteroid
+import enemy
+import finalboss
+import player
+import snapshot
 from constants import *
-from devtools import DEV_MODE, SKIP_TO_LEVEL, GOD_MODE
-from enemy import Enemy
-from player import Player
-from asteroidfield import AsteroidField
-from asteroid import Asteroid
-from shot import Shot
-from finalboss import FinalBoss
-from screens import show_intro, show_game_over, show_boss_defeated_sequence
-
-# --- Utility Functions ---
-
-def clear_groups(*groups):
-    """Kills and clears all sprites from the given groups."""
-    for group in groups:
-        for sprite in list(group):
-            sprite.kill()
-        group.empty()
-
-def handle_player_hit(source, player, sound, screen, font):
-    """Handles collision between player and a damaging source."""
-    source.kill()
-    if not player.invincible and not GOD_MODE:
-        lost_final_life = player.lose_life()
-        sound.play()
-
-        if lost_final_life:
-            result = show_game_over(screen, font)
-            if result == "restart":
-                return True
-            pygame.quit()
-            exit()
-    return False
-
-# --- Main Game Loop ---
+from devtools import (DEV_MODE, ADAPTIVE_QUALITY, SLOW_FRAME_WATCHDOG, SLOW_FRAME_MS, MEMORY_STATS, MEMORY_DUMP_SECONDS,
+                      GC_MONITOR, FRAME_AWARE_GC, INPUT_LATENCY, VSYNC, FRAME_PACING,
+                      METRICS_PORT, RECORD_REPLAYS, REWIND, REWIND_SECONDS, RUN_AHEAD, SPLIT_PROCESSES)
+from governor import FrameGovernor
+from profiler import profiler, ProfilerOverlay
+from memstats import MemoryOverlay, MemoryDumper
+from gcmonitor import GCMonitor, FrameGC
+from latency import InputLatencyTracker
+from telemetry import telemetry
+from metrics import MetricsExporter
+from slowframes import SlowFrameWatchdog
+from controls import KEYBOARD
+from replay import ReplayRecorder, new_path as new_replay_path
+from rewind import RewindBuffer
+from runahead import RunAhead
+from splitsim import SplitSimulation
+from world import World, GAME_OVER, VICTORY, BOSS_LEVEL
+from screens import show_intro, show_game_over, show_boss_defeated_sequence, cutscene_images
+
+IMPORT_TIME = time.perf_counter() - _import_start
+
+# --- Startup Asset Manifest (decoded behind the intro screen) ---
+GAMEPLAY_IMAGES = [
+    ("assets/background.png", (SCREEN_WIDTH, SCREEN_HEIGHT), False),
+    ("assets/ship.png", (24, 24), True),
+] + [(path, size, True) for path, size in player.IMAGES + asteroid.IMAGES + enemy.IMAGES]
+
+GAMEPLAY_SOUNDS = [
+    ("assets/shoot.wav", 0.4),
+    ("assets/nomanches.wav", 0.7),
+    ("assets/khakha.wav", 1.0),
+] + player.SOUNDS
+
+GAMEPLAY_FONTS = [(32, False), (60, False), (72, True)]
+
+MAX_STEPS_PER_FRAME = 5  # Fixed ticks caught up per frame before dropping the backlog
+KILLCAM_SECONDS = 3      # Play time shown again (in real time) before the game over screen
+
+
+def report_startup(timings):
+    """Print startup phase timings (in milliseconds) so regressions are visible."""
+    print("Startup timings:")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<16} {seconds * 1000:8.1f} ms")
+
+# --- Game Flow States ---
+INTRO = "intro"
+PLAYING = "playing"
+BOSS = "boss"
+WIN = "victory"
+LOST = "game_over"
+QUIT = "quit"
+
+# --- Game Flow State Machine ---
+
+class Game:
+    """
+    Explicit game-flow state machine.
+
+    Loads SDL, sounds, fonts and images once, then moves between
+    intro -> playing -> boss -> victory / game over -> intro without
+    recursion. Restarting only resets the World.
+
+    Only the display is brought up before the intro; everything else is
+    decoded by a background Preloader while the intro is on screen.
+    """
+
+    def __init__(self):
+        self.timings = {"imports": IMPORT_TIME}
+
+        # Setup Screen (just enough SDL to show the intro)
+        start = time.perf_counter()
+        pygame.display.init()
+        pygame.font.init()
+        # SDL only honours vsync on a renderer-backed window, hence SCALED
+        flags = pygame.SCALED if VSYNC else 0
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags, vsync=int(VSYNC))
+        self.clock = pygame.time.Clock()
+        self.timings["SDL init"] = time.perf_counter() - start
+
+        self.loader = assets.Preloader(GAMEPLAY_IMAGES, GAMEPLAY_SOUNDS, GAMEPLAY_FONTS).start()
+        self.boss_prefetch = None
+        self.governor = FrameGovernor() if ADAPTIVE_QUALITY else None
+        self.profiler_overlay = None
+        self.memory_overlay = None
+        self.memory_dumper = MemoryDumper(MEMORY_DUMP_SECONDS) if MEMORY_DUMP_SECONDS else None
+        self.gc_monitor = GCMonitor().install() if GC_MONITOR else None
+        self.frame_gc = FrameGC() if FRAME_AWARE_GC else None
+        self.metrics = MetricsExporter(METRICS_PORT).start() if METRICS_PORT else None
+        self.latency = InputLatencyTracker(f"vsync={VSYNC} pacing={FRAME_PACING} run_ahead={RUN_AHEAD}") if INPUT_LATENCY else None
+        self.watchdog = SlowFrameWatchdog(SLOW_FRAME_MS / 1000) if SLOW_FRAME_WATCHDOG else None
+        self.recorder = None
+        self.rewind = RewindBuffer(REWIND_SECONDS) if REWIND else None
+        self.run_ahead = RunAhead(RUN_AHEAD) if RUN_AHEAD else None
+        self.split = SplitSimulation().start() if SPLIT_PROCESSES else None
+        self.world = None
+        self.accumulator = 0.0  # Frame time not yet simulated
+
+        self.handlers = {
+            INTRO: self.intro,
+            PLAYING: self.play,
+            BOSS: self.play,
+            WIN: self.victory,
+            LOST: self.game_over,
+        }
+
+    def run(self, state=INTRO):
+        """
+        Run state handlers until one of them returns QUIT.
+        """
+        while state != QUIT:
+            state = self.handlers[state]()
+        if self.split:
+            self.split.close()
+        if self.watchdog:
+            self.watchdog.close()
+        if self.gc_monitor:
+            self.gc_monitor.print_report()
+        if self.latency:
+            self.latency.print_report()
+        telemetry.close()
+        if self.metrics:
+            self.metrics.close()
+        if telemetry.dropped:
+            print(f"Telemetry dropped {telemetry.dropped} events (ring full)")
+        pygame.quit()
+
+    # --- State Handlers ---
+
+    def intro(self):
+        if show_intro(self.screen, self.loader) == QUIT:
+            return QUIT
+
+        if RECORD_REPLAYS and not self.split:
+            # Seeded so the replay header can name the seed the session started from
+            seed = random.randrange(1 << 63)
+            random.seed(seed)
+
+        if self.world is None:
+            self.load_gameplay()
+        else:
+            self.world.reset()
+            if self.frame_gc:
+                self.frame_gc.full_collect()  # Old session's sprites, while nothing is animating
+
+        if RECORD_REPLAYS and not self.split:
+            self.recorder = ReplayRecorder(new_replay_path(), seed)
+            self.world.set_input(self.recorder.wrap(KEYBOARD))
+
+        if self.rewind:
+            self.rewind.clear()
+
+        if self.split:
+            self.split.reset(random.randrange(1 << 63))
+
+        self.accumulator = 0.0
+        self.clock.tick()  # Don't count time spent on the intro as frame time
+        return PLAYING
+
+    def load_gameplay(self):
+        """
+        Collect the preloaded assets and build the first World.
+        """
+        self.timings.update(self.loader.finish())
+
+        # Load Sounds
+        self.shoot_sound = assets.load_sound("assets/shoot.wav", 0.4)
+        self.explosion_sound = assets.load_sound("assets/nomanches.wav", 0.7)
+        self.gameover_sound = assets.load_sound("assets/khakha.wav", 1.0)
+
+        # Fonts & Images
+        self.font = assets.get_font(32)
+        self.big_font = assets.get_font(60)
+        self.background_img = assets.load_image("assets/background.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+        self.life_icon = assets.load_image("assets/ship.png", (24, 24))
+
+        self.profiler_overlay = ProfilerOverlay(assets.get_font(20))
+        self.memory_overlay = MemoryOverlay(assets.get_font(20))
+
+        telemetry.start()
+
+        # Freeze before the World exists: its sprites die on the first reset and
+        # would otherwise sit in the permanent generation for the whole process
+        if self.frame_gc:
+            self.frame_gc.freeze()
+
+        self.world = World(self.shoot_sound, self.explosion_sound)
+
+        if DEV_MODE:
+            report_startup(self.timings)
+
+    def play(self):
+        """
+        Run frames until the session leaves the playing/boss states.
+        """
+        if self.split:
+            return self.split.play(self)
+
+        world = self.world
+        was_boss = world.boss_active
+
+        while True:
+            with profiler.phase("tick"):
+                dt = self.tick() / 1000
+            frame_start = time.perf_counter()
+            if self.watchdog:
+                self.watchdog.begin_frame()
+
+            with profiler.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.stop_recording(None)
+                        return QUIT
+                    elif event.type == pygame.KEYDOWN:
+                        self.handle_key(event.key)
+
+            with profiler.phase("background"):
+                self.screen.blit(self.background_img, (0, 0))
+
+            self.prefetch_boss(world)
+            if self.latency:
+                self.latency.before_step(world.player)
+            outcome = self.simulate(world, dt)
+            if self.latency:
+                self.latency.after_step(world.player)
+            if outcome == VICTORY:
+                self.stop_recording(outcome)
+                return WIN
+            if outcome == GAME_OVER:
+                self.stop_recording(outcome)
+                if self.rewind and self.kill_cam(world) == QUIT:
+                    return QUIT
+                return LOST
+
+            if self.run_ahead:
+                with profiler.phase("run-ahead"):
+                    saved = self.run_ahead.advance(world)
+                if self.latency:
+                    self.latency.after_step(world.player)  # The predicted frame is what gets shown
+
+            with profiler.phase("draw"):
+                world.draw(self.screen, self.font, self.life_icon)
+                self.profiler_overlay.draw(self.screen)
+                self.memory_overlay.draw(self.screen, world)
+
+            if self.run_ahead:
+                with profiler.phase("run-ahead"):
+                    self.run_ahead.restore(world, saved)
+
+            with profiler.phase("flip"):
+                pygame.display.flip()
+            if self.latency:
+                self.latency.frame_presented()
+
+            if self.frame_gc:
+                self.frame_gc.between_frames(time.perf_counter() - frame_start)
+            if self.gc_monitor:
+                self.gc_monitor.end_frame(time.perf_counter() - frame_start)
+            if self.governor:
+                self.governor.frame(time.perf_counter() - frame_start)
+            if self.metrics:
+                self.metrics.frame(time.perf_counter() - frame_start, world)
+            if self.watchdog:
+                self.watchdog.end_frame(world.entity_counts)
+            if self.memory_dumper:
+                self.memory_dumper.tick(world)
+            profiler.end_frame()
+
+            if world.boss_active and not was_boss:
+                return BOSS
+
+    def simulate(self, world, dt):
+        """
+        Run as many FIXED_DT ticks as the elapsed frame time covers.
+
+        Args:
+            world (World): Current session.
+            dt (float): Seconds since the previous frame.
+
+        Returns:
+            str or None: World.step() outcome, ending the frame's ticks early.
+        """
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= FIXED_DT and steps < MAX_STEPS_PER_FRAME:
+            self.accumulator -= FIXED_DT
+            steps += 1
+            if self.recorder:
+                self.recorder.tick(world)
+            if self.rewind:
+                self.rewind.record(world)
+            outcome = world.step(FIXED_DT)
+            if outcome:
+                return outcome
+
+        # After a long stall (window drag, breakpoint), slow down instead of spiralling
+        if steps == MAX_STEPS_PER_FRAME:
+            self.accumulator = min(self.accumulator, FIXED_DT)
+        return None
+
+    def stop_recording(self, outcome):
+        """
+        Finish the session's replay file, if one is being recorded.
+        """
+        if self.recorder:
+            self.recorder.close(self.world, outcome)
+            print(f"Replay saved to {self.recorder.path}")
+            self.recorder = None
+
+    def handle_key(self, key):
+        """
+        Developer hotkeys and latency timestamps (gameplay keys are polled by Player).
+        """
+        if self.latency:
+            self.latency.key_down(key)
+        if profiler.enabled:
+            if key == pygame.K_F3:
+                self.profiler_overlay.toggle()
+            elif key == pygame.K_F9:
+                print(f"Writing Chrome trace to {profiler.dump_trace()}")
+        if MEMORY_STATS and key == pygame.K_F4:
+            self.memory_overlay.toggle()
+        # A rewind would desync the replay being recorded
+        if self.rewind and key == pygame.K_BACKSPACE and not self.recorder:
+            self.rewind.rewind(self.world, 1.0)
+
+    def kill_cam(self, world):
+        """
+        Replay the last KILLCAM_SECONDS of play in real time from the rewind buffer.
+
+        Returns:
+            str or None: QUIT if the window was closed meanwhile.
+        """
+        label = self.font.render("REPLAY", True, (255, 80, 80))
+        for data in self.rewind.frames(KILLCAM_SECONDS):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return QUIT
+            snapshot.restore(world, data)
+            self.screen.blit(self.background_img, (0, 0))
+            world.draw(self.screen, self.font, self.life_icon)
+            self.screen.blit(label, label.get_rect(midtop=(SCREEN_WIDTH // 2, 10)))
+            pygame.display.flip()
+            self.clock.tick(round(1 / FIXED_DT))  # One snapshot per tick, shown at the tick rate
+        return None
+
+    def tick(self):
+        """
+        Wait for the next frame according to FRAME_PACING.
+
+        Returns:
+            int: Milliseconds since the previous tick.
+        """
+        if FRAME_PACING == "busy":
+            return self.clock.tick_busy_loop(60)  # Spins instead of sleeping: tighter, costs a core
+        if FRAME_PACING == "none":
+            return self.clock.tick()  # Uncapped (or paced by vsync alone)
+        return self.clock.tick(60)
+
+    def prefetch_boss(self, world):
+        """
+        Start decoding the boss and cutscene images one level ahead of the
+        boss fight, then collect them on a later frame once they are ready.
+        """
+        if self.boss_prefetch is None:
+            if world.asteroid_field.level >= BOSS_LEVEL - 1:
+                requests = finalboss.IMAGES + cutscene_images(self.screen.get_width())
+                self.boss_prefetch = assets.Preloader(requests).start()
+        else:
+            self.boss_prefetch.poll()
+
+    def victory(self):
+        if show_boss_defeated_sequence(self.screen) == QUIT:
+            return QUIT
+        return self.game_over(win=True)
+
+    def game_over(self, win=False):
+        if show_game_over(self.screen, self.font, win=win) == "restart":
+            return INTRO
+        return QUIT
+
 
 def main():
-    pygame.init()
-    pygame.font.init()
-    pygame.mixer.init()
-
-    # Load Sounds
-    shoot_sound = pygame.mixer.Sound("assets/shoot.wav")
-    explosion_sound = pygame.mixer.Sound("assets/nomanches.wav")
-    gameover_sound = pygame.mixer.Sound("assets/khakha.wav")
-
-    shoot_sound.set_volume(0.4)
-    explosion_sound.set_volume(0.7)
-    gameover_sound.set_volume(1.0)
-
-    # Setup Screen & Fonts
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 32)
-    big_font = pygame.font.SysFont(None, 60)
-
-    background_img = pygame.image.load("assets/background.png").convert()
-    background_img = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-    life_icon_raw = pygame.image.load("assets/ship.png").convert_alpha()
-    life_icon = pygame.transform.scale(life_icon_raw, (24, 24))
-
-    # Game State Initialization
-    score = 0
-    previous_level = 1
-    explosion_cd_player = 0.0
-
-    # Sprite Groups
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    mikito_bullets = pygame.sprite.Group()
-    boss_bullets = pygame.sprite.Group()
-
-    # Class-wide sprite group assignment
-    Player.containers = (updatable, drawable)
-    Asteroid.containers = (asteroids, updatable, drawable)
-    Shot.containers = (shots, updatable, drawable)
-    Enemy.containers = (enemies, updatable, drawable)
-    AsteroidField.containers = (updatable,)
-
-    # Player and Asteroid Field Initialization
-    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, shoot_sound)
-    asteroid_field = AsteroidField(asteroids, enemies, player, mikito_bullets)
-    updatable.add(asteroid_field)
-
-    if DEV_MODE:
-        asteroid_field.level = SKIP_TO_LEVEL
-
-    show_intro(screen)
-
-    boss = None
-    boss_active = False
-    boss_defeated = False
-
-    # --- Main Loop ---
-    while True:
-        dt = clock.tick(60) / 1000
-        explosion_cd_player -= dt
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return
-
-        screen.blit(background_img, (0, 0))
-
-        # Update field or trigger boss
-        if not boss_active and asteroid_field.level < 10:
-            asteroid_field.update(dt)
-        elif asteroid_field.level >= 10 and not boss_active:
-            boss_active = True
-            boss = FinalBoss(player, enemies, boss_bullets, mikito_bullets)
-            drawable.add(boss)
-            updatable.add(boss)
-            updatable.remove(asteroid_field)
-            clear_groups(asteroids, enemies, mikito_bullets)
-            player.disable_wrap = True
-
-        # Update active objects
-        updatable.update(dt)
-        mikito_bullets.update(dt)
-        boss_bullets.update(dt)
-
-        # Boss defeated
-        if boss and boss.health <= 0 and not boss_defeated:
-            boss_defeated = True
-            player.disable_wrap = False
-            show_boss_defeated_sequence(screen)
-            result = show_game_over(screen, font, win=True)
-            if result == "restart":
-                return main()
-            pygame.quit()
-            exit()
-
-        # Score increase on level up
-        if asteroid_field.level > previous_level:
-            score += 500
-            previous_level = asteroid_field.level
-
-        # --- Collision Handling ---
-
-        # Asteroids vs Player
-        for asteroid in list(asteroids):
-            distance = player.position.distance_to(asteroid.position)
-            if distance < player.radius + asteroid.radius:
-                if player.invincible:
-                    push = player.position - asteroid.position
-                    if push.length() > 0:
-                        push.scale_to_length(10)
-                        player.position += push
-                elif handle_player_hit(asteroid, player, explosion_sound, screen, font):
-                    return main()
-
-        # Boss Bullets vs Player
-        for bullet in list(boss_bullets):
-            hit = (player.position.distance_to(bullet.position) < player.radius + max(bullet.get_rect().width, bullet.get_rect().height) / 2
-                   if hasattr(bullet, 'get_rect') else player.collide(bullet))
-            if hit and handle_player_hit(bullet, player, explosion_sound, screen, font):
-                return main()
-
-        # Mikito Bullets vs Player
-        for bullet in list(mikito_bullets):
-            if player.collide(bullet):
-                if getattr(bullet, 'is_dizzy', False):
-                    player.apply_dizzy()
-                elif handle_player_hit(bullet, player, explosion_sound, screen, font):
-                    return main()
-                bullet.kill()
-
-        # Boss vs Player
-        if boss and player.collide(boss):
-            if not player.invincible and not GOD_MODE:
-                lost_final_life = player.lose_life()
-                explosion_sound.play()  # ✅ Play sound every time a life is lost
-
-                if lost_final_life:
-                    if show_game_over(screen, font) == "restart":
-                        return main()
-                    pygame.quit()
-                    exit()
-
-            else:
-                push = player.position - boss.position
-                push.x = -abs(push.x) if push.x >= 0 else push.x
-                push.y *= 0.3
-                if push.length() > 0:
-                    push.scale_to_length(30)
-                    player.position += push
-
-        # Shots vs Asteroids
-        for shot in list(shots):
-            for asteroid in list(asteroids):
-                if shot.alive() and asteroid.alive() and asteroid.collide(shot):
-                    asteroid.split()
-                    shot.kill()
-                    score += 100
-                    break
-
-        # Player vs Enemies & Shots vs Enemies
-        for enemy in list(enemies):
-            if player.collide(enemy):
-                player.push_back_from(enemy.position)
-
-        for shot in list(shots):
-            for enemy in list(enemies):
-                if shot.alive() and enemy.alive() and enemy.collide(shot):
-                    enemy.kill()
-                    shot.kill()
-                    score += 250
-                    break
-
-        # Shots vs Mikito Bullets
-        for shot in list(shots):
-            for bullet in list(mikito_bullets):
-                if shot.alive() and bullet.alive() and bullet.collide(shot):
-                    bullet.kill()
-                    shot.kill()
-                    score += 10
-                    break
-
-        # Shots vs Boss Bullets / Boss
-        for shot in list(shots):
-            for bullet in list(boss_bullets):
-                if shot.alive() and bullet.alive() and hasattr(bullet, 'health') and bullet.collide(shot):
-                    bullet.health -= 1
-                    shot.kill()
-                    if bullet.health <= 0:
-                        bullet.kill()
-                    score += 20
-
-            if boss and shot.alive() and boss.collide(shot):
-                boss.take_damage(1)
-                shot.kill()
-                score += 100
-
-        # --- Drawing Section ---
-        for sprite in drawable:
-            sprite.draw(screen)
-        for bullet in mikito_bullets:
-            bullet.draw(screen)
-        for bullet in boss_bullets:
-            bullet.draw(screen)
-
-        # Draw Arena Walls during Boss Fight
-        if boss_active and not boss_defeated:
-            wall_color = (255, 100, 100)
-            wall_width = 6
-            pygame.draw.line(screen, wall_color, (0, 0), (0, SCREEN_HEIGHT), wall_width)
-            pygame.draw.line(screen, wall_color, (SCREEN_WIDTH - 1, 0), (SCREEN_WIDTH - 1, SCREEN_HEIGHT), wall_width)
-            pygame.draw.line(screen, wall_color, (0, 0), (SCREEN_WIDTH, 0), wall_width)
-            pygame.draw.line(screen, wall_color, (0, SCREEN_HEIGHT - 1), (SCREEN_WIDTH, SCREEN_HEIGHT - 1), wall_width)
-
-        # UI Info
-        screen.blit(font.render(f"Level {asteroid_field.level}", True, (255, 255, 0)), (10, 10))
-        screen.blit(font.render(f"Score: {score}", True, (255, 255, 255)), (SCREEN_WIDTH - 150, 10))
-        for i in range(player.lives):
-            screen.blit(life_icon, (10 + i * (24 + 5), 40))
-
-        pygame.display.flip()
+    Game().run()
 
 # --- Entry Point ---
 if __name__ == "__main__":
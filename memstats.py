@@ -0,0 +1,198 @@
+"""
+Runtime memory accounting for sprites and surfaces.
+
+- account(world) counts live sprites per class and the pixel bytes their
+  surfaces hold, split into shared (cached asset or used by several sprites)
+  and unique (owned by one sprite only).
+- Asset caches (images, rotation frames, tinted copies, rendered text) are counted separately.
+- MemoryOverlay draws the table in-game; MemoryDumper writes it to JSON periodically.
+
+Pixel bytes are pitch * height of each Surface, i.e. what SDL actually allocated.
+"""
+
+import json
+import os
+import threading
+import time
+import pygame
+import assets
+
+# Groups that between them hold every drawn sprite (bullets aren't in drawable)
+SPRITE_GROUPS = ("drawable", "mikito_bullets", "boss_bullets")
+
+# Always listed (even at zero) so dumps line up; any other live class is added as found
+TRACKED_CLASSES = ("Asteroid", "Shot", "Enemy", "EnemyBullet", "BoneBullet", "CookieBullet")
+
+
+def surface_bytes(surface):
+    """Bytes of pixel data held by a Surface."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def _sprite_surfaces(sprite):
+    """Every Surface stored directly on a sprite's attributes."""
+    return [value for value in vars(sprite).values() if isinstance(value, pygame.Surface)]
+
+
+def cache_stats():
+    """
+    Size of each asset cache.
+
+    Returns:
+        dict: cache name -> {"count", "bytes"}.
+    """
+    caches = {"images": assets._images, "rotations": assets._rotations, "tints": assets._tints,
+              "texts": assets._texts}
+    return {
+        name: {"count": len(cache), "bytes": sum(surface_bytes(surface) for surface in cache.values())}
+        for name, cache in caches.items()
+    }
+
+
+def account(world):
+    """
+    Per-class accounting of live sprites and their surfaces.
+
+    A surface is shared if it is in an asset cache or referenced by more than
+    one live sprite; shared bytes are counted once per class that uses them.
+
+    Args:
+        world (World): The running session.
+
+    Returns:
+        dict: {"classes": name -> {"count", "shared_bytes", "unique_bytes"},
+               "caches": cache_stats(), "total_bytes": all distinct surfaces}.
+    """
+    sprites = set()
+    for name in SPRITE_GROUPS:
+        sprites.update(getattr(world, name))
+
+    cached = {id(surface) for cache in (assets._images, assets._rotations, assets._tints, assets._texts)
+              for surface in cache.values()}
+
+    # First pass: who references what
+    owners = {}     # surface id -> number of sprites referencing it
+    surfaces = {}   # surface id -> Surface
+    per_sprite = []
+    for sprite in sprites:
+        found = {id(surface): surface for surface in _sprite_surfaces(sprite)}
+        per_sprite.append((sprite, found))
+        for surface_id, surface in found.items():
+            owners[surface_id] = owners.get(surface_id, 0) + 1
+            surfaces[surface_id] = surface
+
+    classes = {name: {"count": 0, "shared_bytes": 0, "unique_bytes": 0} for name in TRACKED_CLASSES}
+    shared_seen = {}  # class name -> shared surface ids already counted
+    for sprite, found in per_sprite:
+        name = type(sprite).__name__
+        stats = classes.setdefault(name, {"count": 0, "shared_bytes": 0, "unique_bytes": 0})
+        stats["count"] += 1
+        seen = shared_seen.setdefault(name, set())
+        for surface_id, surface in found.items():
+            if surface_id in cached or owners[surface_id] > 1:
+                if surface_id not in seen:
+                    seen.add(surface_id)
+                    stats["shared_bytes"] += surface_bytes(surface)
+            else:
+                stats["unique_bytes"] += surface_bytes(surface)
+
+    caches = cache_stats()
+    uncached = sum(surface_bytes(surface) for surface_id, surface in surfaces.items() if surface_id not in cached)
+    return {
+        "classes": dict(sorted(classes.items())),
+        "caches": caches,
+        "total_bytes": uncached + sum(cache["bytes"] for cache in caches.values()),
+    }
+
+
+def format_table(stats):
+    """
+    Render account() output as text rows (sizes in KiB).
+
+    Returns:
+        list: One string per row, header first.
+    """
+    rows = [f"{'class':<16}{'live':>6}{'shared':>9}{'unique':>9}"]
+    for name, entry in stats["classes"].items():
+        rows.append(f"{name:<16}{entry['count']:6d}{entry['shared_bytes'] / 1024:9.0f}{entry['unique_bytes'] / 1024:9.0f}")
+    for name, entry in stats["caches"].items():
+        rows.append(f"{'cache.' + name:<16}{entry['count']:6d}{entry['bytes'] / 1024:9.0f}{'':>9}")
+    rows.append(f"{'total KiB':<16}{'':>6}{stats['total_bytes'] / 1024:9.0f}")
+    return rows
+
+
+# --- On-screen Overlay ---
+
+class MemoryOverlay:
+    """
+    Memory table in the bottom-left corner, refreshed every refresh_frames.
+    """
+
+    def __init__(self, font, refresh_frames=60):
+        self.font = font
+        self.refresh_frames = refresh_frames
+        self.visible = False
+        self._lines = []
+        self._frames = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._frames = 0
+
+    def draw(self, screen, world):
+        """
+        Draw the table (if visible), re-accounting every refresh_frames frames.
+        """
+        if not self.visible:
+            return
+
+        if self._frames % self.refresh_frames == 0:
+            rows = format_table(account(world))
+            self._lines = [self.font.render(row, True, (0, 255, 255), (0, 0, 0)) for row in rows]
+        self._frames += 1
+
+        y = screen.get_height() - 10 - sum(line.get_height() for line in self._lines)
+        for line in self._lines:
+            screen.blit(line, (10, y))
+            y += line.get_height()
+
+
+# --- Periodic Dump ---
+
+class MemoryDumper:
+    """
+    Append account() snapshots to a JSON-lines file every `interval` seconds.
+    """
+
+    def __init__(self, interval=60.0, path="memstats.jsonl"):
+        """
+        Args:
+            interval (float): Seconds between dumps.
+            path (str): Output file (one JSON object per line).
+        """
+        self.interval = interval
+        self.path = path
+        self._next = time.time() + interval
+
+    def tick(self, world):
+        """
+        Call once per frame; dumps when the interval has elapsed.
+        """
+        now = time.time()
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        self.dump(world)
+
+    def dump(self, world):
+        """
+        Account now and append the result on a background thread.
+        """
+        entry = {"time": time.time(), "level": world.asteroid_field.level, **account(world)}
+
+        def write():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+
+        threading.Thread(target=write, name="memstats-writer", daemon=True).start()
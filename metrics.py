@@ -0,0 +1,188 @@
+"""
+Local Prometheus metrics endpoint for live gameplay counters.
+
+- MetricsExporter serves http://127.0.0.1:<port>/metrics from a daemon thread
+  in the Prometheus text exposition format.
+- The game thread never takes a lock: frame() writes frame timestamps into a
+  NumPy ring and, every few frames, swaps in a new dict of world gauges.
+  The server thread only reads (a scrape may see a frame-old value; that's fine).
+- GC pauses are counted by a gc.callbacks hook; asset cache hit rates come
+  from the counters in assets.py.
+"""
+
+import gc
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import assets
+from telemetry import telemetry
+
+PREFIX = "asteroids"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    exporter = None  # Set per server in MetricsExporter.start()
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.exporter.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # Don't write a line to stderr for every scrape
+
+
+class MetricsExporter:
+    """
+    Background HTTP endpoint exposing counters and gauges of the running game.
+    """
+
+    def __init__(self, port=9108, host="127.0.0.1", frames=600, publish_every=30):
+        """
+        Args:
+            port (int): TCP port to listen on.
+            host (str): Interface to bind (localhost only by default).
+            frames (int): Frames kept for FPS and frame-time quantiles.
+            publish_every (int): Frames between world gauge snapshots.
+        """
+        self.host = host
+        self.port = port
+        self.publish_every = publish_every
+
+        self.capacity = frames
+        self.timestamps = np.zeros(frames, dtype=np.float64)
+        self.frame_times = np.zeros(frames, dtype=np.float64)
+        self.frames = 0
+
+        self.world_gauges = {}  # Replaced wholesale, never mutated
+
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_total = [0.0, 0.0, 0.0]
+        self.gc_pause_max = [0.0, 0.0, 0.0]
+        self._gc_start = 0.0
+
+        self._server = None
+
+    def start(self):
+        """
+        Bind the port, hook GC and start serving. Returns self for chaining.
+        """
+        handler = type("MetricsHandler", (_Handler,), {"exporter": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        gc.callbacks.append(self._gc_callback)
+        return self
+
+    def close(self):
+        if self._server is None:
+            return
+        gc.callbacks.remove(self._gc_callback)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    # --- Game Thread ---
+
+    def _gc_callback(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+            return
+        generation = info["generation"]
+        pause = time.perf_counter() - self._gc_start
+        self.gc_collections[generation] += 1
+        self.gc_pause_total[generation] += pause
+        if pause > self.gc_pause_max[generation]:
+            self.gc_pause_max[generation] = pause
+
+    def frame(self, frame_time, world):
+        """
+        Record one finished frame; call once per frame from the game loop.
+
+        Args:
+            frame_time (float): Seconds of work in the frame (excluding the tick wait).
+            world (World): Current session, sampled every publish_every frames.
+        """
+        i = self.frames % self.capacity
+        self.timestamps[i] = time.perf_counter()
+        self.frame_times[i] = frame_time
+        self.frames += 1
+
+        if self.frames % self.publish_every == 0:
+            gauges = world.entity_counts()
+            gauges["score"] = world.score
+            self.world_gauges = gauges
+
+    # --- Server Thread ---
+
+    def render(self):
+        """
+        Format every metric in the Prometheus text format.
+
+        Returns:
+            str: Exposition body.
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                label_text = "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}" if labels else ""
+                lines.append(f"{PREFIX}_{name}{label_text} {value}")
+
+        # Frames
+        frames = self.frames
+        n = min(frames, self.capacity)
+        timestamps = np.sort(self.timestamps[:n])
+        frame_times = self.frame_times[:n].copy()
+        fps = (n - 1) / (timestamps[-1] - timestamps[0]) if n > 1 and timestamps[-1] > timestamps[0] else 0.0
+
+        metric("frames_total", "counter", "Frames rendered.", [({}, frames)])
+        metric("fps", "gauge", f"Frames per second over the last {self.capacity} frames.", [({}, f"{fps:.2f}")])
+        if n:
+            values = np.quantile(frame_times, QUANTILES)
+            metric("frame_seconds", "summary", "Frame work time (excluding the frame-cap wait).",
+                   [({"quantile": q}, f"{v:.6f}") for q, v in zip(QUANTILES, values)])
+
+        # World
+        gauges = self.world_gauges
+        if gauges:
+            groups = ("asteroids", "shots", "enemies", "mikito_bullets", "boss_bullets", "updatable", "drawable")
+            metric("entities", "gauge", "Live sprites per group.", [({"group": g}, gauges[g]) for g in groups])
+            metric("level", "gauge", "Current AsteroidField level.", [({}, gauges["level"])])
+            metric("score", "gauge", "Current score.", [({}, gauges["score"])])
+            metric("boss_active", "gauge", "1 while the boss fight is on.", [({}, int(gauges["boss_active"]))])
+            if gauges["boss_health"] is not None:
+                metric("boss_health", "gauge", "Remaining boss health.", [({}, gauges["boss_health"])])
+
+        # Asset caches
+        lookups = dict(assets.cache_lookups)
+        misses = dict(assets.cache_misses)
+        metric("asset_cache_lookups_total", "counter", "Asset cache lookups.",
+               [({"cache": name}, count) for name, count in lookups.items()])
+        metric("asset_cache_misses_total", "counter", "Asset cache misses (decode or render needed).",
+               [({"cache": name}, count) for name, count in misses.items()])
+        metric("asset_cache_hit_ratio", "gauge", "Share of lookups served from the cache.",
+               [({"cache": name}, f"{1 - misses[name] / count:.4f}") for name, count in lookups.items() if count])
+
+        # GC
+        generations = range(3)
+        metric("gc_collections_total", "counter", "Cyclic GC passes.",
+               [({"generation": g}, self.gc_collections[g]) for g in generations])
+        metric("gc_pause_seconds_total", "counter", "Time spent in GC passes.",
+               [({"generation": g}, f"{self.gc_pause_total[g]:.6f}") for g in generations])
+        metric("gc_pause_seconds_max", "gauge", "Longest GC pass so far.",
+               [({"generation": g}, f"{self.gc_pause_max[g]:.6f}") for g in generations])
+
+        metric("telemetry_dropped_total", "counter", "Telemetry events dropped on a full ring.", [({}, telemetry.dropped)])
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,1196 @@
+"""
+Local-network multiplayer: one authoritative server, two to four clients, UDP.
+
+Server
+    - Runs the World, with the same World.step() main() uses, at 60 ticks/s.
+      Each client gets one ship, driven by a NetInput fed from that client's packets.
+    - Every SNAPSHOT_INTERVAL ticks it sends each client every entity, quantized
+      into ENTITY_DTYPE records (1/8 px positions, 256-step angles). The
+      records are delta-encoded against the last snapshot that client
+      acknowledged and zlib'd. The client's own ship follows at full precision.
+
+Client
+    - Sends its controls every tick, repeating the previous INPUT_REDUNDANCY
+      ticks so a lost packet rarely loses an input.
+    - Predicts its own ship: it takes the server's state after the last input
+      the server applied and replays the inputs sent since then.
+    - Draws everything else by interpolating the last two snapshots.
+
+Delta encoding: records are matched by entity id. Each field is sent as its
+difference from the baseline record with the same id (zeros for new
+entities), with the baseline's position first moved along its velocity to
+the current tick. Columns go one after another, with 16-bit fields split into
+byte planes. Asteroids, shots and bullets fly in straight lines, so most of
+the stream is zeros that zlib all but removes. A client without a usable
+baseline gets the differences from nothing.
+
+Both ends send through a Link, which can delay, jitter and drop datagrams,
+so all of this can be exercised on localhost:
+
+Usage:
+    python netplay.py server --players 2               # wait for 2 clients, then play
+    python netplay.py client --host 127.0.0.1          # keyboard + window
+    python netplay.py local --players 3 --latency 100 --jitter 10 --loss 0.05
+    python netplay.py bench                            # bytes/snapshot and tick cost vs entity count
+"""
+
+import argparse
+import heapq
+import math
+import multiprocessing
+import random
+import socket
+import struct
+import sys
+import time
+import zlib
+from collections import deque
+import numpy as np
+import pygame
+import assets
+from asteroid import Asteroid, TIERS, image_size
+from constants import FIXED_DT, SCREEN_WIDTH, SCREEN_HEIGHT, BOSS_STAGE1_HEALTH, BOSS_STAGE2_HEALTH
+from controls import Controls, HeldInput, KEYBOARD, NO_INPUT, from_bits, to_bits
+from enemy import Enemy, EnemyBullet, MIKITO_DIAMETER, BULLET_SIZE
+from finalboss import FinalBoss, BoneBullet, CookieBullet, BOSS_IMAGE_SIZE, BONE_SIZE, COOKIE_SIZE
+from governor import quality
+from player import Player, SHIP_DIAMETER
+from shot import Shot
+from snapshot import PLAYER, ASTEROID, SHOT, ENEMY, BOSS, ENEMY_BULLET, BONE, COOKIE
+from world import GAME_OVER, VICTORY, MAX_PLAYERS, SPAWN_OFFSETS
+
+PROTOCOL = 1
+DEFAULT_PORT = 50607
+
+SNAPSHOT_INTERVAL = 2    # Ticks between snapshots (30 per second)
+INPUT_REDUNDANCY = 8     # Past ticks of controls repeated in every input packet
+MAX_INPUT_QUEUE = 6      # Ticks of controls a server buffers before dropping the oldest
+HISTORY = 64             # Snapshots kept as delta baselines on both ends
+
+# --- Packets ---
+HELLO = 1       # client -> server: protocol
+WELCOME = 2     # server -> client: slot, player count
+INPUT = 3       # client -> server: acked snapshot, last input sequence, inputs
+SNAPSHOT = 4    # server -> client: see _SNAPSHOT and _SHIP, then encoded entities
+BYE = 5         # either way: leaving / session over
+
+_HELLO = struct.Struct("<BH")
+_WELCOME = struct.Struct("<BBB")
+_INPUT = struct.Struct("<BIIB")
+# type, tick, baseline tick, last applied input sequence, score, level, flags
+_SNAPSHOT = struct.Struct("<BIIIiBB")
+# Own ship: x, y, vx, vy, rotation, shot timer, dizzy timer, invincibility timer, lives, dizzy, invincible, disable_wrap
+_SHIP = struct.Struct("<8fB3?")
+
+NO_BASELINE = 0xFFFFFFFF
+
+# Snapshot flags
+BOSS_ACTIVE = 1
+BOSS_DEFEATED = 2
+LOST = 4
+WON = 8
+KNOCKED_OUT = 16  # The receiving client's ship is out of play
+
+# --- Entity Records ---
+ENTITY_DTYPE = np.dtype([
+    ("id", "<u2"),
+    ("kind", "u1"),     # snapshot.py kind codes
+    ("x", "<u2"),       # (x + POSITION_OFFSET) * POSITION_SCALE
+    ("y", "<u2"),
+    ("vx", "<i2"),      # Position units per tick
+    ("vy", "<i2"),
+    ("angle", "u1"),    # Degrees * 256 / 360
+    ("extra", "u1"),    # Per kind, see Quantizer.records()
+])
+FIELDS = ("kind", "x", "y", "vx", "vy", "angle", "extra")
+POSITION_SCALE = 8
+POSITION_OFFSET = 1024  # Sprites spawn and linger off-screen
+
+KINDS = {
+    Player: PLAYER, Asteroid: ASTEROID, Shot: SHOT, Enemy: ENEMY, FinalBoss: BOSS,
+    EnemyBullet: ENEMY_BULLET, BoneBullet: BONE, CookieBullet: COOKIE,
+}
+
+# Player extra: slot (2 bits), lives (3 bits), thrusting, dizzy, invincible
+THRUSTING = 1 << 5
+DIZZY = 1 << 6
+INVINCIBLE = 1 << 7
+
+EMPTY = np.zeros(0, ENTITY_DTYPE)
+
+
+def quantize_positions(values):
+    """Pixel coordinates -> 16-bit fixed point."""
+    return np.clip(np.rint((np.asarray(values, dtype=np.float64) + POSITION_OFFSET) * POSITION_SCALE),
+                   0, 0xFFFF).astype(np.uint16)
+
+
+def quantize_velocities(values):
+    """Pixels per second -> position units per tick."""
+    return np.clip(np.rint(np.asarray(values, dtype=np.float64) * (FIXED_DT * POSITION_SCALE)),
+                   -0x8000, 0x7FFF).astype(np.int16)
+
+
+def positions(column):
+    """Inverse of quantize_positions()."""
+    return column.astype(np.float64) / POSITION_SCALE - POSITION_OFFSET
+
+
+def _aligned(baseline, ids, ticks=0):
+    """
+    Baseline records for ids, in the same order (zeros where the baseline has
+    no such id), moved `ticks` along their velocities.
+    """
+    base = np.zeros(len(ids), ENTITY_DTYPE)
+    if len(baseline) and len(ids):
+        where = np.searchsorted(baseline["id"], ids)
+        where[where == len(baseline)] = 0
+        found = baseline["id"][where] == ids
+        base[found] = baseline[where[found]]
+        if ticks:
+            # Wrapping 16-bit arithmetic, exactly the same on both ends
+            base["x"] += (base["vx"].astype(np.int64) * ticks).astype(np.uint16)
+            base["y"] += (base["vy"].astype(np.int64) * ticks).astype(np.uint16)
+    return base
+
+
+def encode_entities(current, baseline=EMPTY, ticks=0):
+    """
+    Delta-encode entity records against a baseline.
+
+    Args:
+        current (ndarray): ENTITY_DTYPE records sorted by id.
+        baseline (ndarray): Records the receiver already has, sorted by id.
+        ticks (int): How many ticks older the baseline is.
+
+    Returns:
+        bytes: Record count, then the zlib'd id gaps and field differences.
+    """
+    ids = current["id"]
+    base = _aligned(baseline, ids, ticks)
+    columns = [np.diff(ids, prepend=np.uint16(0))]  # Wraps like the ids do
+    columns += [current[name] - base[name] for name in FIELDS]
+    # 16-bit columns as separate low / high byte planes: the high bytes are mostly 0x00 / 0xFF
+    planes = [column.view(np.uint8).reshape(-1, column.itemsize).T.tobytes() for column in columns]
+    return struct.pack("<H", len(current)) + zlib.compress(b"".join(planes), 6)
+
+
+def decode_entities(payload, baseline=EMPTY, ticks=0):
+    """
+    Inverse of encode_entities().
+
+    Returns:
+        ndarray: ENTITY_DTYPE records sorted by id.
+    """
+    (count,) = struct.unpack_from("<H", payload)
+    raw = np.frombuffer(zlib.decompress(payload[2:]), dtype=np.uint8)
+    out = np.zeros(count, ENTITY_DTYPE)
+
+    offset = 0
+    columns = []
+    for name in ("id",) + FIELDS:
+        dtype = ENTITY_DTYPE[name]
+        size = count * dtype.itemsize
+        planes = raw[offset:offset + size].reshape(dtype.itemsize, count)
+        columns.append(np.ascontiguousarray(planes.T).view(dtype).reshape(count))
+        offset += size
+    if offset != len(raw):
+        raise ValueError("entity payload has the wrong size")
+
+    out["id"] = np.cumsum(columns[0], dtype=np.uint16)
+    base = _aligned(baseline, out["id"], ticks)
+    for name, column in zip(FIELDS, columns[1:]):
+        out[name] = base[name] + column
+    return out
+
+
+class Quantizer:
+    """
+    Turns a World into entity records, giving each sprite a stable 16-bit id.
+
+    Ids wrap after 65536 sprites, so a new sprite skips any id that appeared
+    in the last HISTORY calls: a live sprite's id, or one still in a baseline
+    a client may delta against, is never handed out twice.
+    """
+
+    def __init__(self):
+        self._next_id = 0
+        self._calls = 0
+        self._last_seen = np.full(1 << 16, -HISTORY - 1, dtype=np.int64)  # Call number per id
+
+    def records(self, world, slots=None):
+        """
+        Quantize every sprite into ENTITY_DTYPE records.
+
+        extra holds: the player slot, lives and flags (PLAYER), the tier
+        (ASTEROID), health plus 128 in stage 2 (BOSS), health (COOKIE) and
+        is_dizzy (ENEMY_BULLET).
+
+        Args:
+            world (World): Session to encode.
+            slots (dict): Player -> slot number (default: order in world.players).
+
+        Returns:
+            ndarray: Records sorted by id.
+        """
+        if slots is None:
+            slots = {player: slot for slot, player in enumerate(world.players)}
+        ids, kinds, xs, ys, vxs, vys, angles, extras = [], [], [], [], [], [], [], []
+        for group in (world.drawable, world.mikito_bullets, world.boss_bullets):
+            for sprite in group:
+                kind = KINDS.get(type(sprite))
+                if kind is None:
+                    continue
+                angle = extra = 0
+                if kind == ASTEROID:
+                    angle = sprite.rotation
+                    extra = TIERS.index(sprite.base_radius)
+                elif kind == PLAYER:
+                    angle = sprite.rotation
+                    extra = (slots.get(sprite, 0) | min(sprite.lives, 7) << 2 | sprite.thrusting * THRUSTING
+                             | sprite.dizzy * DIZZY | sprite.invincible * INVINCIBLE)
+                elif kind == ENEMY:
+                    angle = sprite.rotation
+                elif kind == BONE:
+                    angle = sprite.angle
+                elif kind == BOSS:
+                    if not sprite.active:
+                        continue
+                    extra = max(sprite.health, 0) | (sprite.stage == 2) << 7
+                elif kind == COOKIE:
+                    extra = max(sprite.health, 0)
+                elif kind == ENEMY_BULLET:
+                    extra = sprite.is_dizzy
+                try:
+                    net_id = sprite.net_id
+                except AttributeError:
+                    net_id = sprite.net_id = self._allocate()
+                ids.append(net_id)
+                kinds.append(kind)
+                xs.append(sprite.position.x)
+                ys.append(sprite.position.y)
+                velocity = getattr(sprite, "velocity", None)  # The boss has none
+                vxs.append(velocity.x if velocity else 0.0)
+                vys.append(velocity.y if velocity else 0.0)
+                angles.append(angle)
+                extras.append(extra)
+
+        records = np.zeros(len(ids), ENTITY_DTYPE)
+        records["id"] = ids
+        records["kind"] = kinds
+        records["x"] = quantize_positions(xs)
+        records["y"] = quantize_positions(ys)
+        records["vx"] = quantize_velocities(vxs)
+        records["vy"] = quantize_velocities(vys)
+        records["angle"] = np.rint(np.mod(np.asarray(angles, dtype=np.float64), 360) * (256 / 360)).astype(np.int64) & 0xFF
+        records["extra"] = extras
+        self._last_seen[records["id"]] = self._calls
+        self._calls += 1
+        return records[np.argsort(records["id"], kind="stable")]
+
+    def _allocate(self):
+        last_seen = self._last_seen
+        calls = self._calls
+        while True:
+            self._next_id = (self._next_id + 1) & 0xFFFF
+            if calls - last_seen[self._next_id] > HISTORY:
+                last_seen[self._next_id] = calls  # Taken even if two sprites are new this call
+                return self._next_id
+
+
+
+# --- Simulated Network ---
+
+class Link:
+    """
+    UDP socket that can delay, jitter and drop what it sends.
+
+    With the defaults it's a plain non-blocking socket. Delayed datagrams go
+    out from send() / flush() / receive() once they're due, so the owner
+    only has to keep calling one of them.
+    """
+
+    def __init__(self, sock, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        """
+        Args:
+            sock (socket): Bound UDP socket (made non-blocking).
+            latency (float): One-way delay added to every datagram, in seconds.
+            jitter (float): Random +/- spread on that delay (reorders datagrams).
+            loss (float): Chance that a datagram is dropped (0-1).
+            seed (int): Seed for the drop / jitter decisions.
+        """
+        sock.setblocking(False)
+        self.sock = sock
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self._random = random.Random(seed)  # Never the game's random module
+        self._queue = []  # (due, sequence, data, address)
+        self._sequence = 0
+
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.dropped = 0
+
+    def send(self, data, address):
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        if self.loss and self._random.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay <= 0 and not self._queue:
+            self._sendto(data, address)
+            return
+        self._sequence += 1
+        heapq.heappush(self._queue, (time.perf_counter() + max(delay, 0.0), self._sequence, data, address))
+        self.flush()
+
+    def flush(self):
+        """Send every delayed datagram that is due."""
+        queue = self._queue
+        now = time.perf_counter()
+        while queue and queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(queue)
+            self._sendto(data, address)
+
+    def _sendto(self, data, address):
+        try:
+            self.sock.sendto(data, address)
+        except (BlockingIOError, ConnectionError):
+            pass  # Full buffer / peer gone: as good as lost on UDP
+
+    def receive(self):
+        """
+        Datagrams waiting on the socket.
+
+        Yields:
+            (bytes, address)
+        """
+        self.flush()
+        while True:
+            try:
+                data, address = self.sock.recvfrom(65536)
+            except (BlockingIOError, ConnectionError):
+                return
+            self.bytes_received += len(data)
+            self.packets_received += 1
+            yield data, address
+
+    def close(self):
+        self.sock.close()
+
+
+def fixed_ticks():
+    """
+    Generator that sleeps so successive next() calls are FIXED_DT apart.
+
+    Falls back to "now" instead of bursting when it gets more than a few ticks behind.
+    """
+    due = time.perf_counter()
+    while True:
+        due += FIXED_DT
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        elif wait < -5 * FIXED_DT:
+            due = time.perf_counter()
+        yield
+
+
+# --- Server ---
+
+class NetInput:
+    """
+    Input source fed by one client's INPUT packets.
+
+    Applies one received tick of controls per server tick. When nothing new
+    has arrived the last controls are repeated. A backlog longer than
+    MAX_INPUT_QUEUE is trimmed, so a client that bursts doesn't stay behind.
+    """
+
+    def __init__(self):
+        self.queue = deque()   # (sequence, bits)
+        self.received = 0      # Highest input sequence queued
+        self.applied = 0       # Sequence of the controls read() last returned
+        self.controls = NO_INPUT
+        self.repeated = 0      # Ticks that had to reuse old controls
+        self.dropped = 0       # Inputs trimmed from the backlog
+
+    def receive(self, last, inputs):
+        """
+        Queue the inputs of one packet that haven't been seen yet.
+
+        Args:
+            last (int): Sequence of the final byte of inputs.
+            inputs (bytes): Consecutive control bytes (controls.to_bits).
+        """
+        first = last - len(inputs) + 1
+        for sequence in range(max(first, self.received + 1), last + 1):
+            self.queue.append((sequence, inputs[sequence - first]))
+        self.received = max(self.received, last)
+        while len(self.queue) > MAX_INPUT_QUEUE:
+            self.queue.popleft()
+            self.dropped += 1
+
+    def read(self, player, dt):
+        if self.queue:
+            self.applied, bits = self.queue.popleft()
+            self.controls = from_bits(bits)
+        else:
+            self.repeated += 1
+        return self.controls
+
+
+class _Peer:
+    """Server-side state of one client."""
+
+    def __init__(self, address, slot):
+        self.address = address
+        self.slot = slot
+        self.input = NetInput()
+        self.player = None
+        self.ack = None  # Newest snapshot tick the client confirmed
+        self.bytes_sent = 0
+        self.gone = False
+
+
+class Server:
+    """
+    Authoritative host: owns the World and the only copy of the truth.
+    """
+
+    def __init__(self, players=2, port=DEFAULT_PORT, host="127.0.0.1", seed=None, link=None):
+        """
+        Args:
+            players (int): Clients to wait for (2-4).
+            port (int): UDP port to listen on.
+            host (str): Interface to bind ("0.0.0.0" for the local network).
+            seed (int): Seed for the session (None = random).
+            link (dict): Link() keyword arguments (latency, jitter, loss, seed).
+        """
+        if not 1 <= players <= MAX_PLAYERS:
+            raise ValueError(f"1-{MAX_PLAYERS} players")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+        self.link = Link(sock, **(link or {}))
+        self.players = players
+        self.seed = seed if seed is not None else random.randrange(1 << 63)
+
+        self.peers = {}  # address -> _Peer
+        self.world = None
+        self.tick = 0
+        self.quantizer = Quantizer()
+        self.history = {}  # Snapshot tick -> entity records
+
+        self.step_times = []    # Seconds per World.step()
+        self.send_times = []    # Seconds per snapshot round (build + encode + send, all clients)
+        self.entity_counts = []
+
+    # --- Lobby ---
+
+    def wait_for_players(self, timeout=None):
+        """
+        Answer HELLOs until every slot is taken.
+
+        Returns:
+            bool: False if timeout ran out first.
+        """
+        started = time.perf_counter()
+        while len(self.peers) < self.players:
+            for data, address in self.link.receive():
+                self._handle(data, address)
+            if timeout is not None and time.perf_counter() - started > timeout:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _welcome(self, peer):
+        self.link.send(_WELCOME.pack(WELCOME, peer.slot, self.players), peer.address)
+
+    def _handle(self, data, address):
+        kind = data[0] if data else None
+        peer = self.peers.get(address)
+        if kind == HELLO and len(data) >= _HELLO.size:
+            if _HELLO.unpack_from(data)[1] != PROTOCOL:
+                return
+            if peer is None:
+                if len(self.peers) >= self.players or self.world is not None:
+                    self.link.send(bytes((BYE,)), address)
+                    return
+                peer = self.peers[address] = _Peer(address, len(self.peers))
+            self._welcome(peer)
+        elif peer is None:
+            return
+        elif kind == INPUT and len(data) >= _INPUT.size:
+            _, ack, last, count = _INPUT.unpack_from(data)
+            inputs = data[_INPUT.size:_INPUT.size + count]
+            peer.input.receive(last, inputs)
+            if ack != NO_BASELINE and (peer.ack is None or ack > peer.ack):
+                peer.ack = ack
+        elif kind == BYE:
+            peer.gone = True
+
+    # --- Session ---
+
+    def start(self):
+        """Build the World with one ship per client."""
+        import headless
+
+        headless.init()
+        headless.preload()
+        peers = sorted(self.peers.values(), key=lambda peer: peer.slot)
+        self.world = world = headless.new_world(self.seed, god_mode=False)
+        world.set_input(peers[0].input)
+        peers[0].player = world.player
+        for peer in peers[1:]:
+            peer.player = world.add_player(peer.input)
+
+    def run(self, seconds=None):
+        """
+        Play until the game ends, every client leaves or seconds run out.
+
+        Returns:
+            str or None: GAME_OVER, VICTORY, or None.
+        """
+        if self.world is None:
+            self.start()
+        world = self.world
+        ticker = fixed_ticks()
+        perf_counter = time.perf_counter
+        outcome = None
+        last_report = started = perf_counter()
+
+        while outcome is None:
+            next(ticker)
+            for data, address in self.link.receive():
+                self._handle(data, address)
+            if all(peer.gone for peer in self.peers.values()):
+                break
+
+            t0 = perf_counter()
+            outcome = world.step(FIXED_DT)
+            t1 = perf_counter()
+            self.step_times.append(t1 - t0)
+            self.tick += 1
+
+            if self.tick % SNAPSHOT_INTERVAL == 0 or outcome:
+                self.send_snapshots(outcome)
+                self.send_times.append(perf_counter() - t1)
+
+            now = perf_counter()
+            if now - last_report >= 5.0:
+                print(self.status(now - started), flush=True)
+                last_report = now
+            if seconds is not None and now - started >= seconds:
+                break
+
+        if outcome:
+            # The last snapshot carries the outcome; repeat it in case it's lost
+            for _ in range(3):
+                self.send_snapshots(outcome)
+        for peer in self.peers.values():
+            self.link.send(bytes((BYE,)), peer.address)
+        self.link.flush()
+        print(self.status(perf_counter() - started), flush=True)
+        return outcome
+
+    def send_snapshots(self, outcome=None):
+        """Quantize the World once and send every client its delta."""
+        world = self.world
+        records = self.quantizer.records(world, {peer.player: peer.slot for peer in self.peers.values()})
+        self.entity_counts.append(len(records))
+        self.history[self.tick] = records
+        self.history.pop(self.tick - HISTORY * SNAPSHOT_INTERVAL, None)
+
+        flags = ((world.boss_active and BOSS_ACTIVE) | (world.boss_defeated and BOSS_DEFEATED)
+                 | (outcome == GAME_OVER and LOST) | (outcome == VICTORY and WON))
+        encoded = {}  # Clients acking the same baseline share the payload
+        for peer in self.peers.values():
+            if peer.gone:
+                continue
+            baseline_tick = peer.ack if peer.ack in self.history else NO_BASELINE
+            payload = encoded.get(baseline_tick)
+            if payload is None:
+                baseline = self.history.get(baseline_tick, EMPTY)
+                age = self.tick - baseline_tick if len(baseline) else 0
+                payload = encoded[baseline_tick] = encode_entities(records, baseline, age)
+
+            player = peer.player
+            if player in world.players:
+                ship = _SHIP.pack(player.position.x, player.position.y, player.velocity.x, player.velocity.y,
+                                  player.rotation, player.timer, player.dizzy_timer, player.invincibility_timer,
+                                  player.lives, player.dizzy, player.invincible, player.disable_wrap)
+                peer_flags = flags
+            else:
+                ship = bytes(_SHIP.size)
+                peer_flags = flags | KNOCKED_OUT
+            packet = b"".join((
+                _SNAPSHOT.pack(SNAPSHOT, self.tick, baseline_tick, peer.input.applied,
+                               world.score, world.asteroid_field.level, peer_flags),
+                ship, payload,
+            ))
+            self.link.send(packet, peer.address)
+            peer.bytes_sent += len(packet)
+
+    def status(self, elapsed):
+        """One-line summary: tick cost, snapshot cost and bandwidth per client."""
+        steps = np.array(self.step_times[-600:] or [0.0]) * 1000
+        sends = np.array(self.send_times[-300:] or [0.0]) * 1000
+        entities = self.entity_counts[-1] if self.entity_counts else 0
+        peers = ", ".join(
+            f"P{peer.slot + 1} {peer.bytes_sent * 8 / 1000 / max(elapsed, 1e-9):.1f} kbit/s "
+            f"(repeated {peer.input.repeated}, dropped {peer.input.dropped})"
+            for peer in sorted(self.peers.values(), key=lambda peer: peer.slot)
+        )
+        return (f"tick {self.tick}: step {steps.mean():.2f} ms (p99 {np.percentile(steps, 99):.2f}), "
+                f"snapshots {sends.mean():.2f} ms (p99 {np.percentile(sends, 99):.2f}), "
+                f"{entities} entities | {peers}")
+
+    def close(self):
+        self.link.close()
+
+
+# --- Client ---
+
+class NetClient:
+    """
+    One player's end: sends controls, predicts its own ship, keeps the latest snapshots.
+    """
+
+    def __init__(self, address, input_source=KEYBOARD, link=None):
+        """
+        Args:
+            address (tuple): Server (host, port).
+            input_source: Controls for this player's ship (see controls.py).
+            link (dict): Link() keyword arguments (latency, jitter, loss, seed).
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("0.0.0.0" if address[0] not in ("127.0.0.1", "localhost") else "127.0.0.1", 0))
+        self.link = Link(sock, **(link or {}))
+        self.address = address
+        self.input_source = input_source
+
+        self.slot = None
+        self.players = 0
+        self.ship = None        # Predicted own ship (in no sprite group)
+        self.predicted = {}     # Input sequence -> predicted ship position after it
+        self._held = HeldInput()
+
+        self.sequence = 0                 # Last input sequence sent
+        self.pending = deque()            # (sequence, bits, sent at) not yet applied by the server
+        self.snapshots = {}               # Tick -> entity records
+        self.tick = None                  # Newest snapshot tick
+        self.previous = EMPTY             # Records of the snapshot before it (for interpolation)
+        self.entities = EMPTY
+        self.frames_since_snapshot = 0
+        self.score = 0
+        self.level = 1
+        self.flags = 0
+        self.closed = False               # Server said BYE
+
+        self.snapshots_received = 0
+        self.undecodable = 0              # Snapshots whose baseline was already gone
+        self.errors = []                  # Predicted vs authoritative own position, per snapshot (px)
+        self.round_trips = []             # Input sent -> applied in a snapshot, seconds
+
+    @property
+    def outcome(self):
+        return GAME_OVER if self.flags & LOST else VICTORY if self.flags & WON else None
+
+    def connect(self, timeout=10.0):
+        """
+        Say HELLO until the server assigns a slot.
+
+        Returns:
+            bool: False if the server didn't answer in time (or is full).
+        """
+        started = time.perf_counter()
+        last_hello = 0.0
+        while self.slot is None:
+            now = time.perf_counter()
+            if now - started > timeout or self.closed:
+                return False
+            if now - last_hello > 0.25:
+                self.link.send(_HELLO.pack(HELLO, PROTOCOL), self.address)
+                last_hello = now
+            self.poll()
+            time.sleep(0.01)
+        return True
+
+    def poll(self):
+        """Handle every packet that has arrived."""
+        for data, address in self.link.receive():
+            if address != self.address or not data:
+                continue
+            kind = data[0]
+            if kind == WELCOME and len(data) >= _WELCOME.size and self.slot is None:
+                _, self.slot, self.players = _WELCOME.unpack_from(data)
+                dx, dy = SPAWN_OFFSETS[self.slot]
+                self.ship = Player(SCREEN_WIDTH / 2 + dx, SCREEN_HEIGHT / 2 + dy,
+                                   assets.load_sound("assets/shoot.wav", 0.4), self._held)
+                self.ship.kill()  # Never part of a World
+            elif kind == SNAPSHOT and len(data) >= _SNAPSHOT.size + _SHIP.size:
+                self._snapshot(data)
+            elif kind == BYE:
+                self.closed = True
+
+    def _snapshot(self, data):
+        _, tick, baseline_tick, applied, score, level, flags = _SNAPSHOT.unpack_from(data)
+        if self.tick is not None and tick <= self.tick:
+            return  # Late or duplicate
+        try:
+            baseline = EMPTY if baseline_tick == NO_BASELINE else self.snapshots[baseline_tick]
+            age = tick - baseline_tick if len(baseline) else 0
+            records = decode_entities(data[_SNAPSHOT.size + _SHIP.size:], baseline, age)
+        except (KeyError, ValueError, zlib.error):
+            self.undecodable += 1
+            return
+
+        self.snapshots_received += 1
+        self.snapshots[tick] = records
+        for old in [old for old in self.snapshots if old < tick - HISTORY * SNAPSHOT_INTERVAL]:
+            del self.snapshots[old]
+        self.previous, self.entities = self.entities, records
+        self.tick = tick
+        self.frames_since_snapshot = 0
+        self.score, self.level, self.flags = score, level, flags
+
+        if self.ship is not None and not flags & KNOCKED_OUT:
+            self._reconcile(data, applied)
+
+    def _reconcile(self, data, applied):
+        """Restart prediction from the server's ship and replay the inputs it hasn't applied yet."""
+        ship = self.ship
+        (x, y, vx, vy, rotation, timer, dizzy_timer, invincibility_timer,
+         lives, dizzy, invincible, disable_wrap) = _SHIP.unpack_from(data, _SNAPSHOT.size)
+
+        pending = self.pending
+        now = time.perf_counter()
+        while pending and pending[0][0] <= applied:
+            sequence, _, sent = pending.popleft()
+            if sequence == applied:
+                self.round_trips.append(now - sent)
+                predicted = self.predicted.get(applied)
+                if predicted is not None:
+                    self.errors.append(math.hypot(predicted[0] - x, predicted[1] - y))
+
+        ship.position.update(x, y)
+        ship.velocity.update(vx, vy)
+        ship.rotation = rotation
+        ship.timer = timer
+        ship.dizzy_timer = dizzy_timer
+        ship.invincibility_timer = invincibility_timer
+        ship.lives = lives
+        ship.dizzy = dizzy
+        ship.invincible = invincible
+        ship.disable_wrap = disable_wrap
+
+        # Replayed ticks already made their sounds when they were first predicted
+        with assets.muted():
+            for sequence, bits, _ in pending:
+                self._predict(sequence, bits)
+
+    def _predict(self, sequence, bits):
+        ship = self.ship
+        self._held.controls = from_bits(bits)
+        ship.update(FIXED_DT)
+        self.predicted[sequence] = (ship.position.x, ship.position.y)
+        self.predicted.pop(sequence - 4 * HISTORY, None)
+
+    def step(self):
+        """
+        One client tick: read packets, send this tick's controls and predict the own ship.
+        """
+        self.poll()
+        self.frames_since_snapshot += 1
+        if self.ship is None:
+            return
+        controls = self.input_source.read(self.ship, FIXED_DT) if not self.flags & KNOCKED_OUT else NO_INPUT
+        self.sequence += 1
+        bits = to_bits(controls)
+        self.pending.append((self.sequence, bits, time.perf_counter()))
+
+        recent = bytes(bits for _, bits, _ in list(self.pending)[-INPUT_REDUNDANCY:])
+        ack = self.tick if self.tick is not None else NO_BASELINE
+        self.link.send(_INPUT.pack(INPUT, ack, self.sequence, len(recent)) + recent, self.address)
+
+        if not self.flags & KNOCKED_OUT:
+            self._predict(self.sequence, bits)
+
+    def interpolated(self):
+        """
+        Entities to draw, moved part way from the previous snapshot to the newest.
+
+        Returns:
+            (ndarray, ndarray, ndarray): Records, x and y in pixels.
+        """
+        records = self.entities
+        xs, ys = positions(records["x"]), positions(records["y"])
+        previous = _aligned(self.previous, records["id"])
+        known = (previous["id"] == records["id"]) & (previous["kind"] == records["kind"])
+        t = min(self.frames_since_snapshot / SNAPSHOT_INTERVAL, 1.0)
+        px, py = positions(previous["x"]), positions(previous["y"])
+        known &= (np.abs(xs - px) < 200) & (np.abs(ys - py) < 200)  # Don't slide across a wrap
+        xs = np.where(known, px + (xs - px) * t, xs)
+        ys = np.where(known, py + (ys - py) * t, ys)
+        return records, xs, ys
+
+    def leave(self):
+        self.link.send(bytes((BYE,)), self.address)
+        self.link.flush()
+
+    def stats(self):
+        errors = np.array(self.errors or [0.0])
+        trips = np.array(self.round_trips or [0.0]) * 1000
+        return {
+            "slot": self.slot,
+            "snapshots": self.snapshots_received,
+            "undecodable": self.undecodable,
+            "down_bytes": self.link.bytes_received,
+            "up_bytes": self.link.bytes_sent,
+            "prediction_error_mean": float(errors.mean()),
+            "prediction_error_p99": float(np.percentile(errors, 99)),
+            "input_round_trip_ms": float(np.median(trips)),
+        }
+
+    def close(self):
+        self.link.close()
+
+
+# --- Rendering ---
+
+SLOT_COLORS = ((255, 255, 255), (120, 200, 255), (255, 200, 80), (150, 255, 130))
+
+
+class NetView:
+    """
+    Draws a NetClient's view: snapshot entities, the predicted own ship and the HUD.
+    """
+
+    def __init__(self):
+        ship = (SHIP_DIAMETER, SHIP_DIAMETER)
+        self.background = assets.load_image("assets/background.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+        self.font = assets.get_font(32)
+        self.life_icon = assets.load_image("assets/ship.png", (24, 24))
+        self.ships = [assets.tint(assets.load_image("assets/ship.png", ship), color + (255,), pygame.BLEND_RGBA_MULT)
+                      for color in SLOT_COLORS]
+        self.flames = [assets.tint(assets.load_image("assets/shipflame.png", ship), color + (255,), pygame.BLEND_RGBA_MULT)
+                       for color in SLOT_COLORS]
+        self.asteroids = [assets.load_image("assets/asteroid.png", image_size(radius)) for radius in TIERS]
+        self.mikito = assets.load_image("assets/mikito.png", (int(MIKITO_DIAMETER), int(MIKITO_DIAMETER)))
+        self.poop = assets.load_image("assets/mikitoshot.png", BULLET_SIZE)
+        self.boss = [assets.load_image(f"assets/boss_stage_{stage}.png", BOSS_IMAGE_SIZE) for stage in (1, 2)]
+        self.bone = assets.load_image("assets/bonebullet.png", BONE_SIZE)
+        self.cookie = assets.load_image("assets/cookiebullet.png", COOKIE_SIZE)
+
+    def _blit(self, screen, image, x, y, angle=0.0):
+        if angle:
+            image = assets.rotate(image, angle, quality.rotation_step)
+        screen.blit(image, image.get_rect(center=(int(x), int(y))))
+
+    def _health_bar(self, screen, health, x, y):
+        """Same bar FinalBoss.draw() puts above the boss."""
+        top = int(y) - BOSS_IMAGE_SIZE[1] // 2 - 20
+        bar = pygame.Rect(int(x) - 60, top, 120, 10)
+        if health > BOSS_STAGE2_HEALTH:
+            fill, color = (health - BOSS_STAGE2_HEALTH) / BOSS_STAGE1_HEALTH, (0, 255, 0)
+        else:
+            fill, color = health / BOSS_STAGE2_HEALTH, (255, 0, 0)
+        pygame.draw.rect(screen, (255, 255, 255), bar, 2)
+        pygame.draw.rect(screen, color, (bar.left, bar.top, fill * bar.width, bar.height))
+
+    def draw(self, screen, client):
+        """
+        Draw a frame (background, entities, HUD) without flipping.
+
+        Args:
+            screen (Surface): Target surface.
+            client: NetClient, or anything with its slot, ship, flags, score,
+                level, outcome and interpolated().
+        """
+        screen.blit(self.background, (0, 0))
+        records, xs, ys = client.interpolated()
+        blink = (pygame.time.get_ticks() // 100) % 2 == 0
+        lives = {}
+
+        for record, x, y in zip(records, xs, ys):
+            kind, extra = record["kind"], int(record["extra"])
+            angle = record["angle"] * (360 / 256)
+            if kind == ASTEROID:
+                self._blit(screen, self.asteroids[min(extra, len(TIERS) - 1)], x, y, -angle)
+            elif kind == SHOT:
+                pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), 5)
+            elif kind == PLAYER:
+                slot = extra & 3
+                lives[slot] = extra >> 2 & 7
+                if slot == client.slot and not client.flags & KNOCKED_OUT:
+                    continue  # Drawn from the prediction below
+                if extra & INVINCIBLE and blink:
+                    continue
+                self._blit(screen, (self.flames if extra & THRUSTING else self.ships)[slot], x, y, -angle)
+            elif kind == ENEMY:
+                self._blit(screen, self.mikito, x, y, -angle)
+            elif kind == ENEMY_BULLET:
+                self._blit(screen, self.poop, x, y)
+            elif kind == BOSS:
+                self._blit(screen, self.boss[1 if extra & 128 else 0], x, y)
+                self._health_bar(screen, extra & 127, x, y)
+            elif kind == BONE:
+                self._blit(screen, self.bone, x, y, angle)
+            elif kind == COOKIE:
+                self._blit(screen, self.cookie, x, y)
+
+        if client.flags & BOSS_ACTIVE and not client.flags & BOSS_DEFEATED:
+            pygame.draw.rect(screen, (255, 100, 100), screen.get_rect(), 6)  # Arena walls
+
+        ship = client.ship
+        if ship is not None and not client.flags & KNOCKED_OUT:
+            lives[client.slot] = ship.lives
+            if not (ship.invincible and blink):
+                image = (self.flames if ship.thrusting else self.ships)[client.slot]
+                self._blit(screen, image, ship.position.x, ship.position.y, -ship.rotation)
+
+        screen.blit(self.font.render(f"Level {client.level}", True, (255, 255, 0)), (10, 10))
+        screen.blit(self.font.render(f"Score: {client.score}", True, (255, 255, 255)), (SCREEN_WIDTH - 150, 10))
+        for row, slot in enumerate(sorted(lives)):
+            screen.blit(self.font.render(f"P{slot + 1}", True, SLOT_COLORS[slot]), (10, 40 + row * 29))
+            for i in range(lives[slot]):
+                screen.blit(self.life_icon, (50 + i * (24 + 5), 40 + row * 29))
+        if client.outcome:
+            text = "VICTORY" if client.outcome == VICTORY else "GAME OVER"
+            label = self.font.render(text, True, (255, 255, 255))
+            screen.blit(label, label.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
+
+# --- Local Testing ---
+
+class BotInput:
+    """
+    Random controls held for a random number of ticks (seeded, for load tests).
+    """
+
+    def __init__(self, seed=None):
+        self._random = random.Random(seed)
+        self._controls = NO_INPUT
+        self._ticks = 0
+
+    def read(self, player, dt):
+        if self._ticks <= 0:
+            r = self._random
+            turn = r.random()
+            self._controls = Controls(turn < 0.3, turn > 0.7, r.random() < 0.5, r.random() < 0.7)
+            self._ticks = r.randint(10, 40)
+        self._ticks -= 1
+        return self._controls
+
+
+def _serve(players, port, seed, link, seconds):
+    server = Server(players, port, seed=seed, link=link)
+    if server.wait_for_players(timeout=30):
+        server.run(seconds)
+    server.close()
+
+
+def local(players=2, port=DEFAULT_PORT, seconds=30.0, latency=0.0, jitter=0.0, loss=0.0, seed=1, window=False):
+    """
+    Run a server process and `players` bot clients on localhost over lossy links.
+
+    Args:
+        latency (float): Round-trip time to simulate, in seconds (half each way).
+        jitter (float): +/- spread on each one-way delay, in seconds.
+        loss (float): Chance each datagram is dropped, both ways.
+        window (bool): Show the first client's view.
+
+    Returns:
+        list: NetClient.stats() per client.
+    """
+    import headless
+
+    conditions = {"latency": latency / 2, "jitter": jitter, "loss": loss}
+    server = multiprocessing.Process(target=_serve, args=(players, port, seed, dict(conditions, seed=seed), seconds))
+    server.start()
+
+    screen = headless.init() if not window else None
+    if window:
+        pygame.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clients = [NetClient(("127.0.0.1", port), BotInput(seed + slot), dict(conditions, seed=seed + 100 + slot))
+               for slot in range(players)]
+    try:
+        for client in clients:
+            if not client.connect():
+                raise RuntimeError("server did not answer")
+        view = NetView() if window else None
+        ticker = fixed_ticks()
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds + 1:
+            next(ticker)
+            for client in clients:
+                client.step()
+            if view:
+                pygame.event.pump()
+                view.draw(screen, clients[0])
+                pygame.display.flip()
+            if all(client.closed for client in clients):
+                break
+    finally:
+        for client in clients:
+            client.leave()
+        server.join(timeout=10)
+        for client in clients:
+            client.close()
+
+    elapsed = time.perf_counter() - started
+    results = []
+    for client in clients:
+        stats = client.stats()
+        results.append(stats)
+        print(f"P{stats['slot'] + 1}: {stats['down_bytes'] * 8 / 1000 / elapsed:.1f} kbit/s down, "
+              f"{stats['up_bytes'] * 8 / 1000 / elapsed:.1f} kbit/s up, {stats['snapshots']} snapshots "
+              f"({stats['undecodable']} undecodable), input round trip {stats['input_round_trip_ms']:.0f} ms, "
+              f"prediction error {stats['prediction_error_mean']:.2f} px (p99 {stats['prediction_error_p99']:.2f})")
+    return results
+
+
+def play(host, port=DEFAULT_PORT):
+    """Join a server with the keyboard and a window."""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Asteroids - netplay")
+    client = NetClient((host, port), KEYBOARD)
+    if not client.connect():
+        print(f"No answer from {host}:{port}")
+        return 1
+    print(f"Joined as player {client.slot + 1} of {client.players}")
+    view = NetView()
+    ticker = fixed_ticks()
+    try:
+        while not client.closed:
+            next(ticker)
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            client.step()
+            view.draw(screen, client)
+            pygame.display.flip()
+    finally:
+        client.leave()
+        client.close()
+    return 0
+
+
+def bench(scenarios=("early", "level9_cap", "boss_stage2", "stress_500", "shot_spam"), players=4, ticks=240):
+    """
+    Server cost and snapshot sizes as entity counts grow (no sockets).
+
+    Each scenario is played with `players` ships; every SNAPSHOT_INTERVAL ticks the
+    World is quantized and encoded against the previous snapshot (a client
+    that acks promptly), against one 8 snapshots old (a lossy client) and
+    from scratch.
+
+    Returns:
+        list: One dict per scenario.
+    """
+    import headless
+    from benchmark import SCENARIOS
+
+    headless.init()
+    headless.preload()
+    rows = []
+    for name in scenarios:
+        setup, _ = SCENARIOS[name]
+        world = headless.new_world(1234)
+        setup(world)
+        for slot in range(1, players):
+            world.add_player(BotInput(slot))
+        world.set_input(BotInput(0))
+
+        quantizer = Quantizer()
+        history = []
+        steps, snapshots, sizes = [], [], {"delta": [], "lossy": [], "full": []}
+        for tick in range(1, ticks + 1):
+            t0 = time.perf_counter()
+            world.step(FIXED_DT)
+            t1 = time.perf_counter()
+            steps.append(t1 - t0)
+            if tick % SNAPSHOT_INTERVAL:
+                continue
+            records = quantizer.records(world)
+            delta = encode_entities(records, history[-1] if history else EMPTY, SNAPSHOT_INTERVAL)
+            snapshots.append(time.perf_counter() - t1)
+            if history:
+                sizes["delta"].append(len(delta))
+                old = max(0, len(history) - 8)
+                sizes["lossy"].append(len(encode_entities(records, history[old], (len(history) - old) * SNAPSHOT_INTERVAL)))
+            sizes["full"].append(len(encode_entities(records)))
+            history.append(records)
+
+        header = _SNAPSHOT.size + _SHIP.size + 28  # + IP/UDP headers
+        delta = np.mean(sizes["delta"]) + header
+        row = {
+            "scenario": name,
+            "entities": int(len(history[-1])),
+            "step_ms": float(np.mean(steps) * 1000),
+            "snapshot_ms": float(np.mean(snapshots) * 1000),
+            "delta_bytes": float(delta),
+            "lossy_bytes": float(np.mean(sizes["lossy"]) + header),
+            "full_bytes": float(np.mean(sizes["full"]) + header),
+            "raw_bytes": int(len(history[-1]) * ENTITY_DTYPE.itemsize + header),
+            "kbit_per_client": float(delta * 8 * (60 / SNAPSHOT_INTERVAL) / 1000),
+        }
+        rows.append(row)
+        print(f"{name:12} {row['entities']:5} entities  step {row['step_ms']:6.2f} ms  "
+              f"snapshot {row['snapshot_ms']:5.2f} ms  bytes: delta {row['delta_bytes']:7.0f}  "
+              f"lossy {row['lossy_bytes']:7.0f}  full {row['full_bytes']:7.0f}  raw {row['raw_bytes']:6}  "
+              f"-> {row['kbit_per_client']:6.1f} kbit/s per client")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local-network multiplayer.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("server", help="Host a game")
+    serve.add_argument("--players", type=int, default=2)
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    serve.add_argument("--seed", type=int, default=None)
+
+    join = commands.add_parser("client", help="Join a game with the keyboard")
+    join.add_argument("--host", default="127.0.0.1")
+    join.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    test = commands.add_parser("local", help="Server + bot clients on localhost with simulated conditions")
+    test.add_argument("--players", type=int, default=2)
+    test.add_argument("--port", type=int, default=DEFAULT_PORT)
+    test.add_argument("--seconds", type=float, default=30.0)
+    test.add_argument("--latency", type=float, default=0.0, help="Round trip to add, in ms")
+    test.add_argument("--jitter", type=float, default=0.0, help="+/- ms on each one-way delay")
+    test.add_argument("--loss", type=float, default=0.0, help="Fraction of datagrams dropped (0-1)")
+    test.add_argument("--seed", type=int, default=1)
+    test.add_argument("--window", action="store_true", help="Show the first client's view")
+
+    measure = commands.add_parser("bench", help="Snapshot size and server cost vs entity count")
+    measure.add_argument("--players", type=int, default=4)
+
+    args = parser.parse_args(argv)
+    if args.command == "server":
+        server = Server(args.players, args.port, args.host, args.seed)
+        print(f"Waiting for {args.players} players on port {args.port}...")
+        server.wait_for_players()
+        print(f"Game over: {server.run() or 'everyone left'}")
+        server.close()
+    elif args.command == "client":
+        return play(args.host, args.port)
+    elif args.command == "local":
+        local(args.players, args.port, args.seconds, args.latency / 1000, args.jitter / 1000, args.loss,
+              args.seed, args.window)
+    else:
+        bench(players=args.players)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
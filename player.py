@@ -11,10 +11,25 @@ Features:
 
 import pygame
 import math
+import assets
 from constants import *
 from circleshape import CircleShape
 from shot import Shot
+from controls import KEYBOARD, NO_INPUT
 from devtools import SHOW_HITBOXES
+from governor import quality
+from profiler import profiled
+
+SHIP_DIAMETER = PLAYER_RADIUS * 4
+HIT_TINT = (255, 80, 80, 0)  # Added to the ship while it flashes after a hit
+
+# Images and sounds this module uses (preloaded at startup)
+IMAGES = [
+    ("assets/ship.png", (SHIP_DIAMETER, SHIP_DIAMETER)),
+    ("assets/shipflame.png", (SHIP_DIAMETER, SHIP_DIAMETER)),
+    ("assets/shipflame_dizzy.png", (SHIP_DIAMETER, SHIP_DIAMETER)),
+]
+SOUNDS = [("assets/iugh.wav", None)]
 
 class Player(CircleShape):
     """
@@ -22,7 +37,7 @@ class Player(CircleShape):
     status effects, and visual state.
     """
 
-    def __init__(self, x, y, shoot_sound):
+    def __init__(self, x, y, shoot_sound, input_source=KEYBOARD):
         """
         Initialize the player with position and ship assets.
 
@@ -30,21 +45,18 @@ class Player(CircleShape):
             x (float): Initial X position.
             y (float): Initial Y position.
             shoot_sound (Sound): Sound to play when firing.
+            input_source: Object with read(player, dt) -> Controls (see controls.py).
         """
-        diameter = PLAYER_RADIUS * 4
-        self.ship_img = pygame.transform.scale(
-            pygame.image.load("assets/ship.png").convert_alpha(), (diameter, diameter)
-        )
-        self.ship_flame_img = pygame.transform.scale(
-            pygame.image.load("assets/shipflame.png").convert_alpha(), (diameter, diameter)
-        )
-        self.ship_flame_img_dizzy = pygame.transform.scale(
-            pygame.image.load("assets/shipflame_dizzy.png").convert_alpha(), (diameter, diameter)
-        )
+        diameter = SHIP_DIAMETER
+        self.ship_img = assets.load_image("assets/ship.png", (diameter, diameter))
+        self.ship_flame_img = assets.load_image("assets/shipflame.png", (diameter, diameter))
+        self.ship_flame_img_dizzy = assets.load_image("assets/shipflame_dizzy.png", (diameter, diameter))
 
         self.image = self.ship_img
-        self.ship_img_red = self._tint_image(self.ship_img, (255, 80, 80))
-        self.ship_flame_img_red = self._tint_image(self.ship_flame_img, (255, 80, 80))
+        # Flash tints are cached per base image, so restarts reuse them (and their rotations)
+        self.ship_img_red = assets.tint(self.ship_img, HIT_TINT)
+        self.ship_flame_img_red = assets.tint(self.ship_flame_img, HIT_TINT)
+        self.ship_flame_img_dizzy_red = assets.tint(self.ship_flame_img_dizzy, HIT_TINT)
 
         visual_radius = diameter // 2.1
         super().__init__(x, y, visual_radius)
@@ -64,8 +76,12 @@ class Player(CircleShape):
         self.dizzy = False
         self.dizzy_timer = 0.0
         self.disable_wrap = False
+        self.thrusting = False
+        self.shots_fired = 0
 
         self.shoot_sound = shoot_sound
+        self.input_source = input_source
+        self.controls = NO_INPUT  # Last Controls read from input_source
 
     def collide(self, other):
         """
@@ -93,23 +109,14 @@ class Player(CircleShape):
 
         return False
 
-    def _tint_image(self, image, tint_color):
-        """
-        Apply a color tint overlay to an image for flashing effects when losing lives.
-        """
-        tinted = image.copy()
-        tint_surface = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
-        tint_surface.fill(tint_color + (0,))
-        tinted.blit(tint_surface, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-        return tinted
-
+    @profiled("Player.draw")
     def draw(self, screen):
         """
         Draw the player ship with rotation, flame, dizzy effects, and optional hitbox.
         """
         if self.image in (self.ship_flame_img, self.ship_flame_img_dizzy):
             base_image = self.ship_flame_img_dizzy if self.dizzy else self.ship_flame_img
-            red_image = self._tint_image(base_image, (255, 80, 80))
+            red_image = self.ship_flame_img_dizzy_red if self.dizzy else self.ship_flame_img_red
         else:
             base_image = self.ship_img
             red_image = self.ship_img_red
@@ -117,11 +124,11 @@ class Player(CircleShape):
         image_to_draw = red_image if self.invincible and (pygame.time.get_ticks() // 100) % 2 == 0 else base_image
 
         wobble_offset = 5 * math.sin(pygame.time.get_ticks() / 100) if self.dizzy else 0
-        rotated_image = pygame.transform.rotate(image_to_draw, -self.rotation + wobble_offset)
+        rotated_image = assets.rotate(image_to_draw, -self.rotation + wobble_offset, quality.rotation_step)
         rect = rotated_image.get_rect(center=(int(self.position.x), int(self.position.y)))
         screen.blit(rotated_image, rect)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(screen, (0, 255, 255), (int(self.position.x), int(self.position.y)), int(self.radius), 1)
 
     def rotate(self, dt):
@@ -130,6 +137,7 @@ class Player(CircleShape):
         """
         self.rotation += PLAYER_TURN_SPEED * dt
 
+    @profiled("Player.update")
     def update(self, dt):
         """
         Update player position, input, status effects, and shooting.
@@ -137,7 +145,8 @@ class Player(CircleShape):
         Args:
             dt (float): Delta time in seconds.
         """
-        keys = pygame.key.get_pressed()
+        controls = self.input_source.read(self, dt)
+        self.controls = controls
 
         # --- Dizzy timer countdown ---
         if self.dizzy:
@@ -146,23 +155,24 @@ class Player(CircleShape):
                 self.dizzy = False
 
         # --- Input handling (inverted if dizzy) ---
-        left, right, up = pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP
+        left, right = controls.left, controls.right
         if self.dizzy:
             left, right = right, left
 
-        if keys[left]:
+        if left:
             self.rotate(-dt)
-        if keys[right]:
+        if right:
             self.rotate(dt)
 
-        if keys[up]:
+        self.thrusting = controls.thrust
+        if self.thrusting:
             thrust = pygame.Vector2(0, -1).rotate(self.rotation)
             self.velocity += thrust * self.acceleration * dt
 
         # --- Image selection for flame effect ---
         self.image = (
             self.ship_flame_img_dizzy if self.dizzy else
-            self.ship_flame_img if keys[up] else
+            self.ship_flame_img if self.thrusting else
             self.ship_img
         )
 
@@ -175,7 +185,7 @@ class Player(CircleShape):
 
         # --- Shooting ---
         self.timer -= dt
-        if keys[pygame.K_SPACE] and self.timer <= 0:
+        if controls.fire and self.timer <= 0:
             self.shoot()
             self.timer = PLAYER_SHOOT_COOLDOWN
 
@@ -214,12 +224,19 @@ class Player(CircleShape):
     def shoot(self):
         """
         Fire a projectile in the direction the player is facing.
+
+        Skipped when the frame governor caps concurrent shots.
         """
+        shots = Shot.containers[0] if hasattr(Shot, "containers") else ()
+        if quality.max_shots is not None and len(shots) >= quality.max_shots:
+            return
+
         forward = pygame.Vector2(0, -1).rotate(self.rotation)
         velocity = forward * PLAYER_SHOOT_SPEED
         spawn_position = self.position + forward * self.radius
         Shot(spawn_position.x, spawn_position.y, velocity)
-        self.shoot_sound.play()
+        self.shots_fired += 1
+        assets.play_sound(self.shoot_sound)
 
     def lose_life(self):
         """
@@ -248,7 +265,7 @@ class Player(CircleShape):
         """
         self.dizzy = True
         self.dizzy_timer = duration
-        pygame.mixer.Sound("assets/iugh.wav").play()
+        assets.play_sound(assets.load_sound("assets/iugh.wav"))
 
     def push_back_from(self, source_position, force=8):
         """
@@ -0,0 +1,291 @@
+"""
+Per-frame phase profiler.
+
+- profiler.phase(name) times a named span of the main loop (events, update, collisions, draw, flip...).
+- @profiled(name) times a sprite method; calls are summed per frame into one sample.
+- Samples live in a fixed-size ring buffer (NumPy arrays, no per-sample allocation).
+- draw_overlay() shows p50/p95/p99 per phase; dump_trace() writes Chrome trace-event JSON
+  (open it in chrome://tracing or https://ui.perfetto.dev).
+
+Disabled cost: phase() returns a shared no-op context manager, and @profiled returns the
+undecorated method unless devtools.PROFILE was on at import time.
+"""
+
+import json
+import threading
+import time
+import numpy as np
+from devtools import PROFILE
+
+TRACE_PID = 1
+LOOP_TID = 1     # Main-loop phases (real spans)
+METHOD_TID = 2   # Per-frame sums of sprite methods
+
+
+class _NullPhase:
+    """Context manager that does nothing (used while the profiler is disabled)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Reusable context manager timing one named main-loop phase."""
+
+    def __init__(self, profiler, phase_id):
+        self.profiler = profiler
+        self.phase_id = phase_id
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.phase_id, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    Ring buffer of timed phase samples, grouped by frame.
+    """
+
+    def __init__(self, capacity=1 << 16, enabled=False):
+        """
+        Args:
+            capacity (int): Number of samples kept before the oldest are overwritten.
+            enabled (bool): Start recording immediately.
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+
+        self.names = []
+        self._ids = {}
+        self._phases = {}
+
+        self.phase_ids = np.zeros(capacity, dtype=np.int16)
+        self.frames = np.zeros(capacity, dtype=np.int64)
+        self.starts = np.zeros(capacity, dtype=np.float64)
+        self.durations = np.zeros(capacity, dtype=np.float64)
+        self.calls = np.zeros(capacity, dtype=np.int32)  # 0 for main-loop spans
+
+        self.count = 0   # Samples written in total
+        self.frame = 0   # Current frame number
+        self._method_totals = {}  # phase id -> [first start, total seconds, calls]
+
+    def phase_id(self, name):
+        """Return the integer id for a phase name (registering it if new)."""
+        phase_id = self._ids.get(name)
+        if phase_id is None:
+            phase_id = len(self.names)
+            self.names.append(name)
+            self._ids[name] = phase_id
+        return phase_id
+
+    # --- Recording ---
+
+    def phase(self, name):
+        """
+        Time a main-loop phase: `with profiler.phase("draw"): ...`
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = _Phase(self, self.phase_id(name))
+            self._phases[name] = phase
+        return phase
+
+    def record(self, phase_id, start, duration, calls=0):
+        """Write one sample into the ring buffer."""
+        i = self.count % self.capacity
+        self.phase_ids[i] = phase_id
+        self.frames[i] = self.frame
+        self.starts[i] = start
+        self.durations[i] = duration
+        self.calls[i] = calls
+        self.count += 1
+
+    def add_call(self, phase_id, start, duration):
+        """Accumulate one sprite-method call into this frame's total."""
+        totals = self._method_totals.get(phase_id)
+        if totals is None:
+            self._method_totals[phase_id] = [start, duration, 1]
+        else:
+            totals[1] += duration
+            totals[2] += 1
+
+    def end_frame(self):
+        """Flush per-method totals and advance to the next frame."""
+        if self._method_totals:
+            for phase_id, (start, total, calls) in self._method_totals.items():
+                self.record(phase_id, start, total, calls)
+            self._method_totals.clear()
+        self.frame += 1
+
+    # --- Reading ---
+
+    def _window(self):
+        """Indices of the valid samples in the ring, oldest first."""
+        if self.count <= self.capacity:
+            return np.arange(self.count)
+        head = self.count % self.capacity
+        return np.concatenate((np.arange(head, self.capacity), np.arange(head)))
+
+    def quantiles(self, frames=300):
+        """
+        p50/p95/p99 of per-frame time for every phase over the last frames.
+
+        Returns:
+            dict: name -> (p50, p95, p99) in seconds.
+        """
+        idx = self._window()
+        first = self.frame - frames
+        idx = idx[self.frames[idx] >= first]
+        if not len(idx):
+            return {}
+
+        offsets = self.frames[idx] - first
+        result = {}
+        for phase_id in np.unique(self.phase_ids[idx]):
+            mask = self.phase_ids[idx] == phase_id
+            per_frame = np.bincount(offsets[mask], weights=self.durations[idx][mask])
+            per_frame = per_frame[np.unique(offsets[mask])]
+            result[self.names[phase_id]] = tuple(np.percentile(per_frame, (50, 95, 99)))
+        return result
+
+    def trace_events(self, seconds=10.0):
+        """
+        Samples from the last `seconds` as Chrome trace events.
+
+        Returns:
+            list: Trace-event dicts ("X" complete events, microseconds).
+        """
+        idx = self._window()
+        if not len(idx):
+            return []
+        idx = idx[self.starts[idx] >= self.starts[idx[-1]] - seconds]
+
+        events = []
+        for i in idx:
+            calls = int(self.calls[i])
+            args = {"frame": int(self.frames[i])}
+            if calls:
+                args["calls"] = calls
+            events.append({
+                "name": self.names[self.phase_ids[i]],
+                "ph": "X",
+                "ts": self.starts[i] * 1e6,
+                "dur": self.durations[i] * 1e6,
+                "pid": TRACE_PID,
+                "tid": METHOD_TID if calls else LOOP_TID,
+                "args": args,
+            })
+        return events
+
+    def dump_trace(self, path=None, seconds=10.0):
+        """
+        Write the last `seconds` of samples as Chrome trace JSON on a background thread.
+
+        Args:
+            path (str): Output file (defaults to a timestamped name).
+            seconds (float): How much history to include.
+
+        Returns:
+            str: The path being written.
+        """
+        if path is None:
+            path = time.strftime("profile_%Y%m%d_%H%M%S.json")
+        events = self.trace_events(seconds)
+        events.append({"name": "thread_name", "ph": "M", "pid": TRACE_PID, "tid": LOOP_TID, "args": {"name": "main loop"}})
+        events.append({"name": "thread_name", "ph": "M", "pid": TRACE_PID, "tid": METHOD_TID, "args": {"name": "sprite methods (per-frame sums)"}})
+
+        def write():
+            with open(path, "w") as file:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+        threading.Thread(target=write, name="trace-writer", daemon=True).start()
+        return path
+
+
+# Shared profiler used by the game loop and @profiled methods
+profiler = Profiler(enabled=PROFILE)
+
+
+def profiled(name):
+    """
+    Decorator timing a sprite method into the shared profiler.
+
+    Returns the method unchanged when devtools.PROFILE is off, so there is
+    no cost at all in normal builds.
+
+    Args:
+        name (str): Phase name, e.g. "Asteroid.update".
+    """
+    def decorate(method):
+        if not PROFILE:
+            return method
+
+        phase_id = profiler.phase_id(name)
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return method(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.add_call(phase_id, start, perf_counter() - start)
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    return decorate
+
+
+# --- On-screen Overlay ---
+
+class ProfilerOverlay:
+    """
+    Text table of p50/p95/p99 per phase, re-rendered a few times per second.
+    """
+
+    def __init__(self, font, refresh_frames=30, frames=300):
+        self.font = font
+        self.refresh_frames = refresh_frames
+        self.frames = frames
+        self.visible = False
+        self._lines = []
+        self._last_refresh = -refresh_frames
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def draw(self, screen, prof=profiler):
+        """
+        Draw the table in the top-right corner (if visible).
+        """
+        if not self.visible:
+            return
+
+        if prof.frame - self._last_refresh >= self.refresh_frames:
+            self._last_refresh = prof.frame
+            stats = sorted(prof.quantiles(self.frames).items(), key=lambda item: -item[1][2])
+            rows = [f"{'phase':<22}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            rows += [f"{name:<22}{p50 * 1000:7.2f}{p95 * 1000:7.2f}{p99 * 1000:7.2f}" for name, (p50, p95, p99) in stats]
+            self._lines = [self.font.render(row, True, (0, 255, 0), (0, 0, 0)) for row in rows]
+
+        y = 40
+        for line in self._lines:
+            screen.blit(line, (screen.get_width() - line.get_width() - 10, y))
+            y += line.get_height()
@@ -0,0 +1,429 @@
+"""
+Compact input-stream replays with seekable keyframes.
+
+A session is deterministic given its starting state, the random module's
+state and the controls read on every fixed-length tick, so that is all a
+replay stores:
+
+    header    magic, version, seed, tick length, keyframe interval, tick
+              count, final score / level / outcome, index offset
+    chunks    per keyframe interval: a zlib'd World snapshot (snapshot.py)
+              followed by the zlib'd inputs of the ticks it covers
+    index     one INDEX_DTYPE record per chunk
+
+Each tick is one byte: the 4 control bits (controls.to_bits) plus the
+governor's quality level in bits 4-5, because its shot cap changes the
+simulation. A 10-minute game is 36000 mostly repeating bytes, a few KB once
+compressed; keyframes add a few KB each.
+
+Playback memory-maps the file. seek() restores the nearest keyframe at or
+before the target tick and re-simulates forward from there.
+
+Usage:
+    python replay.py record --difficulty hard --seed 7 --out replays/test.rpl
+    python replay.py info replays/test.rpl
+    python replay.py verify replays/test.rpl
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+import numpy as np
+import snapshot
+from autopilot import Autopilot, DIFFICULTIES
+from constants import FIXED_DT
+from controls import to_bits, from_bits
+from governor import quality_index, set_quality
+from world import GAME_OVER, VICTORY
+
+MAGIC = b"ASTRPLAY"
+VERSION = 1
+
+REPLAY_DIR = "replays"
+KEYFRAME_INTERVAL = 600  # Ticks between keyframes (10 s at 60 ticks/s)
+
+# magic, version, seed, tick length, keyframe interval, ticks, chunks, index offset,
+# final score, final level, outcome, boss defeated
+HEADER = struct.Struct("<8sHQdIQIQqiBB")
+
+INDEX_DTYPE = np.dtype([
+    ("tick", "<u8"),            # First tick of the chunk (= keyframe tick)
+    ("keyframe_offset", "<u8"),
+    ("keyframe_size", "<u4"),
+    ("inputs_offset", "<u8"),
+    ("inputs_size", "<u4"),
+    ("inputs_count", "<u4"),    # Ticks in the chunk
+])
+
+# Outcome codes stored in the header
+OUTCOMES = (None, GAME_OVER, VICTORY)
+
+QUALITY_SHIFT = 4
+
+
+class ReplayError(ValueError):
+    """Raised for files that are not readable replays."""
+
+
+# --- Recording ---
+
+class RecordingInput:
+    """
+    Input source wrapper that hands every read to a ReplayRecorder.
+    """
+
+    def __init__(self, source, recorder):
+        """
+        Args:
+            source: Input source that actually drives the Player.
+            recorder (ReplayRecorder): Receives each tick's controls.
+        """
+        self.source = source
+        self.recorder = recorder
+
+    def read(self, player, dt):
+        controls = self.source.read(player, dt)
+        self.recorder.record(controls)
+        return controls
+
+
+class ReplayRecorder:
+    """
+    Streams one session to a replay file as it is played.
+
+    Call tick(world) right before every World.step(FIXED_DT) and close() when
+    the session ends.
+    """
+
+    def __init__(self, path, seed, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Args:
+            path (str): Output file (overwritten).
+            seed (int): Seed the random module got at the start of the session.
+            keyframe_interval (int): Ticks between keyframes.
+        """
+        self.path = path
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self.ticks = 0
+
+        self._index = []
+        self._inputs = bytearray()
+        self._file = open(path, "wb")
+        self._file.write(bytes(HEADER.size))  # Filled in by close()
+
+    def wrap(self, source):
+        """
+        Input source that records what `source` reads.
+
+        Returns:
+            RecordingInput: Pass to World.set_input().
+        """
+        return RecordingInput(source, self)
+
+    def tick(self, world):
+        """
+        Start the next tick, writing a keyframe first when one is due.
+
+        Args:
+            world (World): Session about to be stepped.
+        """
+        if self.ticks % self.keyframe_interval == 0:
+            self._end_chunk()
+            keyframe = zlib.compress(snapshot.capture(world))
+            self._index.append([self.ticks, self._file.tell(), len(keyframe), 0, 0, 0])
+            self._file.write(keyframe)
+        # Idle controls unless the Player reads its input this tick
+        self._inputs.append(quality_index() << QUALITY_SHIFT)
+        self.ticks += 1
+
+    def record(self, controls):
+        """Store the controls read during the current tick."""
+        self._inputs[-1] = to_bits(controls) | quality_index() << QUALITY_SHIFT
+
+    def close(self, world, outcome=None):
+        """
+        Flush the last chunk, write the index and the final header.
+
+        Args:
+            world (World): Session as it ended.
+            outcome (str): GAME_OVER, VICTORY or None (quit).
+        """
+        if self._file.closed:
+            return
+        self._end_chunk()
+        index = np.array([tuple(entry) for entry in self._index], dtype=INDEX_DTYPE)
+        index_offset = self._file.tell()
+        self._file.write(index.tobytes())
+
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, self.seed, FIXED_DT, self.keyframe_interval, self.ticks, len(index), index_offset,
+            world.score, world.asteroid_field.level, OUTCOMES.index(outcome), world.boss_defeated,
+        ))
+        self._file.close()
+
+    def _end_chunk(self):
+        if not self._index:
+            return
+        inputs = zlib.compress(bytes(self._inputs), 9)
+        entry = self._index[-1]
+        entry[3:] = [self._file.tell(), len(inputs), len(self._inputs)]
+        self._file.write(inputs)
+        self._inputs.clear()
+
+
+# --- Playback ---
+
+class ReplayInput:
+    """
+    Input source that plays back the ticks of a Replay.
+    """
+
+    def __init__(self, replay):
+        self.replay = replay
+
+    def read(self, player, dt):
+        bits = self.replay.input_at(self.replay.position)
+        level = bits >> QUALITY_SHIFT
+        if level != quality_index():
+            set_quality(level)
+        return from_bits(bits)
+
+
+class Replay:
+    """
+    Memory-mapped replay file.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): File written by ReplayRecorder.
+
+        Raises:
+            ReplayError: If the file is not a complete version 1 replay.
+        """
+        self.path = path
+        if os.path.getsize(path) < HEADER.size:
+            raise ReplayError(f"{path}: too short for a replay")
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.seed, self.dt, self.keyframe_interval, self.ticks, chunks, index_offset,
+         self.score, self.level, outcome, boss_defeated) = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError(f"{path}: not a version {VERSION} replay")
+        if index_offset == 0 or index_offset + chunks * INDEX_DTYPE.itemsize > len(self._data):
+            raise ReplayError(f"{path}: missing index (recording not closed?)")
+        self.outcome = OUTCOMES[outcome]
+        self.boss_defeated = bool(boss_defeated)
+
+        # Copied so the mmap holds no exported buffers and can be closed
+        self.index = np.frombuffer(self._data, INDEX_DTYPE, chunks, index_offset).copy()
+        self.position = 0  # Next tick step() will play
+
+        self._chunk = -1
+        self._chunk_inputs = b""
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def duration(self):
+        """Length of the recording in seconds."""
+        return self.ticks * self.dt
+
+    def chunk_at(self, tick):
+        """Index of the chunk holding tick."""
+        return max(0, int(np.searchsorted(self.index["tick"], tick, side="right")) - 1)
+
+    def keyframe(self, chunk):
+        """Decompressed snapshot that starts a chunk."""
+        entry = self.index[chunk]
+        start = int(entry["keyframe_offset"])
+        return zlib.decompress(self._data[start:start + int(entry["keyframe_size"])])
+
+    def input_at(self, tick):
+        """
+        Input byte of one tick (controls bits plus quality level).
+        """
+        chunk = self.chunk_at(tick)
+        if chunk != self._chunk:
+            entry = self.index[chunk]
+            start = int(entry["inputs_offset"])
+            self._chunk_inputs = zlib.decompress(self._data[start:start + int(entry["inputs_size"])])
+            self._chunk = chunk
+        return self._chunk_inputs[tick - int(self.index[chunk]["tick"])]
+
+    # --- Simulation ---
+
+    def seek(self, world, tick):
+        """
+        Put the World in the state it had right before `tick` was played.
+
+        Restores the closest keyframe at or before tick, then re-simulates the
+        ticks in between. The World is driven by this replay afterwards.
+
+        Args:
+            world (World): Session to overwrite.
+            tick (int): Target tick (clamped to the recording).
+        """
+        tick = min(max(tick, 0), self.ticks)
+        chunk = self.chunk_at(tick)
+        world.set_input(ReplayInput(self))
+        snapshot.restore(world, self.keyframe(chunk))
+        self.position = int(self.index[chunk]["tick"])
+        while self.position < tick:
+            self.step(world)
+
+    def step(self, world):
+        """
+        Play the next tick.
+
+        Returns:
+            str or None: World.step() outcome.
+        """
+        outcome = world.step(self.dt)
+        self.position += 1
+        return outcome
+
+    def play(self, world, start=0):
+        """
+        Seek to start and yield after each tick until the recording ends.
+
+        Yields:
+            (int, str or None): Tick just played and its World.step() outcome.
+        """
+        self.seek(world, start)
+        while self.position < self.ticks:
+            outcome = self.step(world)
+            yield self.position - 1, outcome
+
+    def matches(self, world, outcome):
+        """True if a finished playback ended like the recording did."""
+        return (outcome == self.outcome and world.score == self.score
+                and world.asteroid_field.level == self.level and world.boss_defeated == self.boss_defeated)
+
+
+def new_path():
+    """
+    Timestamped file name in REPLAY_DIR (created if needed).
+
+    The file is created empty so the name is reserved: sessions that start
+    within the same millisecond get -1, -2, ... instead of overwriting each other.
+    """
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    now = time.time()
+    stem = os.path.join(REPLAY_DIR, time.strftime("replay-%Y%m%d-%H%M%S", time.localtime(now))
+                        + f"-{int(now * 1000) % 1000:03d}")
+    suffix = 0
+    while True:
+        path = f"{stem}-{suffix}.rpl" if suffix else f"{stem}.rpl"
+        try:
+            with open(path, "xb"):
+                return path
+        except FileExistsError:
+            suffix += 1
+
+
+# --- Command Line ---
+
+def record(path, seed, difficulty, start_level, max_ticks):
+    """
+    Record one headless autopilot game.
+
+    Returns:
+        str or None: How the game ended (None = hit max_ticks).
+    """
+    import headless
+
+    headless.init()
+    headless.preload()
+    world = headless.new_world(seed, god_mode=False)
+    headless.set_level(world, start_level)
+    recorder = ReplayRecorder(path, seed)
+    world.set_input(recorder.wrap(Autopilot.preset(world, difficulty, seed)))
+
+    outcome = None
+    while outcome is None and recorder.ticks < max_ticks:
+        recorder.tick(world)
+        outcome = world.step(FIXED_DT)
+    recorder.close(world, outcome)
+    return outcome
+
+
+def verify(path):
+    """
+    Play a replay from its first keyframe and compare the result with its header.
+
+    Returns:
+        bool: True if the re-simulated game ended the same way.
+    """
+    import headless
+
+    headless.init()
+    headless.preload()
+    world = headless.new_world()
+    with Replay(path) as replay:
+        outcome = None
+        for _, outcome in replay.play(world):
+            pass
+        return replay.matches(world, outcome)
+
+
+def describe(path):
+    with Replay(path) as replay:
+        keyframes = int(replay.index["keyframe_size"].sum())
+        inputs = int(replay.index["inputs_size"].sum())
+        print(f"{path}: {os.path.getsize(path)} bytes")
+        print(f"  seed {replay.seed}, {replay.ticks} ticks ({replay.duration:.1f} s), {len(replay.index)} keyframes")
+        print(f"  inputs {inputs} bytes, keyframes {keyframes} bytes")
+        print(f"  ended: {replay.outcome or 'quit'}, score {replay.score}, level {replay.level}, "
+              f"boss defeated {replay.boss_defeated}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record, inspect and verify replays.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Record a headless autopilot game")
+    rec.add_argument("--out", default=None, help=f"Output file (default: timestamped in {REPLAY_DIR}/)")
+    rec.add_argument("--seed", type=int, default=1)
+    rec.add_argument("--difficulty", default="normal", choices=DIFFICULTIES)
+    rec.add_argument("--level", type=int, default=1, help="Starting level")
+    rec.add_argument("--max-ticks", type=int, default=60 * 60 * 10)
+
+    info = commands.add_parser("info", help="Print a replay's header and sizes")
+    info.add_argument("path")
+
+    check = commands.add_parser("verify", help="Re-simulate a replay and compare the result")
+    check.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        path = args.out or new_path()
+        outcome = record(path, args.seed, args.difficulty, args.level, args.max_ticks)
+        print(f"Recorded {path} ({outcome or 'tick limit'})")
+        describe(path)
+    elif args.command == "info":
+        describe(args.path)
+    else:
+        ok = verify(args.path)
+        print(f"{args.path}: {'OK' if ok else 'MISMATCH'}")
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
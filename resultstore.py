@@ -0,0 +1,205 @@
+"""
+Append-only columnar store for batch simulation results.
+
+Layout on disk:
+
+    results/manifest.json            tables and their columns (dtype, optional labels)
+    results/<table>/<shard>/<column>.bin   raw little-endian values, one file per column
+    results/<table>/<shard>/rows.json      rows committed to that shard
+
+Every writer owns one shard (one per worker process), so parallel writers
+never share a file and need no locks. A writer buffers rows and appends
+them to each column file in batches; only after every column is written
+does it replace rows.json, so a crash mid-batch leaves extra bytes that
+readers ignore.
+
+Readers memory-map the column files they are asked for and nothing else:
+summing one column over millions of rows touches that column's pages only.
+
+Categorical columns (difficulty, outcome) are stored as small integer codes
+with their labels in the manifest.
+"""
+
+import glob
+import json
+import os
+import numpy as np
+
+MANIFEST = "manifest.json"
+ROWS = "rows.json"
+DEFAULT_BATCH = 4096  # Rows buffered per shard before they are appended to disk
+
+
+def _write_json(path, data):
+    """Write JSON atomically (temporary file, then rename)."""
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(data, file, indent=1)
+    os.replace(temporary, path)
+
+
+class ResultStore:
+    """
+    Directory of column tables: the manifest plus per-shard column files.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Store directory (created by define() if needed).
+        """
+        self.path = path
+        manifest = os.path.join(path, MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest) as file:
+                self.tables = json.load(file)["tables"]
+        else:
+            self.tables = {}
+
+    def define(self, table, columns):
+        """
+        Declare a table (no-op if it already exists with the same columns).
+
+        Args:
+            table (str): Table name.
+            columns (dict): Column name -> dtype string, or (dtype, labels) for categorical codes.
+        """
+        spec = {}
+        for name, column in columns.items():
+            dtype, labels = column if isinstance(column, tuple) else (column, None)
+            spec[name] = {"dtype": np.dtype(dtype).str}
+            if labels is not None:
+                spec[name]["labels"] = list(labels)
+        existing = self.tables.get(table)
+        if existing is not None:
+            if existing != spec:
+                raise ValueError(f"table {table!r} already exists with different columns")
+            return
+        self.tables[table] = spec
+        os.makedirs(os.path.join(self.path, table), exist_ok=True)
+        _write_json(os.path.join(self.path, MANIFEST), {"version": 1, "tables": self.tables})
+
+    def dtype(self, table):
+        """Row dtype of a table (structured, one field per column)."""
+        return np.dtype([(name, column["dtype"]) for name, column in self.tables[table].items()])
+
+    def labels(self, table, column):
+        """Labels of a categorical column (code i means labels[i])."""
+        return self.tables[table][column]["labels"]
+
+    def writer(self, table, shard, batch=DEFAULT_BATCH):
+        """
+        Appender for one shard of a table. Use a different shard per process.
+
+        Returns:
+            ShardWriter
+        """
+        return ShardWriter(self, table, shard, batch)
+
+    # --- Reading ---
+
+    def shards(self, table):
+        """
+        Committed shards of a table.
+
+        Returns:
+            list: (shard directory, committed rows) pairs.
+        """
+        shards = []
+        for rows_path in sorted(glob.glob(os.path.join(self.path, table, "*", ROWS))):
+            with open(rows_path) as file:
+                rows = json.load(file)["rows"]
+            if rows:
+                shards.append((os.path.dirname(rows_path), rows))
+        return shards
+
+    def rows(self, table):
+        return sum(rows for _, rows in self.shards(table))
+
+    def load(self, table, columns=None):
+        """
+        Memory-map some columns of a table.
+
+        Args:
+            table (str): Table name.
+            columns (list): Column names (default: all).
+
+        Returns:
+            dict: Column name -> array of every committed row (a read-only
+            memmap when there's a single shard, a concatenated copy otherwise).
+        """
+        spec = self.tables[table]
+        columns = list(spec) if columns is None else columns
+        shards = self.shards(table)
+        result = {}
+        for name in columns:
+            dtype = np.dtype(spec[name]["dtype"])
+            parts = [np.memmap(os.path.join(folder, f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,))
+                     for folder, rows in shards]
+            if not parts:
+                result[name] = np.zeros(0, dtype)
+            elif len(parts) == 1:
+                result[name] = parts[0]
+            else:
+                result[name] = np.concatenate(parts)
+        return result
+
+
+class ShardWriter:
+    """
+    Buffered appender for one shard. Not shared between processes.
+    """
+
+    def __init__(self, store, table, shard, batch=DEFAULT_BATCH):
+        self.folder = os.path.join(store.path, table, shard)
+        os.makedirs(self.folder, exist_ok=True)
+        self.buffer = np.zeros(batch, store.dtype(table))
+        self.pending = 0
+
+        rows_path = os.path.join(self.folder, ROWS)
+        if os.path.exists(rows_path):
+            with open(rows_path) as file:
+                self.rows = json.load(file)["rows"]
+        else:
+            self.rows = 0
+        # Drop anything past the committed rows (a batch cut short by a crash)
+        for name in self.buffer.dtype.names:
+            path = os.path.join(self.folder, f"{name}.bin")
+            with open(path, "ab") as file:
+                file.truncate(self.rows * self.buffer.dtype[name].itemsize)
+
+    def append(self, row):
+        """
+        Add one row.
+
+        Args:
+            row (dict): Column name -> value (missing columns are 0).
+        """
+        record = self.buffer[self.pending]
+        for name, value in row.items():
+            record[name] = value
+        self.pending += 1
+        if self.pending == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """Append buffered rows to the column files and commit them."""
+        if not self.pending:
+            return
+        rows = self.buffer[:self.pending]
+        for name in rows.dtype.names:
+            with open(os.path.join(self.folder, f"{name}.bin"), "ab") as file:
+                file.write(np.ascontiguousarray(rows[name]).tobytes())
+        self.rows += self.pending
+        _write_json(os.path.join(self.folder, ROWS), {"rows": self.rows})
+        self.buffer[:self.pending] = 0
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
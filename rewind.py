@@ -0,0 +1,189 @@
+"""
+In-memory rewind buffer for the last few seconds of play.
+
+- record(world) is called before every simulation tick and keeps that tick's
+  World snapshot (snapshot.py).
+- Every keyframe_interval ticks a full snapshot is kept as a keyframe; the
+  ticks in between are stored as the XOR of their snapshot against the
+  keyframe, zlib-compressed. Snapshots of nearby ticks share most of their
+  bytes (layout, random state, timers that didn't move), so deltas are small.
+- Whole keyframe groups are dropped from the old end once they fall out of the
+  window or the buffer goes over its byte budget.
+- Restoring any tick in the window costs one decompress, one XOR and a
+  snapshot.restore().
+
+Used for the rewind hotkey and the kill-cam shown before the game over screen.
+"""
+
+import zlib
+from collections import deque
+import numpy as np
+import snapshot
+from constants import FIXED_DT
+
+
+def xor_bytes(a, b):
+    """
+    XOR two byte strings, zero-padding the shorter one.
+
+    Returns:
+        bytes: Result, as long as the longer input.
+    """
+    out = np.zeros(max(len(a), len(b)), dtype=np.uint8)
+    out[:len(a)] = np.frombuffer(a, dtype=np.uint8)
+    out[:len(b)] ^= np.frombuffer(b, dtype=np.uint8)
+    return out.tobytes()
+
+
+class _Group:
+    """A keyframe and the deltas of the ticks that follow it."""
+
+    __slots__ = ("start", "keyframe", "deltas", "size")
+
+    def __init__(self, start, keyframe):
+        self.start = start
+        self.keyframe = keyframe
+        self.deltas = []  # (snapshot length, compressed XOR against keyframe)
+        self.size = len(keyframe)
+
+    @property
+    def end(self):
+        """First tick after this group."""
+        return self.start + 1 + len(self.deltas)
+
+
+class RewindBuffer:
+    """
+    Ring of recent World snapshots, delta-encoded against periodic keyframes.
+    """
+
+    def __init__(self, seconds=5.0, keyframe_interval=30, budget=2 << 20):
+        """
+        Args:
+            seconds (float): How far back rewinds can go.
+            keyframe_interval (int): Ticks per keyframe group.
+            budget (int): Maximum bytes held (the newest group is always kept).
+        """
+        self.window = round(seconds / FIXED_DT)
+        self.keyframe_interval = keyframe_interval
+        self.budget = budget
+
+        self.groups = deque()
+        self.tick = 0   # Tick the next record() stores
+        self.size = 0   # Bytes held in keyframes and deltas
+
+    def clear(self):
+        """Forget everything (new session)."""
+        self.groups.clear()
+        self.tick = 0
+        self.size = 0
+
+    @property
+    def oldest(self):
+        """Oldest tick that can still be restored (== tick when empty)."""
+        return self.groups[0].start if self.groups else self.tick
+
+    @property
+    def seconds(self):
+        """Seconds of play currently held."""
+        return (self.tick - self.oldest) * FIXED_DT
+
+    # --- Recording ---
+
+    def record(self, world):
+        """
+        Store the World as it is before the current tick is simulated.
+
+        Args:
+            world (World): Session about to be stepped.
+        """
+        data = snapshot.capture(world)
+        group = self.groups[-1] if self.groups else None
+
+        if group is None or group.end - group.start >= self.keyframe_interval:
+            group = _Group(self.tick, data)
+            self.groups.append(group)
+            self.size += group.size
+        else:
+            delta = zlib.compress(xor_bytes(data, group.keyframe), 1)
+            group.deltas.append((len(data), delta))
+            group.size += len(delta)
+            self.size += len(delta)
+
+        self.tick += 1
+        self._evict()
+
+    def _evict(self):
+        groups = self.groups
+        while len(groups) > 1 and (groups[0].end <= self.tick - self.window or self.size > self.budget):
+            self.size -= groups.popleft().size
+
+    # --- Restoring ---
+
+    def snapshot_at(self, tick):
+        """
+        Decode the snapshot stored for one tick.
+
+        Args:
+            tick (int): Tick in [oldest, tick).
+
+        Returns:
+            bytes: Snapshot for snapshot.restore().
+        """
+        for group in reversed(self.groups):
+            if group.start <= tick:
+                break
+        else:
+            raise IndexError(f"tick {tick} is no longer buffered (oldest is {self.oldest})")
+        if tick >= group.end:
+            raise IndexError(f"tick {tick} has not been recorded yet")
+        if tick == group.start:
+            return group.keyframe
+        length, delta = group.deltas[tick - group.start - 1]
+        return xor_bytes(zlib.decompress(delta), group.keyframe)[:length]
+
+    def restore(self, world, tick):
+        """
+        Put the World back to how it was before `tick` and forget everything newer.
+
+        Args:
+            world (World): Session to overwrite.
+            tick (int): Tick in [oldest, tick).
+        """
+        snapshot.restore(world, self.snapshot_at(tick))
+        groups = self.groups
+        while groups and groups[-1].start >= tick:
+            self.size -= groups.pop().size
+        if groups:
+            group = groups[-1]
+            keep = tick - group.start - 1
+            for _, delta in group.deltas[keep:]:
+                group.size -= len(delta)
+                self.size -= len(delta)
+            del group.deltas[keep:]
+        self.tick = tick  # Re-recorded by the next record()
+
+    def rewind(self, world, seconds):
+        """
+        Go back up to `seconds` (less if the buffer doesn't reach that far).
+
+        Returns:
+            float: Seconds actually rewound.
+        """
+        if not self.groups:
+            return 0.0
+        target = max(self.oldest, self.tick - round(seconds / FIXED_DT))
+        rewound = (self.tick - target) * FIXED_DT
+        self.restore(world, target)
+        return rewound
+
+    def frames(self, seconds):
+        """
+        Snapshots of the last `seconds` of play, oldest first (buffer unchanged).
+
+        Yields:
+            bytes: One snapshot per tick.
+        """
+        start = max(self.oldest, self.tick - round(seconds / FIXED_DT))
+        for tick in range(start, self.tick):
+            yield self.snapshot_at(tick)
@@ -0,0 +1,73 @@
+"""
+Run-ahead: draw the World a few ticks in the future to hide input latency.
+
+Every frame, after the real simulation ticks:
+    1. advance() snapshots the World and simulates `frames` more ticks with
+       the controls the player is holding right now (sounds and telemetry
+       muted, so predicted events never reach the speakers or the logs),
+    2. the caller draws that predicted World,
+    3. restore() puts the real World back.
+
+A key press therefore shows up `frames` ticks earlier than it otherwise
+would. The prediction is wrong only when something the held controls can't
+know about happens (a new press, a collision the real ticks resolve
+differently), and the next frame predicts again from the real state.
+
+Cost per frame: one snapshot.capture(), `frames` World.step()s and one
+snapshot.restore().
+"""
+
+import time
+import assets
+import snapshot
+from constants import FIXED_DT
+from controls import HeldInput
+from telemetry import telemetry
+
+
+class RunAhead:
+    """
+    Speculative simulation for display only.
+    """
+
+    def __init__(self, frames=1):
+        """
+        Args:
+            frames (int): Ticks to simulate ahead of the real World (1-2 is typical).
+        """
+        self.frames = frames
+        self.cost = 0.0  # Seconds spent in the last advance() + restore()
+        self._held = HeldInput()
+        self._source = None
+        self._started = 0.0
+
+    def advance(self, world):
+        """
+        Save the World, then simulate ahead with the player's current controls.
+
+        Args:
+            world (World): Real session state (stepped this frame).
+
+        Returns:
+            bytes: Saved state to hand to restore() after drawing.
+        """
+        self._started = time.perf_counter()
+        state = snapshot.capture(world)
+
+        self._source = world.input_source
+        self._held.controls = world.player.controls
+        world.set_input(self._held)
+        with assets.muted(), telemetry.muted():
+            for _ in range(self.frames):
+                if world.step(FIXED_DT):
+                    break  # Predicted game over / victory: show the moment it happens
+        return state
+
+    def restore(self, world, state):
+        """
+        Return the World to the state saved by advance().
+        """
+        snapshot.restore(world, state)
+        world.set_input(self._source)
+        self._source = None
+        self.cost = time.perf_counter() - self._started
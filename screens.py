@@ -3,20 +3,47 @@ Handles static and animated screen transitions such as:
 - Game intro screen
 - Game over screen
 - Boss defeated cinematic sequence
+
+Screens are idle-efficient: scaled images and text are cached, static screens
+block on pygame.event.wait() and only redraw when the window is exposed or
+resized, and fades play back precomputed frames.
 """
 
 import pygame
 import time
+import assets
 from constants import SCREEN_WIDTH, SCREEN_HEIGHT
 
 
+# Events that mean the window contents must be redrawn
+REDRAW_EVENTS = {
+    pygame.VIDEOEXPOSE, pygame.VIDEORESIZE,
+    pygame.WINDOWEXPOSED, pygame.WINDOWRESIZED, pygame.WINDOWSIZECHANGED,
+    pygame.WINDOWRESTORED, pygame.WINDOWSHOWN,
+}
+
+# Returned when the player closes the window or presses Q (main.py's QUIT state)
+QUIT = "quit"
+
+# Scaled screen images keyed by (path, screen size)
+_screen_images = {}
+
+
 # --- STATIC SCREENS ---
 
-def show_intro(screen):
+def show_intro(screen, loader=None):
     """
     Display the intro screen and wait for the player to press Enter.
+
+    Args:
+        screen: The display surface.
+        loader (Preloader): Optional background loader. A progress bar is shown
+            while it runs, and Enter only continues once it has finished.
+
+    Returns:
+        str or None: QUIT if the window was closed.
     """
-    _show_static_screen(screen, "assets/opening.png", wait_for="enter")
+    return _show_static_screen(screen, "assets/opening.png", wait_for="enter", loader=loader)
 
 
 def show_game_over(screen, font, win=False):
@@ -29,117 +56,215 @@ def show_game_over(screen, font, win=False):
         win (bool): Whether the player won or lost.
 
     Returns:
-        str or None: Returns 'restart' if R is pressed or Q to exit.
+        str: 'restart' if R is pressed, QUIT for Q or a closed window.
     """
     return _show_static_screen(screen, "assets/gameover.png", wait_for="r_or_q")
 
 
-def _show_static_screen(screen, image_path, wait_for="enter"):
+def _fit_image(screen, image_path):
+    """
+    Load an image scaled to fit the screen, centered. Cached per screen size.
+
+    Returns:
+        tuple: (Surface, Rect) ready to blit.
+    """
+    screen_rect = screen.get_rect()
+    key = (image_path, screen_rect.size)
+    cached = _screen_images.get(key)
+    if cached is None:
+        image = pygame.image.load(image_path).convert()
+        img_rect = image.get_rect()
+
+        scale = min(screen_rect.width / img_rect.width, screen_rect.height / img_rect.height)
+        new_size = (int(img_rect.width * scale), int(img_rect.height * scale))
+        image = pygame.transform.scale(image, new_size)
+        cached = (image, image.get_rect(center=screen_rect.center))
+        _screen_images[key] = cached
+    return cached
+
+
+def _draw_progress(screen, loader):
+    """
+    Draw a thin loading bar near the bottom of the screen.
+    """
+    if loader.finished:
+        return
+    screen_rect = screen.get_rect()
+    bar_rect = pygame.Rect(0, 0, 400, 8)
+    bar_rect.midbottom = (screen_rect.centerx, screen_rect.bottom - 30)
+    pygame.draw.rect(screen, (80, 80, 80), bar_rect)
+    pygame.draw.rect(screen, (255, 255, 255), (bar_rect.left, bar_rect.top, int(bar_rect.width * loader.progress), bar_rect.height))
+
+
+def _show_static_screen(screen, image_path, wait_for="enter", loader=None):
     """
     Displays a static image screen with optional key trigger.
 
+    Blocks on pygame.event.wait() between events, so it uses no CPU while idle.
+
     Args:
         screen: The display surface.
         image_path (str): Path to the image.
         wait_for (str): Expected key trigger. Options: 'enter', 'r_or_q'
+        loader (Preloader): Optional loader to show progress for and wait on.
 
     Returns:
-        str or None: 'restart' if R pressed, otherwise None.
+        str or None: 'restart' if R pressed, QUIT for Q or a closed window, otherwise None.
     """
-    clock = pygame.time.Clock()
+    image, img_rect = _fit_image(screen, image_path)
 
-    # Load and scale the image to fit the screen
-    image = pygame.image.load(image_path).convert()
-    screen_rect = screen.get_rect()
-    img_rect = image.get_rect()
+    def redraw():
+        screen.fill((0, 0, 0))
+        screen.blit(image, img_rect)
+        if loader is not None:
+            _draw_progress(screen, loader)
+        pygame.display.flip()
 
-    scale = min(screen_rect.width / img_rect.width, screen_rect.height / img_rect.height)
-    new_size = (int(img_rect.width * scale), int(img_rect.height * scale))
-    image = pygame.transform.scale(image, new_size)
-    img_rect = image.get_rect(center=screen_rect.center)
+    redraw()
+    confirmed = False
 
     # Wait for input
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); exit()
+    while True:
+        if confirmed and loader.finished:
+            return
 
-            elif event.type == pygame.KEYDOWN:
-                if wait_for == "enter" and event.key == pygame.K_RETURN:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            return QUIT
+
+        elif event.type == pygame.KEYDOWN:
+            if wait_for == "enter" and event.key == pygame.K_RETURN:
+                if loader is None:
                     return
-                elif wait_for == "r_or_q":
-                    if event.key == pygame.K_r:
-                        return "restart"
-                    elif event.key == pygame.K_q:
-                        pygame.quit(); exit()
+                confirmed = True  # Continue as soon as loading is done
+            elif wait_for == "r_or_q":
+                if event.key == pygame.K_r:
+                    return "restart"
+                elif event.key == pygame.K_q:
+                    return QUIT
 
-        screen.fill((0, 0, 0))
-        screen.blit(image, img_rect)
-        pygame.display.flip()
-        clock.tick(60)
+        elif event.type in REDRAW_EVENTS or event.type == assets.PRELOAD_PROGRESS:
+            image, img_rect = _fit_image(screen, image_path)  # Rescales only if the size changed
+            redraw()
 
 
 # --- BOSS DEFEATED SEQUENCE ---
 
-def show_boss_defeated_sequence(screen):
+FADE_STEP = 8  # Alpha added per fade frame (32 frames at 60 FPS)
+CUTSCENE_WIDTH = 0.4  # Image width as a fraction of the screen width
+
+
+def cutscene_images(screen_width):
     """
-    Display a 2-part cinematic sequence when the player defeats the final boss.
+    Image requests used by the boss defeated sequence (for prefetching).
+
+    Args:
+        screen_width (int): Width of the display surface.
+
+    Returns:
+        list: (path, size, alpha, smooth) tuples for assets.Preloader.
     """
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 72, bold=True)
+    size = (int(screen_width * CUTSCENE_WIDTH), None)  # Keep aspect ratio
+    return [
+        ("assets/boss_defeated.png", size, True, True),
+        ("assets/boss_illback.png", size, True, True),
+    ]
 
-    screen_width, screen_height = screen.get_size()
 
-    # Load and scale images
-    boss_defeated_img = pygame.image.load("assets/boss_defeated.png").convert_alpha()
-    boss_illback_img = pygame.image.load("assets/boss_illback.png").convert_alpha()
-    scale_width = int(screen_width * 0.4)
+def _fade_frames(image):
+    """
+    Precompute the fade-in frames of an image over black.
 
-    def scale_and_center(image):
-        aspect_ratio = image.get_height() / image.get_width()
-        scaled = pygame.transform.smoothscale(image, (scale_width, int(scale_width * aspect_ratio)))
-        return scaled, scaled.get_rect(center=(screen_width // 2, screen_height // 2))
+    Each frame equals the image under a black overlay with alpha 255 - a,
+    for a = 0, FADE_STEP, ... < 255, followed by the fully visible image.
 
-    boss_defeated_img, defeated_rect = scale_and_center(boss_defeated_img)
-    boss_illback_img, illback_rect = scale_and_center(boss_illback_img)
+    Returns:
+        list: Opaque surfaces the size of the image.
+    """
+    base = pygame.Surface(image.get_size()).convert()
+    base.fill((0, 0, 0))
+    base.blit(image, (0, 0))
 
-    def fade_in(image, rect, text, color):
-        alpha = 0
-        overlay = pygame.Surface((screen_width, screen_height)).convert()
-        overlay.fill((0, 0, 0))
+    frames = []
+    for alpha in range(0, 255, FADE_STEP):
+        frame = base.copy()
+        frame.fill((alpha, alpha, alpha), special_flags=pygame.BLEND_RGB_MULT)
+        frames.append(frame)
+    frames.append(base)
+    return frames
 
-        while alpha < 255:
-            screen.fill((0, 0, 0))
-            screen.blit(image, rect)
-            overlay.set_alpha(255 - alpha)
-            screen.blit(overlay, (0, 0))
 
-            # Draw text
-            text_surf = font.render(text, True, color)
-            text_rect = text_surf.get_rect(center=(screen_width // 2, rect.top - 40))
-            screen.blit(text_surf, text_rect)
+def _pump_events():
+    """
+    Drain pending events, honoring window close during cutscenes.
 
-            pygame.display.flip()
-            clock.tick(60)
-            alpha += 8
+    Returns:
+        str or None: QUIT if the window was closed, "redraw" if it needs a
+        full redraw, otherwise None.
+    """
+    result = None
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            return QUIT
+        elif event.type in REDRAW_EVENTS:
+            result = "redraw"
+    return result
 
-    def hold(image, rect, text, color, duration):
-        start = time.time()
-        while time.time() - start < duration:
-            screen.fill((0, 0, 0))
-            screen.blit(image, rect)
 
-            text_surf = font.render(text, True, color)
-            text_rect = text_surf.get_rect(center=(screen_width // 2, rect.top - 40))
-            screen.blit(text_surf, text_rect)
+def show_boss_defeated_sequence(screen):
+    """
+    Display a 2-part cinematic sequence when the player defeats the final boss.
+
+    Returns:
+        str or None: QUIT if the window was closed during the sequence.
+    """
+    clock = pygame.time.Clock()
+    font = assets.get_font(72, bold=True)
 
+    screen_width, screen_height = screen.get_size()
+    images = {request[0]: assets.load_image(*request) for request in cutscene_images(screen_width)}
+
+    def play(image_path, text, color, duration):
+        image = images[image_path]
+        rect = image.get_rect(center=(screen_width // 2, screen_height // 2))
+        text_surf = assets.render_text(font, text, color)
+        text_rect = text_surf.get_rect(center=(screen_width // 2, rect.top - 40))
+
+        def redraw(frame):
+            screen.fill((0, 0, 0))
+            screen.blit(frame, rect)
+            screen.blit(text_surf, text_rect)
             pygame.display.flip()
+
+        # Fade in: only the image rect changes between frames
+        frames = _fade_frames(image)
+        redraw(frames[0])
+        for frame in frames[1:]:
             clock.tick(60)
+            pumped = _pump_events()
+            if pumped == QUIT:
+                return QUIT
+            if pumped:
+                redraw(frame)
+            else:
+                screen.blit(frame, rect)
+                pygame.display.update(rect)
+
+        # Hold: nothing changes, so sleep on the event queue until time is up
+        final = frames[-1]
+        del frames
+        deadline = time.time() + duration
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            event = pygame.event.wait(max(1, int(remaining * 1000)))
+            if event.type == pygame.QUIT:
+                return QUIT
+            elif event.type in REDRAW_EVENTS:
+                redraw(final)
 
     # Sequence: YOU WIN! > I WILL BE BACK!
-    fade_in(boss_defeated_img, defeated_rect, "YOU WIN!", (255, 215, 0))         # gold
-    hold(boss_defeated_img, defeated_rect, "YOU WIN!", (255, 215, 0), 3)
-
-    fade_in(boss_illback_img, illback_rect, "...but I WILL BE BACK!", (255, 50, 100))  # magenta-red
-    hold(boss_illback_img, illback_rect, "...but I WILL BE BACK!", (255, 50, 100), 3)
+    if play("assets/boss_defeated.png", "YOU WIN!", (255, 215, 0), 3) == QUIT:         # gold
+        return QUIT
+    return play("assets/boss_illback.png", "...but I WILL BE BACK!", (255, 50, 100), 3)  # magenta-red
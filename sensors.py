@@ -0,0 +1,178 @@
+"""
+Raycast sensor observations for scripted agents and training.
+
+- Casts K rays from the Player position (ray 0 points where the ship faces).
+- Each ray reports the distance and entity type of the first thing it hits.
+- All rays and all entities are solved in a single vectorized NumPy pass.
+- Toroidal wrap is handled by testing the 9 wrapped copies of every entity.
+"""
+
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from finalboss import BoneBullet, CookieBullet
+
+# --- Entity Type Codes (0 means the ray hit nothing) ---
+NOTHING = 0
+ASTEROID = 1
+MIKITO = 2
+POOP = 3
+BONE = 4
+COOKIE = 5
+BOSS = 6
+
+ENTITY_TYPES = ("nothing", "asteroid", "mikito", "poop", "bone", "cookie", "boss")
+
+# Offsets of the 9 toroidal copies (the original is the first one)
+_WRAP_OFFSETS = np.array(
+    [(dx, dy) for dx in (0, -SCREEN_WIDTH, SCREEN_WIDTH) for dy in (0, -SCREEN_HEIGHT, SCREEN_HEIGHT)],
+    dtype=np.float64,
+)
+
+
+class RaySensor:
+    """
+    Fixed fan of rays around the player.
+
+    Observations are float32 arrays of shape (num_rays, 2):
+        [:, 0] distance to the first hit, normalized to [0, 1] by max_range (1.0 = no hit).
+        [:, 1] entity type code of the first hit (see ENTITY_TYPES).
+    """
+
+    def __init__(self, num_rays=16, max_range=600.0):
+        """
+        Precompute the ray fan.
+
+        Args:
+            num_rays (int): Number of rays, evenly spread over 360 degrees.
+            max_range (float): Maximum ray length in pixels.
+        """
+        self.num_rays = num_rays
+        self.max_range = float(max_range)
+
+        # Angles relative to the ship's nose, in degrees (pygame rotation convention)
+        self.angles = np.arange(num_rays, dtype=np.float64) * (360.0 / num_rays)
+
+    def directions(self, rotation):
+        """
+        Unit ray directions for a ship rotated by `rotation` degrees.
+
+        Matches Player.shoot(): forward is Vector2(0, -1).rotate(rotation).
+
+        Returns:
+            ndarray: (num_rays, 2) float64 unit vectors.
+        """
+        theta = np.radians(self.angles + rotation)
+        return np.stack((np.sin(theta), -np.cos(theta)), axis=1)
+
+    def observe(self, player, asteroids=(), enemies=(), mikito_bullets=(), boss_bullets=(), boss=None, out=None):
+        """
+        Cast every ray against every entity and return the observation.
+
+        Args:
+            player (Player): Ray origin and heading.
+            asteroids, enemies, mikito_bullets, boss_bullets: Sprite groups (or iterables).
+            boss (FinalBoss): Optional boss; its hitbox rect is tested.
+            out (ndarray): Optional preallocated (num_rays, 2) float32 buffer.
+
+        Returns:
+            ndarray: (num_rays, 2) float32 observation.
+        """
+        if out is None:
+            out = np.empty((self.num_rays, 2), dtype=np.float32)
+
+        origin = np.array((player.position.x, player.position.y), dtype=np.float64)
+        dirs = self.directions(player.rotation)
+        wrap = not getattr(player, "disable_wrap", False)
+
+        best_t = np.full(self.num_rays, np.inf)
+        best_type = np.zeros(self.num_rays, dtype=np.float32)
+
+        # --- Circles (asteroids, Mikitos, bullets) ---
+        circles = [(s.position.x, s.position.y, s.radius, ASTEROID) for s in asteroids]
+        circles += [(s.position.x, s.position.y, s.radius, MIKITO) for s in enemies]
+        circles += [(s.position.x, s.position.y, s.radius, POOP) for s in mikito_bullets]
+        for s in boss_bullets:
+            if isinstance(s, CookieBullet):
+                circles.append((s.position.x, s.position.y, s.radius, COOKIE))
+            elif isinstance(s, BoneBullet):
+                circles.append((s.position.x, s.position.y, s.radius, BONE))
+
+        if circles:
+            data = np.array(circles, dtype=np.float64)
+            t, kind = self._cast_circles(origin, dirs, data[:, :2], data[:, 2], data[:, 3], wrap)
+            closer = t < best_t
+            best_t[closer] = t[closer]
+            best_type[closer] = kind[closer]
+
+        # --- Boss hitbox ---
+        if boss is not None and getattr(boss, "active", True):
+            rect = boss.get_rect()
+            box = np.array([[rect.left, rect.top, rect.right, rect.bottom]], dtype=np.float64)
+            t = self._cast_rects(origin, dirs, box)
+            closer = t < best_t
+            best_t[closer] = t[closer]
+            best_type[closer] = BOSS
+
+        missed = best_t > self.max_range
+        best_type[missed] = NOTHING
+
+        np.minimum(best_t / self.max_range, 1.0, out=out[:, 0], casting="unsafe")
+        out[:, 1] = best_type
+        return out
+
+    def _cast_circles(self, origin, dirs, centers, radii, kinds, wrap):
+        """
+        Ray vs circle for all (ray, circle) pairs at once.
+
+        Returns:
+            tuple: (nearest hit distance per ray, type code of that hit)
+        """
+        if wrap:
+            # (9 * N, 2) wrapped copies, with radii and kinds tiled to match
+            centers = (centers[None, :, :] + _WRAP_OFFSETS[:, None, :]).reshape(-1, 2)
+            radii = np.tile(radii, len(_WRAP_OFFSETS))
+            kinds = np.tile(kinds, len(_WRAP_OFFSETS))
+
+        rel = centers - origin                      # (M, 2)
+        proj = dirs @ rel.T                         # (K, M) distance along ray to closest approach
+        dist2 = np.einsum("ij,ij->i", rel, rel)     # (M,)
+        perp2 = dist2[None, :] - proj * proj        # squared miss distance
+        r2 = (radii * radii)[None, :]
+
+        with np.errstate(invalid="ignore"):
+            half_chord = np.sqrt(r2 - perp2)
+        t = proj - half_chord
+
+        # Origin inside the circle counts as an immediate hit
+        inside = dist2[None, :] < r2
+        t = np.where(inside, 0.0, t)
+        valid = inside | ((perp2 <= r2) & (t >= 0.0))
+        t = np.where(valid, t, np.inf)
+
+        nearest = np.argmin(t, axis=1)
+        rows = np.arange(t.shape[0])
+        return t[rows, nearest], kinds[nearest]
+
+    def _cast_rects(self, origin, dirs, boxes):
+        """
+        Ray vs axis-aligned rectangle (slab test) for all pairs at once.
+
+        Args:
+            boxes (ndarray): (M, 4) as left, top, right, bottom.
+
+        Returns:
+            ndarray: Nearest hit distance per ray (inf if none).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = 1.0 / dirs                                    # (K, 2)
+            tx1 = (boxes[None, :, 0] - origin[0]) * inv[:, 0:1]
+            tx2 = (boxes[None, :, 2] - origin[0]) * inv[:, 0:1]
+            ty1 = (boxes[None, :, 1] - origin[1]) * inv[:, 1:2]
+            ty2 = (boxes[None, :, 3] - origin[1]) * inv[:, 1:2]
+
+            t_near = np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2))
+            t_far = np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2))
+
+        hit = (t_near <= t_far) & (t_far >= 0.0)
+        t = np.where(hit, np.maximum(t_near, 0.0), np.inf)
+        return t.min(axis=1)
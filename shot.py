@@ -1,19 +1,24 @@
 """
 Defines the Shot class used for player projectiles.
-Simple circular bullets that travel in a straight line and wrap with the screen.
+Simple circular bullets that travel in a straight line and are removed once they
+leave the screen (they don't wrap).
 """
 
 import pygame
 from circleshape import CircleShape
-from constants import SHOT_RADIUS
+from constants import SHOT_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT
 from devtools import SHOW_HITBOXES
+from governor import quality
+from profiler import profiled
+
+OFFSCREEN_MARGIN = 100  # Pixels past the screen edge before a shot is removed
 
 
 class Shot(CircleShape):
     """
     Projectile fired by the player.
 
-    Inherits from CircleShape for position, radius, and basic wrapping behavior.
+    Inherits from CircleShape for position and radius.
     """
 
     def __init__(self, x, y, velocity):
@@ -28,6 +33,7 @@ class Shot(CircleShape):
         super().__init__(x, y, SHOT_RADIUS)
         self.velocity = velocity
 
+    @profiled("Shot.draw")
     def draw(self, screen):
         """
         Render the shot as a white circle. Optional hitbox overlay.
@@ -37,14 +43,22 @@ class Shot(CircleShape):
         """
         pygame.draw.circle(screen, (255, 255, 255), (int(self.position.x), int(self.position.y)), self.radius)
 
-        if SHOW_HITBOXES:
+        if SHOW_HITBOXES and quality.hitboxes:
             pygame.draw.circle(screen, (0, 255, 0), (int(self.position.x), int(self.position.y)), self.radius, 1)
 
+    @profiled("Shot.update")
     def update(self, dt):
         """
-        Update the position of the shot based on its velocity.
+        Update the position of the shot and remove it once it leaves the screen.
 
         Args:
             dt (float): Delta time in seconds.
         """
         self.position += self.velocity * dt
+
+        # Shots don't wrap, so anything well past the edge can never hit again
+        if (
+            self.position.x < -OFFSCREEN_MARGIN or self.position.x > SCREEN_WIDTH + OFFSCREEN_MARGIN or
+            self.position.y < -OFFSCREEN_MARGIN or self.position.y > SCREEN_HEIGHT + OFFSCREEN_MARGIN
+        ):
+            self.kill()
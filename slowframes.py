@@ -0,0 +1,181 @@
+"""
+Slow-frame watchdog with a sampling profiler.
+
+- StackSampler: a side thread that snapshots the main thread's Python stack every
+  few milliseconds into a ring buffer (code objects + line numbers, formatted later).
+- SlowFrameWatchdog: when a frame goes over the threshold, pairs the samples taken
+  during that frame with the entity counts at that moment and queues a JSON report.
+- Reports are written to disk by a background writer thread, never by the game loop.
+"""
+
+import collections
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+
+class StackSampler:
+    """
+    Periodically samples the stack of one thread (the main thread by default).
+    """
+
+    def __init__(self, interval=0.002, capacity=4096, max_depth=48, thread_id=None):
+        """
+        Args:
+            interval (float): Seconds between samples.
+            capacity (int): Samples kept in the ring buffer.
+            max_depth (int): Deepest stack frames recorded per sample.
+            thread_id (int): Thread to sample (defaults to the calling thread).
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples = collections.deque(maxlen=capacity)  # (timestamp, ((code, lineno), ...) leaf first)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        current_frames = sys._current_frames
+        perf_counter = time.perf_counter
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append((frame.f_code, frame.f_lineno))
+                frame = frame.f_back
+            self.samples.append((perf_counter(), tuple(stack)))
+
+    def between(self, start, end):
+        """
+        Samples taken within [start, end] (perf_counter seconds).
+        """
+        return [stack for timestamp, stack in list(self.samples) if start <= timestamp <= end]
+
+
+def _describe(entry):
+    code, lineno = entry
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{lineno})"
+
+
+def summarize(stacks, top=15):
+    """
+    Aggregate sampled stacks into self/inclusive function counts and folded stacks.
+
+    Args:
+        stacks (list): Stacks from StackSampler (leaf first).
+        top (int): Number of functions to keep per table.
+
+    Returns:
+        dict: JSON-ready summary.
+    """
+    leaf = collections.Counter()
+    inclusive = collections.Counter()
+    folded = collections.Counter()
+
+    for stack in stacks:
+        if not stack:
+            continue
+        names = [_describe(entry) for entry in stack]
+        leaf[names[0]] += 1
+        for name in set(f"{code.co_name} ({os.path.basename(code.co_filename)})" for code, _ in stack):
+            inclusive[name] += 1
+        folded[";".join(reversed(names))] += 1
+
+    return {
+        "samples": len(stacks),
+        "self": leaf.most_common(top),
+        "inclusive": inclusive.most_common(top),
+        "folded": dict(folded.most_common(top * 4)),
+    }
+
+
+class SlowFrameWatchdog:
+    """
+    Detects frames over a threshold and writes spike reports asynchronously.
+
+    Usage per frame:
+        watchdog.begin_frame()
+        ... update / draw / flip ...
+        watchdog.end_frame(world.entity_counts)
+    """
+
+    def __init__(self, threshold=0.05, directory="spikes", sampler=None, max_reports=200):
+        """
+        Args:
+            threshold (float): Frame time in seconds that counts as a spike.
+            directory (str): Where reports are written.
+            sampler (StackSampler): Sampler to use (one is started if omitted).
+            max_reports (int): Stop writing after this many reports per run.
+        """
+        self.threshold = threshold
+        self.directory = directory
+        self.sampler = sampler or StackSampler().start()
+        self.max_reports = max_reports
+
+        self.frame = 0
+        self.spikes = 0
+        self._frame_start = 0.0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_reports, name="spike-writer", daemon=True)
+        self._writer.start()
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self, counts=None):
+        """
+        Finish the frame; queue a report if it was too slow.
+
+        Args:
+            counts (dict or callable): Entity counts / world facts at the end of
+                the frame. A callable is only called when the frame was slow.
+
+        Returns:
+            float: Frame duration in seconds.
+        """
+        end = time.perf_counter()
+        duration = end - self._frame_start
+        self.frame += 1
+
+        if duration > self.threshold and self.spikes < self.max_reports:
+            self.spikes += 1
+            # Only grab references here; formatting happens on the writer thread
+            stacks = self.sampler.between(self._frame_start, end)
+            if callable(counts):
+                counts = counts()
+            self._queue.put({
+                "frame": self.frame,
+                "time": time.time(),
+                "duration_ms": duration * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "counts": dict(counts or {}),
+                "stacks": stacks,
+            })
+        return duration
+
+    def _write_reports(self):
+        while True:
+            report = self._queue.get()
+            if report is None:
+                break
+            report["profile"] = summarize(report.pop("stacks"))
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"spike_{int(report['time'])}_{report['frame']:06d}.json")
+            with open(path, "w") as file:
+                json.dump(report, file, indent=2)
+
+    def close(self):
+        """Stop sampling and flush pending reports."""
+        self.sampler.stop()
+        self._queue.put(None)
+        self._writer.join()
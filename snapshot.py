@@ -0,0 +1,451 @@
+"""
+World snapshots: capture() the full simulation state to bytes, restore() it back.
+
+Covers the Player, AsteroidField, FinalBoss, asteroids, shots, Mikitos and all
+bullet types, plus score/progress flags and the random module's state, which is
+everything World.step() reads, and the lives-lost statistics, so a rewind or a
+run-ahead prediction can't count a death twice.
+
+- The buffer is flat little-endian struct records, one precompiled Struct per
+  entity kind; no pygame object is ever pickled.
+- upgrade() turns version 2 snapshots (before lives-lost counters; found in
+  older replays) into the current layout, and restore() accepts them too.
+- Entities are written in sprite-group order and restored in that order, so a
+  restored World iterates (and consumes random numbers) exactly like the original.
+- restore() reuses the sprites already in the World, matched by kind, and only
+  creates or kills the difference. Restoring a recent snapshot touches no
+  sprite groups at all, which keeps it cheap enough to run every frame.
+
+Floats are stored as float64, so positions and timers round-trip bit for bit.
+"""
+
+import random
+import struct
+import pygame
+import assets
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from enemy import Enemy, EnemyBullet
+from finalboss import FinalBoss, BoneBullet, CookieBullet, BONE_SIZE, COOKIE_SIZE
+from player import Player
+from shot import Shot
+from telemetry import SOURCES
+
+MAGIC = b"SNAP"
+VERSION = 3
+
+# --- Entity Kinds ---
+PLAYER = 0
+FIELD = 1
+ASTEROID = 2
+SHOT = 3
+ENEMY = 4
+BOSS = 5
+ENEMY_BULLET = 6
+BONE = 7
+COOKIE = 8
+
+# One record per entity: kind byte followed by the fields listed above it
+RECORDS = {
+    # x, y, vx, vy, rotation, timer, lives, invincible, invincibility_timer,
+    # dizzy, dizzy_timer, disable_wrap, thrusting, shots_fired
+    PLAYER: struct.Struct("<B6di?d?d??I"),
+    # in_updatable, spawn_timer, enemy_spawn_timer, elapsed_time, level, max_enemies
+    FIELD: struct.Struct("<B?3d2i"),
+    # x, y, vx, vy, base_radius, wrap_count, rotation, rotation_speed
+    ASTEROID: struct.Struct("<B4d2i2d"),
+    # x, y, vx, vy
+    SHOT: struct.Struct("<B4d"),
+    # x, y, vx, vy, speed, rotation, shoot_timer, wobble_time, dizzy_only
+    ENEMY: struct.Struct("<B8d?"),
+    # x, y, stage, timer, spawn_timer, health, transitioning, transition_timer,
+    # stage2_triggered, direction, speed_y, active
+    BOSS: struct.Struct("<B2di2di?d?id?"),
+    # x, y, vx, vy, is_dizzy
+    ENEMY_BULLET: struct.Struct("<B4d?"),
+    # x, y, vx, vy, damage, angle, rotation_speed
+    BONE: struct.Struct("<B4di2d"),
+    # x, y, vx, vy, damage, health
+    COOKIE: struct.Struct("<B4d2i"),
+}
+
+_HEADER = struct.Struct("<4sHI")      # magic, version, record count
+_WORLD = struct.Struct("<qi3?")       # score, previous_level, boss_active, boss_defeated, god_mode
+_LIVES_LOST = struct.Struct(f"<{len(SOURCES)}I")  # world.lives_lost (added in version 3)
+_RANDOM = struct.Struct("<625I?d")    # Mersenne Twister state, has gauss_next, gauss_next
+
+
+class SnapshotError(ValueError):
+    """Raised when snapshot bytes are not something restore() can read."""
+
+
+# --- Capture ---
+
+def _pack_player(p, pack=RECORDS[PLAYER].pack):
+    return pack(PLAYER, p.position.x, p.position.y, p.velocity.x, p.velocity.y, p.rotation, p.timer, p.lives,
+                p.invincible, p.invincibility_timer, p.dizzy, p.dizzy_timer, p.disable_wrap, p.thrusting,
+                p.shots_fired)
+
+
+def _pack_field(f, in_updatable=True, pack=RECORDS[FIELD].pack):
+    return pack(FIELD, in_updatable, f.spawn_timer, f.enemy_spawn_timer, f.elapsed_time, f.level, f.max_enemies)
+
+
+def _pack_asteroid(a, pack=RECORDS[ASTEROID].pack):
+    return pack(ASTEROID, a.position.x, a.position.y, a.velocity.x, a.velocity.y, a.base_radius, a.wrap_count,
+                a.rotation, a.rotation_speed)
+
+
+def _pack_shot(s, pack=RECORDS[SHOT].pack):
+    return pack(SHOT, s.position.x, s.position.y, s.velocity.x, s.velocity.y)
+
+
+def _pack_enemy(e, pack=RECORDS[ENEMY].pack):
+    return pack(ENEMY, e.position.x, e.position.y, e.velocity.x, e.velocity.y, e.speed, e.rotation, e.shoot_timer,
+                e.wobble_time, e.dizzy_only)
+
+
+def _pack_boss(b, pack=RECORDS[BOSS].pack):
+    return pack(BOSS, b.position.x, b.position.y, b.stage, b.timer, b.spawn_timer, b.health, b.transitioning,
+                b.transition_timer, b.stage2_triggered, b.direction, b.speed_y, b.active)
+
+
+def _pack_enemy_bullet(b, pack=RECORDS[ENEMY_BULLET].pack):
+    return pack(ENEMY_BULLET, b.position.x, b.position.y, b.velocity.x, b.velocity.y, b.is_dizzy)
+
+
+def _pack_bone(b, pack=RECORDS[BONE].pack):
+    return pack(BONE, b.position.x, b.position.y, b.velocity.x, b.velocity.y, b.damage, b.angle, b.rotation_speed)
+
+
+def _pack_cookie(c, pack=RECORDS[COOKIE].pack):
+    return pack(COOKIE, c.position.x, c.position.y, c.velocity.x, c.velocity.y, c.damage, c.health)
+
+
+_PACKERS = {
+    Player: _pack_player,
+    AsteroidField: _pack_field,
+    Asteroid: _pack_asteroid,
+    Shot: _pack_shot,
+    Enemy: _pack_enemy,
+    FinalBoss: _pack_boss,
+    EnemyBullet: _pack_enemy_bullet,
+    BoneBullet: _pack_bone,
+    CookieBullet: _pack_cookie,
+}
+
+
+def capture(world):
+    """
+    Serialize everything World.step() depends on.
+
+    Args:
+        world (World): Session to capture.
+
+    Returns:
+        bytes: Snapshot for restore().
+    """
+    packers = _PACKERS
+    records = [packers[type(sprite)](sprite) for sprite in world.updatable]
+    # The field leaves updatable when the boss arrives but still holds the level
+    if world.asteroid_field not in world.updatable:
+        records.append(_pack_field(world.asteroid_field, False))
+    records += [packers[type(sprite)](sprite) for sprite in world.mikito_bullets]
+    records += [packers[type(sprite)](sprite) for sprite in world.boss_bullets]
+
+    _, state, gauss_next = random.getstate()
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, len(records)),
+        _WORLD.pack(world.score, world.previous_level, world.boss_active, world.boss_defeated, world.god_mode),
+        _LIVES_LOST.pack(*world.lives_lost),
+        _RANDOM.pack(*state, gauss_next is not None, gauss_next or 0.0),
+        *records,
+    ))
+
+
+# --- Restore ---
+
+def upgrade(data):
+    """
+    Convert a snapshot to the current VERSION (a no-op for current ones).
+
+    Args:
+        data (bytes): Snapshot bytes (version 2 or VERSION).
+
+    Returns:
+        bytes: Equivalent snapshot in the current layout (version 2 gets zero lives lost).
+    """
+    if len(data) < _HEADER.size or data[:4] != MAGIC:
+        raise SnapshotError("not a snapshot")
+    _, version, count = _HEADER.unpack_from(data)
+    if version == VERSION:
+        return data
+    if version != 2:
+        raise SnapshotError(f"snapshot version {version}, expected {VERSION}")
+    offset = _HEADER.size + _WORLD.size
+    return b"".join((_HEADER.pack(MAGIC, VERSION, count), data[_HEADER.size:offset],
+                     _LIVES_LOST.pack(*[0] * len(SOURCES)), data[offset:]))
+
+# Each takes the sprite to reuse (None = create one) and its unpacked record
+
+def _apply_player(world, player, values):
+    (_, x, y, vx, vy, rotation, timer, lives, invincible, invincibility_timer, dizzy, dizzy_timer,
+     disable_wrap, thrusting, shots_fired) = values
+    if player is None:
+        player = Player(x, y, world.shoot_sound, world.input_source)
+    player.position.update(x, y)
+    player.velocity.update(vx, vy)
+    player.rotation = rotation
+    player.timer = timer
+    player.lives = lives
+    player.invincible = invincible
+    player.invincibility_timer = invincibility_timer
+    player.dizzy = dizzy
+    player.dizzy_timer = dizzy_timer
+    player.disable_wrap = disable_wrap
+    player.thrusting = thrusting
+    player.shots_fired = shots_fired
+    player.image = (
+        player.ship_flame_img_dizzy if dizzy else
+        player.ship_flame_img if thrusting else
+        player.ship_img
+    )
+    world.players.append(player)
+    world.player = world.players[0]
+    return player
+
+
+def _apply_field(world, field, values):
+    _, _, spawn_timer, enemy_spawn_timer, elapsed_time, level, max_enemies = values
+    if field is None:
+        field = AsteroidField(world.asteroids, world.enemies, world.player, world.mikito_bullets)
+    field.player = world.player
+    field.spawn_timer = spawn_timer
+    field.enemy_spawn_timer = enemy_spawn_timer
+    field.elapsed_time = elapsed_time
+    field.level = level
+    field.max_enemies = max_enemies
+    world.asteroid_field = field
+    return field
+
+
+def _apply_asteroid(world, asteroid, values):
+    _, x, y, vx, vy, base_radius, wrap_count, rotation, rotation_speed = values
+    if asteroid is None:
+        asteroid = Asteroid(x, y, base_radius)
+    asteroid.position.update(x, y)
+    asteroid.velocity.update(vx, vy)
+    asteroid.wrap_count = wrap_count
+    asteroid.rotation = rotation
+    asteroid.rotation_speed = rotation_speed
+    return asteroid
+
+
+def _apply_shot(world, shot, values):
+    _, x, y, vx, vy = values
+    if shot is None:
+        return Shot(x, y, pygame.Vector2(vx, vy))
+    shot.position.update(x, y)
+    shot.velocity.update(vx, vy)
+    return shot
+
+
+def _apply_enemy(world, enemy, values):
+    _, x, y, vx, vy, speed, rotation, shoot_timer, wobble_time, dizzy_only = values
+    if enemy is None:
+        enemy = Enemy(x, y, world.player, world.mikito_bullets, dizzy_only)
+    enemy.player = world.player
+    enemy.position.update(x, y)
+    enemy.velocity.update(vx, vy)
+    enemy.speed = speed
+    enemy.rotation = rotation
+    enemy.shoot_timer = shoot_timer
+    enemy.wobble_time = wobble_time
+    enemy.dizzy_only = dizzy_only
+    return enemy
+
+
+def _apply_boss(world, boss, values):
+    (_, x, y, stage, timer, spawn_timer, health, transitioning, transition_timer, stage2_triggered, direction,
+     speed_y, active) = values
+    if boss is None:
+        boss = FinalBoss(world.player, world.enemies, world.boss_bullets, world.mikito_bullets)
+    boss.player = world.player
+    boss.position.update(x, y)
+    boss.stage = stage
+    boss.timer = timer
+    boss.spawn_timer = spawn_timer
+    boss.health = health
+    boss.transitioning = transitioning
+    boss.transition_timer = transition_timer
+    boss.stage2_triggered = stage2_triggered
+    boss.direction = direction
+    boss.speed_y = speed_y
+    boss.active = active
+    boss.image = boss.image_stage2 if stage == 2 else boss.image_stage1
+    world.boss = boss
+    return boss
+
+
+def _apply_enemy_bullet(world, bullet, values):
+    _, x, y, vx, vy, is_dizzy = values
+    if bullet is None:
+        return EnemyBullet(x, y, pygame.Vector2(vx, vy), is_dizzy)
+    bullet.position.update(x, y)
+    bullet.velocity.update(vx, vy)
+    bullet.is_dizzy = is_dizzy
+    return bullet
+
+
+def _apply_bone(world, bone, values):
+    _, x, y, vx, vy, damage, angle, rotation_speed = values
+    if bone is None:
+        bone = BoneBullet(x, y, pygame.Vector2(vx, vy), assets.load_image("assets/bonebullet.png", BONE_SIZE), damage)
+    bone.position.update(x, y)
+    bone.velocity.update(vx, vy)
+    bone.damage = damage
+    bone.angle = angle
+    bone.rotation_speed = rotation_speed
+    return bone
+
+
+def _apply_cookie(world, cookie, values):
+    _, x, y, vx, vy, damage, health = values
+    if cookie is None:
+        image = assets.load_image("assets/cookiebullet.png", COOKIE_SIZE)
+        return CookieBullet(x, y, pygame.Vector2(vx, vy), image, damage, health)
+    cookie.position.update(x, y)
+    cookie.velocity.update(vx, vy)
+    cookie.damage = damage
+    cookie.health = health
+    return cookie
+
+
+_APPLY = {
+    PLAYER: _apply_player,
+    FIELD: _apply_field,
+    ASTEROID: _apply_asteroid,
+    SHOT: _apply_shot,
+    ENEMY: _apply_enemy,
+    BOSS: _apply_boss,
+    ENEMY_BULLET: _apply_enemy_bullet,
+    BONE: _apply_bone,
+    COOKIE: _apply_cookie,
+}
+
+# Per kind: unpack, record size, apply function, group it is ordered in (see restore)
+_TABLE = {
+    kind: (record.unpack_from, record.size, _APPLY[kind],
+           1 if kind == ENEMY_BULLET else 2 if kind in (BONE, COOKIE) else 0)
+    for kind, record in RECORDS.items()
+}
+
+_KINDS = {
+    Player: PLAYER, AsteroidField: FIELD, Asteroid: ASTEROID, Shot: SHOT, Enemy: ENEMY,
+    FinalBoss: BOSS, EnemyBullet: ENEMY_BULLET, BoneBullet: BONE, CookieBullet: COOKIE,
+}
+
+
+def _pools(world):
+    """
+    The World's live sprites by pool key, in group order, reversed so pop() hands them out in order.
+
+    Sprites are only reused for the same kind, and asteroids for the same tier
+    (which fixes their image and radius), so asteroid keys are (ASTEROID, base_radius).
+    """
+    kinds = _KINDS
+    pools = {}
+    for group in (world.updatable, world.mikito_bullets, world.boss_bullets):
+        for sprite in group:
+            cls = type(sprite)
+            key = (ASTEROID, sprite.base_radius) if cls is Asteroid else kinds[cls]
+            pool = pools.get(key)
+            if pool is None:
+                pools[key] = pool = []
+            pool.append(sprite)
+    pools[FIELD] = [world.asteroid_field]  # Even while it's out of updatable
+    for pool in pools.values():
+        pool.reverse()
+    return pools
+
+
+def _sequence(group, sprites):
+    """
+    Make group hold exactly `sprites`, in that order.
+    """
+    members = group.spritedict
+    if len(members) == len(sprites) and list(members) == sprites:
+        return
+    wanted = set(sprites)
+    for sprite in [sprite for sprite in members if sprite not in wanted]:
+        group.remove(sprite)
+    for sprite in sprites:
+        if sprite not in members:
+            group.add(sprite)
+    # Groups iterate in the insertion order of their spritedict
+    members.clear()
+    members.update(dict.fromkeys(sprites))
+
+
+def restore(world, data):
+    """
+    Replace the World's state with a snapshot made by capture().
+
+    Sounds, images and the input source stay as they are.
+
+    Args:
+        world (World): Session to overwrite.
+        data (bytes): Snapshot bytes.
+    """
+    data = upgrade(data)
+    _, _, count = _HEADER.unpack_from(data)
+
+    offset = _HEADER.size
+    world_values = _WORLD.unpack_from(data, offset)
+    offset += _WORLD.size
+    lives_lost = _LIVES_LOST.unpack_from(data, offset)
+    offset += _LIVES_LOST.size
+    random_values = _RANDOM.unpack_from(data, offset)
+    offset += _RANDOM.size
+
+    world.bind_containers()
+    world.boss = None
+    world.players = []
+    pools = _pools(world)
+    by_kind = {kind: [] for kind in RECORDS}
+    order = ([], [], [])  # updatable, mikito_bullets, boss_bullets
+
+    table = _TABLE
+    for _ in range(count):
+        kind = data[offset]
+        unpack, size, apply, destination = table[kind]
+        values = unpack(data, offset)
+        offset += size
+
+        pool = pools.get((ASTEROID, values[5]) if kind == ASTEROID else kind)
+        sprite = apply(world, pool.pop() if pool else None, values)
+        by_kind[kind].append(sprite)
+        if kind != FIELD or values[1]:
+            order[destination].append(sprite)
+
+    # Sprites the snapshot doesn't have
+    for pool in pools.values():
+        for sprite in pool:
+            sprite.kill()
+
+    updatable, mikito_bullets, boss_bullets = order
+    field = world.asteroid_field
+    _sequence(world.updatable, updatable)
+    _sequence(world.drawable, [sprite for sprite in updatable if sprite is not field])
+    _sequence(world.asteroids, by_kind[ASTEROID])
+    _sequence(world.shots, by_kind[SHOT])
+    _sequence(world.enemies, by_kind[ENEMY])
+    _sequence(world.mikito_bullets, mikito_bullets)
+    _sequence(world.boss_bullets, boss_bullets)
+
+    world.score, world.previous_level, world.boss_active, world.boss_defeated, world.god_mode = world_values
+    world.lives_lost = list(lives_lost)
+
+    # Last: creating sprites above consumed random numbers
+    *state, has_gauss, gauss_next = random_values
+    random.setstate((3, tuple(state), gauss_next if has_gauss else None))
@@ -0,0 +1,226 @@
+"""
+Long-session soak test for leak detection.
+
+Plays autopilot games headless, back to back, restarting the World after every
+death or boss kill. At a fixed interval it samples:
+    - sprite group sizes
+    - tracemalloc total and top allocating lines
+    - process RSS
+    - live pygame Surfaces reachable from Python objects
+and fails if any series keeps trending upward.
+
+Usage:
+    python soak.py --minutes 120 --interval 30
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pygame
+import assets
+import headless
+from autopilot import Autopilot, DIFFICULTIES
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from world import GAME_OVER, VICTORY
+
+DT = 1 / 60
+GROUPS = ("updatable", "drawable", "asteroids", "shots", "enemies", "mikito_bullets", "boss_bullets")
+
+# Each game starts at one of these levels, in rotation (1 = full run, 10 = straight to the boss)
+START_LEVELS = (1, 6, 9, 10)
+
+# The harness's own bookkeeping (kept samples, tracemalloc, linecache) isn't game memory
+_HARNESS_FILTERS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "*linecache.py"),
+]
+
+
+# --- Measurements ---
+
+def rss_bytes():
+    """Current resident set size (falls back to peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def live_surfaces():
+    """
+    Count distinct Surfaces referenced by GC-tracked containers and objects.
+
+    Surfaces themselves aren't GC-tracked, so this walks every tracked
+    dict/list/tuple/set and object __dict__ looking for them.
+    """
+    seen = set()
+    surface = pygame.Surface
+    for obj in gc.get_objects():
+        if isinstance(obj, dict):
+            values = obj.values()
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            values = obj
+        else:
+            continue
+        for value in values:
+            if isinstance(value, surface):
+                seen.add(id(value))
+    return len(seen)
+
+
+def sample(world, games, top=10):
+    """
+    Take one measurement of everything that could leak.
+
+    Returns:
+        dict: Metric name -> value, plus the top allocators.
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces(_HARNESS_FILTERS)
+    stats = snapshot.statistics("lineno")
+    metrics = {f"group.{name}": len(getattr(world, name)) for name in GROUPS}
+    metrics.update({
+        "tracemalloc.bytes": sum(stat.size for stat in stats),
+        "rss.bytes": rss_bytes(),
+        "surfaces": live_surfaces(),
+        "cache.images": len(assets._images),
+        "cache.rotations": len(assets._rotations),
+        "cache.tints": len(assets._tints),
+        "cache.texts": len(assets._texts),
+    })
+    return {
+        "time": time.time(),
+        "games": games,
+        "metrics": metrics,
+        "top_allocators": [(str(stat.traceback), stat.size, stat.count) for stat in stats[:top]],
+    }
+
+
+def detect_trends(samples, tolerance=0.10, warmup=0.2):
+    """
+    Flag metrics that keep growing after warm-up.
+
+    A metric is flagged when a linear fit over the post-warm-up samples has a
+    positive slope that explains most of the variance (r^2 > 0.5) and the fit
+    grows by more than `tolerance` of its starting value over the run.
+
+    Returns:
+        dict: metric -> description, for every flagged metric.
+    """
+    start = int(len(samples) * warmup)
+    samples = samples[start:]
+    if len(samples) < 4:
+        return {}
+
+    t = np.array([s["time"] for s in samples])
+    t = t - t[0]
+    flagged = {}
+    for name in samples[0]["metrics"]:
+        y = np.array([s["metrics"][name] for s in samples], dtype=float)
+        if np.ptp(y) == 0:
+            continue
+        slope, intercept = np.polyfit(t, y, 1)
+        fitted = slope * t + intercept
+        r2 = 1 - ((y - fitted) ** 2).sum() / ((y - y.mean()) ** 2).sum()
+        growth = slope * t[-1]
+        base = max(abs(fitted[0]), 1.0)
+        if slope > 0 and r2 > 0.5 and growth / base > tolerance:
+            flagged[name] = f"+{growth:.0f} ({growth / base * 100:.0f}%) over {t[-1]:.0f}s, r2={r2:.2f}"
+    return flagged
+
+
+# --- Autopilot Play ---
+
+def play_game(world, start_level, max_frames):
+    """
+    Play one autopilot game to game over, boss kill or the frame limit.
+
+    Returns:
+        str: GAME_OVER, VICTORY or "timeout".
+    """
+    headless.set_level(world, start_level)
+    for _ in range(max_frames):
+        outcome = world.step(DT)
+        if outcome:
+            return outcome
+    return "timeout"
+
+
+def run(minutes, interval, seed=1, max_frames=20000, report_path="soak_report.json", tolerance=0.10,
+        difficulty="normal"):
+    """
+    Run the soak test and write a JSON report.
+
+    Returns:
+        int: 0 if nothing trended upward, 1 otherwise.
+    """
+    screen = headless.init()
+    headless.preload()
+    tracemalloc.start(1)
+
+    world = headless.new_world(seed, god_mode=False)
+    world.set_input(Autopilot.preset(world, difficulty, seed))
+    font = assets.get_font(32)
+    background = assets.load_image("assets/background.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+    life_icon = assets.load_image("assets/ship.png", (24, 24))
+
+    outcomes = {GAME_OVER: 0, VICTORY: 0, "timeout": 0}
+    samples = [sample(world, 0)]
+    deadline = time.time() + minutes * 60
+    next_sample = time.time() + interval
+    games = 0
+
+    while time.time() < deadline:
+        outcome = play_game(world, START_LEVELS[games % len(START_LEVELS)], max_frames)
+        outcomes[outcome] += 1
+        games += 1
+
+        # Render the last frame of each game so draw paths and rotation caches are exercised too
+        screen.blit(background, (0, 0))
+        world.draw(screen, font, life_icon)
+
+        # Sample before the reset so group sizes reflect the end of a game
+        if time.time() >= next_sample:
+            next_sample += interval
+            samples.append(sample(world, games))
+            metrics = samples[-1]["metrics"]
+            print(f"[{games} games] rss={metrics['rss.bytes'] / 1e6:.1f} MB "
+                  f"traced={metrics['tracemalloc.bytes'] / 1e6:.1f} MB surfaces={metrics['surfaces']}")
+
+        world.reset()
+
+    samples.append(sample(world, games))
+    flagged = detect_trends(samples, tolerance)
+
+    with open(report_path, "w") as file:
+        json.dump({"games": games, "outcomes": outcomes, "flagged": flagged, "samples": samples}, file, indent=2)
+
+    print(f"Played {games} games: {outcomes}. Report: {report_path}")
+    for name, description in flagged.items():
+        print(f"  LEAK? {name}: {description}")
+    return 1 if flagged else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless long-session soak test.")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--interval", type=float, default=30, help="Seconds between samples")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-frames", type=int, default=20000, help="Frame limit per game")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed growth after warm-up")
+    parser.add_argument("--report", default="soak_report.json")
+    parser.add_argument("--difficulty", default="normal", choices=DIFFICULTIES, help="Autopilot preset")
+    args = parser.parse_args(argv)
+    return run(args.minutes, args.interval, args.seed, args.max_frames, args.report, args.tolerance, args.difficulty)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
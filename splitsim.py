@@ -0,0 +1,434 @@
+"""
+Simulation in its own process, rendering in the main one (SPLIT_PROCESSES).
+
+The child process owns the World and steps it at a steady 60 ticks/s on its
+own clock, so a slow draw can no longer delay an update. After every tick it
+publishes the World as netplay entity records (positions, velocities, angles,
+per-kind extras) into one of two frame buffers in a shared memory block. The
+main process draws straight out of the newest buffer through numpy views:
+nothing is copied or pickled on the way.
+
+Shared memory layout: one CONTROL_DTYPE record, then two frames of
+FRAME_DTYPE header + CAPACITY ENTITY_DTYPE records.
+
+Double buffer protocol (no locks):
+    - The writer fills the buffer that isn't `front` and then flips `front`.
+      If the renderer is still drawing from that buffer (`reading`), the
+      writer skips publishing this tick. The simulation itself never waits.
+    - Each buffer has a version that is odd while it's being written. The
+      renderer checks it before and after drawing, and counts a torn frame
+      in the rare race where a write slipped in anyway.
+
+The other direction is the control record: the keys held right now, the
+session seed and reset / quit commands. Sounds the simulation plays are
+published as per-sound counters, and the renderer plays whichever went up.
+Both sides' utilization is reported when a session ends.
+"""
+
+import multiprocessing
+import os
+import random
+import time
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+import assets
+from constants import FIXED_DT
+from devtools import DEV_MODE
+from controls import KEYBOARD, from_bits, to_bits
+from netplay import (ENTITY_DTYPE, BOSS_ACTIVE, BOSS_DEFEATED, LOST, WON, Quantizer, NetView,
+                     fixed_ticks, positions)
+from world import GAME_OVER, VICTORY
+
+CAPACITY = 8192  # Entity records per frame (more are left out of the picture, not the simulation)
+
+# Sounds the simulation can trigger, by counter index
+SOUNDS = ("assets/shoot.wav", "assets/nomanches.wav", "assets/iugh.wav")
+
+# --- Commands ---
+RESET = 1
+STOP = 2
+
+CONTROL_DTYPE = np.dtype([
+    ("command", "<i8"),
+    ("command_count", "<i8"),    # Bumped with every new command
+    ("seed", "<i8"),
+    ("input", "<i8"),            # controls.to_bits() of the keys held now
+    ("ready", "<i8"),            # Child finished loading
+    ("front", "<i8"),            # Buffer with the newest complete frame (-1 = none yet)
+    ("reading", "<i8"),          # Buffer the renderer is drawing from (-1 = none)
+    ("versions", "<i8", (2,)),   # Odd while that buffer is being written
+    # Simulation statistics for the current session
+    ("ticks", "<i8"),
+    ("late", "<i8"),             # Ticks that started more than half a tick late
+    ("skipped", "<i8"),          # Publishes skipped because the renderer held the buffer
+    ("busy", "<f8"),             # Seconds spent stepping and publishing
+    ("elapsed", "<f8"),          # Seconds since the session started
+])
+
+FRAME_DTYPE = np.dtype([
+    ("tick", "<i8"),
+    ("count", "<i8"),
+    ("score", "<i8"),
+    ("level", "<i8"),
+    ("flags", "<i8"),            # netplay snapshot flags
+    ("session", "<i8"),          # command_count of the RESET that started this session
+    ("sounds", "<i8", (len(SOUNDS),)),
+])
+
+_FRAME_SIZE = FRAME_DTYPE.itemsize + CAPACITY * ENTITY_DTYPE.itemsize
+_SIZE = CONTROL_DTYPE.itemsize + 2 * _FRAME_SIZE
+
+
+class SharedFrames:
+    """
+    numpy views over the shared block: control record and two frame buffers.
+    """
+
+    def __init__(self, memory):
+        self.memory = memory
+        buffer = memory.buf
+        self.control = np.ndarray((), CONTROL_DTYPE, buffer, 0)
+        self.headers = []
+        self.records = []
+        for index in range(2):
+            offset = CONTROL_DTYPE.itemsize + index * _FRAME_SIZE
+            self.headers.append(np.ndarray((), FRAME_DTYPE, buffer, offset))
+            self.records.append(np.ndarray(CAPACITY, ENTITY_DTYPE, buffer, offset + FRAME_DTYPE.itemsize))
+        self._version = 0
+
+    def release_views(self):
+        """Drop the numpy views so the shared block can be closed."""
+        self.control = self.headers = self.records = None
+
+    # --- Writer (simulation process) ---
+
+    def publish(self, session, tick, records, score, level, flags, sounds):
+        """
+        Write a frame into the back buffer and make it the front one.
+
+        Returns:
+            bool: False if the renderer still held the back buffer (nothing written).
+        """
+        control = self.control
+        front = int(control["front"])
+        back = 1 - front if front >= 0 else 0
+        if int(control["reading"]) == back:
+            control["skipped"] += 1
+            return False
+
+        versions = control["versions"]
+        versions[back] += 1
+        count = min(len(records), CAPACITY)
+        header = self.headers[back]
+        header["session"] = session
+        header["tick"] = tick
+        header["count"] = count
+        header["score"] = score
+        header["level"] = level
+        header["flags"] = flags
+        header["sounds"] = sounds
+        self.records[back][:count] = records[:count]
+        versions[back] += 1
+        control["front"] = back
+        return True
+
+    # --- Reader (render process) ---
+
+    def acquire(self):
+        """
+        Claim the newest complete frame for drawing.
+
+        Returns:
+            int or None: Buffer index (pass to release()), None if there's no frame yet.
+        """
+        control = self.control
+        for _ in range(3):
+            front = int(control["front"])
+            if front < 0:
+                break
+            control["reading"] = front
+            version = int(control["versions"][front])
+            if version % 2 == 0 and int(control["front"]) == front:
+                self._version = version
+                return front
+        control["reading"] = -1
+        return None
+
+    def frame(self, index):
+        """
+        Header and records of a claimed buffer (views into shared memory).
+
+        Returns:
+            (ndarray, ndarray): FRAME_DTYPE header, ENTITY_DTYPE records.
+        """
+        header = self.headers[index]
+        return header, self.records[index][:int(header["count"])]
+
+    def release(self, index):
+        """
+        Give a buffer back to the writer.
+
+        Returns:
+            bool: False if it was overwritten while it was being drawn (torn frame).
+        """
+        intact = int(self.control["versions"][index]) == self._version
+        self.control["reading"] = -1
+        return intact
+
+
+class SharedInput:
+    """
+    Input source for the simulation process: the keys the renderer last saw held.
+    """
+
+    def __init__(self, control):
+        self.control = control
+
+    def read(self, player, dt):
+        return from_bits(int(self.control["input"]))
+
+
+def _simulate(name):
+    """Child process: load, then run sessions as the control record commands."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import headless
+    from world import World
+
+    headless.init()
+    headless.preload()
+    memory = shared_memory.SharedMemory(name=name)
+    frames = SharedFrames(memory)
+    control = frames.control
+
+    sounds = np.zeros(len(SOUNDS), dtype=np.int64)
+    counters = {assets.load_sound(path): index for index, path in enumerate(SOUNDS)}
+
+    def count_sound(sound):
+        index = counters.get(sound)
+        if index is not None:
+            sounds[index] += 1
+
+    assets.redirect_sounds(count_sound)
+    shared_input = SharedInput(control)
+    control["ready"] = 1
+
+    commands_seen = 0
+    world = None
+    outcome = None
+    ticker = None
+    perf_counter = time.perf_counter
+    while True:
+        if int(control["command_count"]) != commands_seen:
+            commands_seen = int(control["command_count"])
+            if int(control["command"]) == STOP:
+                break
+            random.seed(int(control["seed"]))
+            world = World(assets.load_sound("assets/shoot.wav", 0.4), assets.load_sound("assets/nomanches.wav", 0.7),
+                          shared_input)
+            quantizer = Quantizer()
+            sounds[:] = 0  # The renderer counts each session's sounds from zero
+            outcome = None
+            tick = 0
+            for field in ("ticks", "late", "skipped"):
+                control[field] = 0
+            control["busy"] = control["elapsed"] = 0.0
+            ticker = fixed_ticks()
+            started = due = perf_counter()
+
+        if world is None or outcome:
+            time.sleep(0.005)
+            continue
+
+        next(ticker)
+        t0 = perf_counter()
+        due += FIXED_DT
+        if t0 - due > FIXED_DT / 2:
+            control["late"] += 1
+            due = max(due, t0 - FIXED_DT)  # Count a stall once, not on every tick after it
+        outcome = world.step(FIXED_DT)
+        tick += 1
+        flags = ((world.boss_active and BOSS_ACTIVE) | (world.boss_defeated and BOSS_DEFEATED)
+                 | (outcome == GAME_OVER and LOST) | (outcome == VICTORY and WON))
+        records = quantizer.records(world)
+        while not frames.publish(commands_seen, tick, records, world.score, world.asteroid_field.level, flags, sounds) and outcome:
+            time.sleep(0.001)  # The final frame must get through
+        t1 = perf_counter()
+        control["ticks"] = tick
+        control["busy"] += t1 - t0
+        control["elapsed"] = t1 - started
+
+    frames.release_views()
+    memory.close()
+
+
+class _FrameView:
+    """What NetView needs to draw one shared frame (single player, no prediction)."""
+
+    slot = None
+    ship = None
+
+    def __init__(self):
+        self.records = np.zeros(0, ENTITY_DTYPE)
+        self.flags = 0
+        self.score = 0
+        self.level = 1
+
+    @property
+    def outcome(self):
+        return GAME_OVER if self.flags & LOST else VICTORY if self.flags & WON else None
+
+    def interpolated(self):
+        return self.records, positions(self.records["x"]), positions(self.records["y"])
+
+
+class SplitOverlay:
+    """
+    Dev-mode corner readout: simulation tick rate next to render frame rate.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.label = None
+        self.updated = 0.0
+
+    def draw(self, screen, split):
+        now = time.perf_counter()
+        if now - self.updated >= 0.5:  # Text is re-rendered twice a second, not every frame
+            control = split.frames.control
+            sim_elapsed = float(control["elapsed"]) or 1e-9
+            render_elapsed = max(now - split.started, 1e-9)
+            text = (f"sim {int(control['ticks']) / sim_elapsed:.0f} t/s "
+                         f"{float(control['busy']) / sim_elapsed:.0%} | "
+                         f"render {split.frames_drawn / render_elapsed:.0f} fps {split.busy / render_elapsed:.0%}")
+            self.label = self.font.render(text, True, (180, 255, 180))
+            self.updated = now
+        screen.blit(self.label, self.label.get_rect(bottomright=(screen.get_width() - 10, screen.get_height() - 10)))
+
+
+class SplitSimulation:
+    """
+    Main-process handle on the simulation process, plus the render loop.
+    """
+
+    def __init__(self):
+        self.memory = shared_memory.SharedMemory(create=True, size=_SIZE)
+        self.frames = SharedFrames(self.memory)
+        control = self.frames.control
+        control.fill(0)
+        control["front"] = control["reading"] = -1
+        self.process = multiprocessing.get_context("spawn").Process(
+            target=_simulate, args=(self.memory.name,), name="simulation", daemon=True)
+        self.view = None
+        self.overlay = None
+
+        # Render statistics for the current session
+        self.frames_drawn = 0
+        self.stale = 0      # Frames that showed the same tick as the one before
+        self.torn = 0
+        self.busy = 0.0     # Seconds spent drawing (not waiting for the next frame)
+        self.started = 0.0
+
+    def start(self):
+        self.process.start()
+        return self
+
+    def _command(self, command):
+        control = self.frames.control
+        control["command"] = command
+        control["command_count"] += 1
+
+    def reset(self, seed):
+        """Start a new session in the simulation process."""
+        self.frames.control["seed"] = seed
+        self._command(RESET)
+        self.frames_drawn = self.stale = self.torn = 0
+        self.busy = 0.0
+        self.started = time.perf_counter()
+
+    def close(self):
+        if self.process.is_alive():
+            self._command(STOP)
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.frames.release_views()
+        self.memory.close()
+        self.memory.unlink()
+
+    def report(self):
+        """One-line utilization summary of both processes."""
+        control = self.frames.control
+        sim_elapsed = float(control["elapsed"]) or 1e-9
+        render_elapsed = time.perf_counter() - self.started
+        return (f"Simulation: {int(control['ticks']) / sim_elapsed:.1f} ticks/s, "
+                f"{float(control['busy']) / sim_elapsed:.1%} busy, {int(control['late'])} late ticks, "
+                f"{int(control['skipped'])} publishes skipped | "
+                f"Render: {self.frames_drawn / render_elapsed:.1f} fps, {self.busy / render_elapsed:.1%} busy, "
+                f"{self.stale} repeated frames, {self.torn} torn")
+
+    def play(self, game):
+        """
+        Render the running session until it ends (Game.play() in split mode).
+
+        Args:
+            game (Game): Supplies the screen, pacing and dev hotkeys.
+
+        Returns:
+            str: One of main's WIN / LOST / QUIT states.
+        """
+        from main import WIN, LOST, QUIT
+
+        if self.view is None:
+            self.view = NetView()
+            self.overlay = SplitOverlay(assets.get_font(20)) if DEV_MODE else None
+        frames = self.frames
+        control = frames.control
+        while not control["ready"]:
+            time.sleep(0.01)  # Still loading (only the first session)
+            for event in pygame.event.get(pygame.QUIT):
+                return QUIT
+
+        session = int(control["command_count"])
+        shown = _FrameView()
+        last_tick = -1
+        last_sounds = np.zeros(len(SOUNDS), dtype=np.int64)
+        while True:
+            game.tick()
+            frame_start = time.perf_counter()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    print(self.report())
+                    return QUIT
+                elif event.type == pygame.KEYDOWN:
+                    game.handle_key(event.key)
+            control["input"] = to_bits(KEYBOARD.read(None, FIXED_DT))
+
+            index = frames.acquire()
+            if index is not None and int(frames.headers[index]["session"]) != session:
+                frames.release(index)  # Last frame of the previous session
+                index = None
+            if index is not None:
+                header, shown.records = frames.frame(index)
+                tick = int(header["tick"])
+                shown.flags, shown.score, shown.level = int(header["flags"]), int(header["score"]), int(header["level"])
+                for sound in np.flatnonzero(header["sounds"] > last_sounds):
+                    assets.load_sound(SOUNDS[sound]).play()
+                last_sounds[:] = header["sounds"]
+                self.view.draw(game.screen, shown)
+                if self.overlay:
+                    self.overlay.draw(game.screen, self)
+                if not frames.release(index):
+                    self.torn += 1
+                shown.records = shown.records[:0]
+                if tick == last_tick:
+                    self.stale += 1
+                last_tick = tick
+                self.frames_drawn += 1
+            self.busy += time.perf_counter() - frame_start
+            pygame.display.flip()
+
+            if shown.outcome:
+                print(self.report())
+                return WIN if shown.outcome == VICTORY else LOST
@@ -0,0 +1,227 @@
+"""
+Structured gameplay telemetry.
+
+- Typed events (spawn, split, kill, hit, dizzy, level-up, boss stage, game over)
+  are written by the game thread into preallocated NumPy ring columns: one
+  index bump and a few stores, no formatting, no I/O.
+- A background thread drains the ring in batches and appends them as compact
+  JSON lines or fixed-size binary records.
+- Verbosity picks which events are kept; events that arrive while the ring is
+  full are dropped and counted instead of blocking the frame.
+
+Nothing is recorded until start() is called, so headless tools pay nothing.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from devtools import TELEMETRY, TELEMETRY_BINARY, TELEMETRY_ECHO
+
+# --- Event Types ---
+SPAWN = 0
+SPLIT = 1
+KILL = 2
+HIT = 3
+DIZZY = 4
+LEVEL_UP = 5
+BOSS_STAGE = 6
+GAME_OVER = 7
+
+EVENT_NAMES = ("spawn", "split", "kill", "hit", "dizzy", "level_up", "boss_stage", "game_over")
+
+# Names of the four payload values per event type (unused slots stay 0)
+EVENT_FIELDS = (
+    ("x", "y", "radius", "speed"),     # spawn
+    ("x", "y", "radius"),              # split: radius of the asteroid that split
+    ("x", "y", "source", "score"),     # kill: what the player destroyed
+    ("x", "y", "source", "lives"),     # hit: what hit the player, lives left
+    ("x", "y"),                        # dizzy
+    ("level",),                        # level_up
+    ("stage", "health"),               # boss_stage
+    ("score", "level", "won"),         # game_over
+)
+
+# --- Verbosity ---
+OFF = 0
+INFO = 1
+DEBUG = 2
+
+VERBOSITY = {"off": OFF, "info": INFO, "debug": DEBUG}
+
+# Per-event verbosity: high-volume events only at DEBUG
+EVENT_LEVELS = (DEBUG, DEBUG, DEBUG, INFO, INFO, INFO, INFO, INFO)
+
+# Source codes for kill / hit events
+SOURCES = ("asteroid", "mikito", "poop", "bone", "cookie", "boss")
+SOURCE_CODES = {
+    "Asteroid": 0, "Enemy": 1, "EnemyBullet": 2,
+    "BoneBullet": 3, "CookieBullet": 4, "FinalBoss": 5,
+}
+
+# On-disk layout of one binary record
+RECORD_DTYPE = np.dtype([("time", "<f8"), ("type", "u1"), ("values", "<f4", (4,))])
+
+
+def source_code(sprite):
+    """Source code for a sprite (-1 if it isn't a known damage/kill source)."""
+    return SOURCE_CODES.get(type(sprite).__name__, -1)
+
+
+def read_binary(path):
+    """
+    Load a binary telemetry file.
+
+    Returns:
+        ndarray: Structured array with RECORD_DTYPE.
+    """
+    return np.fromfile(path, dtype=RECORD_DTYPE)
+
+
+class Telemetry:
+    """
+    Single-producer ring buffer with a background batch writer.
+    """
+
+    def __init__(self, capacity=1 << 14, verbosity=INFO, path="telemetry.jsonl", binary=False,
+                 flush_interval=0.5, echo=False):
+        """
+        Args:
+            capacity (int): Events buffered between writer flushes.
+            verbosity (int): OFF, INFO or DEBUG.
+            path (str): Output file (appended to).
+            binary (bool): Write RECORD_DTYPE records instead of JSON lines.
+            flush_interval (float): Seconds between writer batches.
+            echo (bool): Also print INFO events to stdout (from the writer thread).
+        """
+        self.capacity = capacity
+        self.verbosity = verbosity
+        self.path = path
+        self.binary = binary
+        self.flush_interval = flush_interval
+        self.echo = echo
+
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.types = np.zeros(capacity, dtype=np.uint8)
+        self.values = np.zeros((capacity, 4), dtype=np.float32)
+
+        self.head = 0      # Events written (game thread only)
+        self.tail = 0      # Events consumed (writer thread only)
+        self.dropped = 0
+        self.written = 0
+
+        self._enabled = [False] * len(EVENT_NAMES)
+        self._epoch = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Enable recording at the configured verbosity and start the writer.
+        """
+        if self._thread is not None or self.verbosity == OFF:
+            return self
+        self._enabled = [level <= self.verbosity for level in EVENT_LEVELS]
+        self._epoch = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """
+        Stop recording, flush what is buffered and wait for the writer.
+        """
+        if self._thread is None:
+            return
+        self._enabled = [False] * len(EVENT_NAMES)
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    @contextmanager
+    def muted(self):
+        """
+        Drop every event emitted inside the block (e.g. from predicted frames).
+        """
+        enabled = self._enabled
+        self._enabled = [False] * len(EVENT_NAMES)
+        try:
+            yield
+        finally:
+            self._enabled = enabled
+
+    # --- Game Thread ---
+
+    def emit(self, event, a=0.0, b=0.0, c=0.0, d=0.0):
+        """
+        Record one event (no-op when its type is filtered out).
+
+        Args:
+            event (int): Event type (SPAWN, SPLIT, ...).
+            a, b, c, d (float): Payload, named by EVENT_FIELDS[event].
+        """
+        if not self._enabled[event]:
+            return
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        i = head % self.capacity
+        self.times[i] = time.perf_counter() - self._epoch
+        self.types[i] = event
+        values = self.values[i]
+        values[0] = a
+        values[1] = b
+        values[2] = c
+        values[3] = d
+        self.head = head + 1  # Publish last, so the writer never sees a half-written slot
+
+    # --- Writer Thread ---
+
+    def _run(self):
+        with open(self.path, "ab" if self.binary else "a") as file:
+            while not self._stop.wait(self.flush_interval):
+                self._flush(file)
+            self._flush(file)
+
+    def _flush(self, file):
+        head = self.head
+        tail = self.tail
+        if head == tail:
+            return
+
+        idx = np.arange(tail, head) % self.capacity
+        times = self.times[idx]
+        types = self.types[idx]
+        values = self.values[idx]
+        self.tail = head
+
+        if self.binary:
+            records = np.empty(len(idx), dtype=RECORD_DTYPE)
+            records["time"] = times
+            records["type"] = types
+            records["values"] = values
+            file.write(records.tobytes())
+        else:
+            lines = []
+            for t, event, row in zip(times.tolist(), types.tolist(), values.tolist()):
+                record = {"t": round(t, 4), "event": EVENT_NAMES[event]}
+                for name, value in zip(EVENT_FIELDS[event], row):
+                    record[name] = SOURCES[int(value)] if name == "source" and value >= 0 else round(value, 2)
+                lines.append(json.dumps(record, separators=(",", ":")))
+                if self.echo and EVENT_LEVELS[event] == INFO:
+                    print(lines[-1])
+            file.write("\n".join(lines) + "\n")
+        file.flush()
+        self.written += len(idx)
+
+
+# Shared telemetry used by the game (started by main.py)
+telemetry = Telemetry(
+    verbosity=VERBOSITY[TELEMETRY],
+    path="telemetry.bin" if TELEMETRY_BINARY else "telemetry.jsonl",
+    binary=TELEMETRY_BINARY,
+    echo=TELEMETRY_ECHO,
+)
@@ -0,0 +1,371 @@
+"""
+Replay verification service for leaderboard submissions.
+
+Submitted replays (replay.py files: seed plus one input byte per tick) are
+re-simulated headless, as fast as the CPU allows, and their claimed score,
+level and boss kill are checked against what the game actually produces.
+The simulation is the game's own World.step(), so the AsteroidField spawns,
+collisions and boss logic are exactly the ones main() runs.
+
+A submission is only trusted as far as its seed and inputs:
+    - the starting state is rebuilt from the seed and must equal the replay's
+      first keyframe (a fresh level 1 game), and
+    - every tick is simulated from there; later keyframes are never restored,
+      so editing them changes nothing.
+
+The service watches a spool directory:
+
+    spool/incoming/   drop *.rpl files here (write elsewhere, then rename in)
+    spool/working/    claimed by a worker
+    spool/verified/   matched their claims
+    spool/rejected/   didn't, or weren't readable
+    spool/results.jsonl   one line per finished submission
+
+Files are verified on a process pool. At most `queue_size` files are claimed
+at once; the rest wait in incoming/ until a worker frees up, so a burst of
+submissions never piles up in memory.
+
+Usage:
+    python verifier.py serve --spool spool --workers 4
+    python verifier.py serve --spool spool --once     # drain incoming/ and exit
+    python verifier.py submit replays/test.rpl --spool spool
+    python verifier.py check replays/*.rpl            # verify files in place
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import snapshot
+from constants import FIXED_DT
+from replay import Replay, ReplayError, ReplayInput
+
+MAX_TICKS = 60 * 60 * 60  # Longest accepted game (an hour at 60 ticks/s)
+
+SPOOL_DIRS = ("incoming", "working", "verified", "rejected")
+
+
+# --- Verification (runs in worker processes) ---
+
+def _init_worker():
+    import headless
+
+    headless.init()
+    headless.preload()
+
+
+def check(path, strict=True):
+    """
+    Re-simulate one replay and compare it with its header.
+
+    Args:
+        path (str): Replay file.
+        strict (bool): Require the replay to start from a fresh game built from
+            its seed. Without it the first keyframe is trusted (replay.verify).
+
+    Returns:
+        dict: path, ok, reason (None when ok), claimed and simulated results,
+        ticks simulated and seconds spent.
+    """
+    import headless
+
+    started = time.perf_counter()
+    result = {"path": path, "ok": False, "reason": None}
+    replay = None
+    try:
+        with Replay(path) as replay:
+            result.update(seed=replay.seed, claimed={
+                "score": replay.score, "level": replay.level, "outcome": replay.outcome,
+                "boss_defeated": replay.boss_defeated, "ticks": replay.ticks,
+            })
+            result["reason"] = _simulate(headless, replay, strict, result)
+    except (ReplayError, OSError) as error:
+        result["reason"] = f"unreadable: {error}"
+    except Exception as error:  # Corrupt chunks (zlib.error, short inputs) must not take the worker down
+        result["reason"] = f"failed: {type(error).__name__}: {error}"
+
+    result["ok"] = result["reason"] is None
+    result["ticks"] = replay.position if replay else 0  # Ticks actually simulated
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _simulate(headless, replay, strict, result):
+    """Play the replay into a new World. Returns the rejection reason, or None."""
+    if replay.dt != FIXED_DT:
+        return f"tick length {replay.dt} is not {FIXED_DT}"
+    if replay.ticks > MAX_TICKS:
+        return f"{replay.ticks} ticks is over the {MAX_TICKS} limit"
+    if not len(replay.index) or replay.index[0]["tick"] != 0:
+        return "no keyframe at tick 0"
+
+    world = headless.new_world(replay.seed, god_mode=False)
+    if strict:
+        if snapshot.capture(world) != snapshot.upgrade(replay.keyframe(0)):
+            return "does not start from a fresh game with its seed"
+    else:
+        snapshot.restore(world, replay.keyframe(0))
+
+    world.set_input(ReplayInput(replay))
+    replay.position = 0
+    outcome = None
+    while replay.position < replay.ticks:
+        if outcome is not None:
+            return f"game ended at tick {replay.position - 1} but the replay continues"
+        outcome = replay.step(world)
+
+    result["simulated"] = {
+        "score": world.score, "level": world.asteroid_field.level,
+        "outcome": outcome, "boss_defeated": world.boss_defeated,
+    }
+    if not replay.matches(world, outcome):
+        return "result does not match the claim"
+    return None
+
+
+# --- Service ---
+
+class VerifierService:
+    """
+    Spool-directory front end for a pool of verifier processes.
+    """
+
+    def __init__(self, spool="spool", workers=None, queue_size=None, strict=True):
+        """
+        Args:
+            spool (str): Directory holding incoming/, working/, verified/ and rejected/.
+            workers (int): Verifier processes (default: one per CPU).
+            queue_size (int): Most files claimed at once (default: 2 per worker).
+            strict (bool): See check().
+        """
+        self.spool = spool
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or 2 * self.workers
+        self.strict = strict
+
+        self.dirs = {name: os.path.join(spool, name) for name in SPOOL_DIRS}
+        self.results_path = os.path.join(spool, "results.jsonl")
+
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.verified = 0
+        self.rejected = 0
+        self.ticks = 0
+        self.started = None
+        self._pool = None
+        self._retried = set()  # Files re-queued once after their worker's pool broke
+
+    @property
+    def completed(self):
+        return self.verified + self.rejected
+
+    @property
+    def rate(self):
+        """Verifications per second since the service started."""
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def status(self):
+        elapsed = time.perf_counter() - self.started
+        return (f"{self.completed} done ({self.verified} verified, {self.rejected} rejected), "
+                f"{self.rate:.1f} verifications/s, {self.ticks / max(elapsed, 1e-9):,.0f} ticks/s, "
+                f"{self.pending}/{self.queue_size} in flight")
+
+    def run(self, once=False, poll=0.5, report_every=10.0):
+        """
+        Verify spooled submissions until interrupted (or, with once, until incoming/ is empty).
+
+        Args:
+            once (bool): Exit when nothing is left to verify.
+            poll (float): Seconds between scans of an empty incoming/.
+            report_every (float): Seconds between status lines.
+        """
+        for path in self.dirs.values():
+            os.makedirs(path, exist_ok=True)
+        self._requeue_abandoned()
+
+        self.started = time.perf_counter()
+        last_report = self.started
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        try:
+            while True:
+                claimed = 0
+                for name in self._incoming():
+                    self._slots.acquire()  # Blocks while queue_size files are in flight
+                    if self._claim(name):
+                        claimed += 1
+                    else:
+                        self._slots.release()
+
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    print(self.status(), flush=True)
+                    last_report = now
+
+                if claimed == 0:
+                    with self._lock:
+                        idle = self.pending == 0
+                    if once and idle:
+                        break
+                    time.sleep(poll)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._pool.shutdown()
+        print(self.status(), flush=True)
+
+    def _incoming(self):
+        """Submissions in arrival order (temporary names are skipped)."""
+        folder = self.dirs["incoming"]
+        arrivals = []
+        for name in os.listdir(folder):
+            if not name.endswith(".rpl"):
+                continue
+            try:
+                arrivals.append((os.path.getmtime(os.path.join(folder, name)), name))
+            except FileNotFoundError:
+                continue  # Claimed by another service on the same spool since listdir()
+        return [name for _, name in sorted(arrivals)]
+
+    def _requeue_abandoned(self):
+        """Files a previous run claimed but never finished go back in the queue."""
+        for name in os.listdir(self.dirs["working"]):
+            os.replace(os.path.join(self.dirs["working"], name), os.path.join(self.dirs["incoming"], name))
+
+    def _submit(self, path):
+        """Queue a check on the pool, replacing the pool if a worker crash broke it."""
+        try:
+            return self._pool.submit(check, path, self.strict)
+        except BrokenProcessPool:
+            print("Verifier pool broke (a worker died); starting a new one", flush=True)
+            self._pool.shutdown(wait=False)
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+            return self._pool.submit(check, path, self.strict)
+
+    def _claim(self, name):
+        working = os.path.join(self.dirs["working"], name)
+        try:
+            os.replace(os.path.join(self.dirs["incoming"], name), working)
+        except FileNotFoundError:
+            return False  # Withdrawn, or claimed by another service on the same spool
+        with self._lock:
+            self.pending += 1
+        future = self._submit(working)
+        future.add_done_callback(lambda done: self._finish(name, done))
+        return True
+
+    def _finish(self, name, future):
+        try:
+            result = future.result()
+        except BrokenProcessPool as error:
+            if name not in self._retried:
+                # Possibly another file's crash: try once more on the new pool
+                self._retried.add(name)
+                os.replace(os.path.join(self.dirs["working"], name), os.path.join(self.dirs["incoming"], name))
+                with self._lock:
+                    self.pending -= 1
+                self._slots.release()
+                return
+            result = {"ok": False, "reason": f"verifier crashed: {error}", "ticks": 0}
+        except Exception as error:  # Worker died
+            result = {"ok": False, "reason": f"verifier crashed: {error}", "ticks": 0}
+        result["path"] = name
+
+        destination = self.dirs["verified" if result["ok"] else "rejected"]
+        os.replace(os.path.join(self.dirs["working"], name), os.path.join(destination, name))
+        with self._lock:
+            with open(self.results_path, "a") as file:
+                file.write(json.dumps(result) + "\n")
+            self.pending -= 1
+            self.ticks += result["ticks"]
+            if result["ok"]:
+                self.verified += 1
+            else:
+                self.rejected += 1
+        self._slots.release()
+
+
+def submit(path, spool="spool"):
+    """
+    Copy a replay into the spool's incoming/ directory.
+
+    Written under a temporary name and renamed, so the service never claims a
+    half-written file.
+
+    Returns:
+        str: Path of the queued file.
+    """
+    incoming = os.path.join(spool, "incoming")
+    os.makedirs(incoming, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{os.path.basename(path)}"
+    if not name.endswith(".rpl"):
+        name += ".rpl"
+    temporary = os.path.join(incoming, name + ".part")
+    shutil.copyfile(path, temporary)
+    destination = os.path.join(incoming, name)
+    os.replace(temporary, destination)
+    return destination
+
+
+# --- Command Line ---
+
+def check_files(paths, workers=None, strict=True):
+    """
+    Verify files in place on a process pool and print one line each.
+
+    Returns:
+        bool: True if every file verified.
+    """
+    started = time.perf_counter()
+    ok = True
+    ticks = 0
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=_init_worker) as pool:
+        for result in pool.map(check, paths, [strict] * len(paths)):
+            ok = ok and result["ok"]
+            ticks += result["ticks"]
+            print(f"{result['path']}: {'OK' if result['ok'] else 'REJECTED (' + result['reason'] + ')'}")
+    elapsed = time.perf_counter() - started
+    print(f"{len(paths)} replays in {elapsed:.2f} s: {len(paths) / elapsed:.1f} verifications/s, "
+          f"{ticks / elapsed:,.0f} ticks/s")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify submitted replays.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Verify files dropped into a spool directory")
+    serve.add_argument("--spool", default="spool")
+    serve.add_argument("--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    serve.add_argument("--queue", type=int, default=None, help="Files in flight (default: 2 per worker)")
+    serve.add_argument("--once", action="store_true", help="Exit once incoming/ is drained")
+    serve.add_argument("--lenient", action="store_true", help="Trust the first keyframe instead of the seed")
+
+    queue = commands.add_parser("submit", help="Queue replay files for a running service")
+    queue.add_argument("paths", nargs="+")
+    queue.add_argument("--spool", default="spool")
+
+    batch = commands.add_parser("check", help="Verify files in place and report throughput")
+    batch.add_argument("paths", nargs="+")
+    batch.add_argument("--workers", type=int, default=None)
+    batch.add_argument("--lenient", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        VerifierService(args.spool, args.workers, args.queue, strict=not args.lenient).run(once=args.once)
+    elif args.command == "submit":
+        for path in args.paths:
+            print(f"Queued {submit(path, args.spool)}")
+    else:
+        return 0 if check_files(args.paths, args.workers, strict=not args.lenient) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""
+World state for one play session.
+
+- Owns the sprite groups, the players, the asteroid field and the boss.
+- reset() rebuilds only world state; sounds, images and fonts stay loaded.
+- step(dt) runs one frame of simulation (updates + collisions) and reports
+  session outcomes instead of showing screens, so main.py decides what's next.
+"""
+
+import pygame
+import assets
+from constants import *
+from devtools import DEV_MODE, SKIP_TO_LEVEL, GOD_MODE
+from enemy import Enemy
+from player import Player
+from asteroidfield import AsteroidField
+from asteroid import Asteroid
+from shot import Shot
+from finalboss import FinalBoss
+from profiler import profiler
+from controls import KEYBOARD
+from telemetry import telemetry, source_code, SOURCES, KILL, HIT, DIZZY, BOSS_STAGE, GAME_OVER as GAME_OVER_EVENT
+
+# --- Step Outcomes ---
+GAME_OVER = "game_over"
+VICTORY = "victory"
+
+BOSS_LEVEL = 10
+
+# --- Players ---
+MAX_PLAYERS = 4
+SPAWN_OFFSETS = ((0, 0), (-150, 0), (150, 0), (0, 150))  # From the screen center, per ship
+
+
+def clear_groups(*groups):
+    """Kills and clears all sprites from the given groups."""
+    for group in groups:
+        for sprite in list(group):
+            sprite.kill()
+        group.empty()
+
+
+class World:
+    """
+    Everything that changes during a session and is thrown away on restart.
+    """
+
+    def __init__(self, shoot_sound, explosion_sound, input_source=KEYBOARD):
+        """
+        Create the sprite groups and the first session.
+
+        Args:
+            shoot_sound (Sound): Played when the player fires.
+            explosion_sound (Sound): Played when the player loses a life.
+            input_source: What drives the Player (keyboard by default, see controls.py).
+        """
+        self.shoot_sound = shoot_sound
+        self.explosion_sound = explosion_sound
+        self.input_source = input_source
+
+        # Sprite Groups (created once, emptied on reset)
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.mikito_bullets = pygame.sprite.Group()
+        self.boss_bullets = pygame.sprite.Group()
+
+        self.reset()
+
+    def reset(self):
+        """
+        Start a fresh session: empty every group and rebuild player and field.
+        """
+        clear_groups(
+            self.updatable, self.drawable, self.asteroids, self.shots,
+            self.enemies, self.mikito_bullets, self.boss_bullets
+        )
+
+        self.bind_containers()
+
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, self.shoot_sound, self.input_source)
+        self.players = [self.player]  # Ships still in play; player is always players[0]
+        self.asteroid_field = AsteroidField(self.asteroids, self.enemies, self.player, self.mikito_bullets)
+
+        if DEV_MODE:
+            self.asteroid_field.level = SKIP_TO_LEVEL
+
+        self.score = 0
+        self.previous_level = 1
+        self.boss = None
+        self.boss_active = False
+        self.boss_defeated = False
+        self.god_mode = GOD_MODE
+        self.lives_lost = [0] * len(SOURCES)  # Per telemetry source code (statistics only)
+
+    def bind_containers(self):
+        """
+        Class-wide sprite group assignment: new sprites join this World's groups.
+        """
+        Player.containers = (self.updatable, self.drawable)
+        Asteroid.containers = (self.asteroids, self.updatable, self.drawable)
+        Shot.containers = (self.shots, self.updatable, self.drawable)
+        Enemy.containers = (self.enemies, self.updatable, self.drawable)
+        AsteroidField.containers = (self.updatable,)
+
+    def set_input(self, input_source):
+        """
+        Drive the Player from another input source (kept across resets).
+        """
+        self.input_source = input_source
+        self.player.input_source = input_source
+
+    def add_player(self, input_source):
+        """
+        Put another ship into the session (multiplayer). Score is shared.
+
+        Args:
+            input_source: What drives the new Player.
+
+        Returns:
+            Player: The new ship, appended to players.
+        """
+        if len(self.players) >= MAX_PLAYERS:
+            raise ValueError(f"at most {MAX_PLAYERS} players")
+        dx, dy = SPAWN_OFFSETS[len(self.players)]
+        player = Player(SCREEN_WIDTH / 2 + dx, SCREEN_HEIGHT / 2 + dy, self.shoot_sound, input_source)
+        player.disable_wrap = self.boss_active
+        self.players.append(player)
+        return player
+
+    def knock_out(self, player):
+        """
+        Take a ship that lost its final life out of play.
+
+        The last ship is never removed: losing it ends the session.
+
+        Returns:
+            str or None: GAME_OVER if no other ship is left.
+        """
+        if len(self.players) == 1:
+            return GAME_OVER
+        player.kill()
+        self.players.remove(player)
+        if player is self.player:
+            # Everything that chased the first ship follows the next one
+            self.player = self.players[0]
+            self.asteroid_field.player = self.player
+            for enemy in self.enemies:
+                enemy.player = self.player
+            if self.boss:
+                self.boss.player = self.player
+        return None
+
+    def entity_counts(self):
+        """
+        Snapshot of group sizes and progress, for diagnostics.
+
+        Returns:
+            dict: Counts per sprite group plus level and boss state.
+        """
+        return {
+            "asteroids": len(self.asteroids),
+            "shots": len(self.shots),
+            "enemies": len(self.enemies),
+            "mikito_bullets": len(self.mikito_bullets),
+            "boss_bullets": len(self.boss_bullets),
+            "updatable": len(self.updatable),
+            "drawable": len(self.drawable),
+            "level": self.asteroid_field.level,
+            "boss_active": self.boss_active,
+            "boss_health": self.boss.health if self.boss else None,
+        }
+
+    # --- Simulation ---
+
+    def step(self, dt):
+        """
+        Advance the world by one frame.
+
+        Args:
+            dt (float): Delta time in seconds.
+
+        Returns:
+            str or None: GAME_OVER, VICTORY, or None while the session continues.
+        """
+        with profiler.phase("update"):
+            self.update(dt)
+
+        if self.boss and self.boss.health <= 0 and not self.boss_defeated:
+            self.boss_defeated = True
+            for player in self.players:
+                player.disable_wrap = False
+            telemetry.emit(GAME_OVER_EVENT, self.score, self.asteroid_field.level, 1)
+            return VICTORY
+
+        # Score increase on level up
+        if self.asteroid_field.level > self.previous_level:
+            self.score += 500
+            self.previous_level = self.asteroid_field.level
+
+        with profiler.phase("collisions"):
+            outcome = self.handle_collisions()
+        if outcome == GAME_OVER:
+            telemetry.emit(GAME_OVER_EVENT, self.score, self.asteroid_field.level, 0)
+        return outcome
+
+    def update(self, dt):
+        """
+        Update the field (or trigger the boss) and every active sprite.
+
+        Args:
+            dt (float): Delta time in seconds.
+        """
+        if not self.boss_active and self.asteroid_field.level < BOSS_LEVEL:
+            self.asteroid_field.update(dt)
+        elif self.asteroid_field.level >= BOSS_LEVEL and not self.boss_active:
+            self.start_boss()
+
+        self.updatable.update(dt)
+        self.mikito_bullets.update(dt)
+        self.boss_bullets.update(dt)
+
+    def start_boss(self):
+        """
+        Replace the asteroid field with the final boss fight.
+        """
+        self.boss_active = True
+        self.boss = FinalBoss(self.player, self.enemies, self.boss_bullets, self.mikito_bullets)
+        telemetry.emit(BOSS_STAGE, 1, self.boss.health)
+        self.drawable.add(self.boss)
+        self.updatable.add(self.boss)
+        self.updatable.remove(self.asteroid_field)
+        clear_groups(self.asteroids, self.enemies, self.mikito_bullets)
+        for player in self.players:
+            player.disable_wrap = True
+
+    def hit_player(self, source, player=None):
+        """
+        Handle a damaging source touching a player.
+
+        Args:
+            source: Sprite that hit the player (killed on contact).
+            player (Player): Ship that was hit (default: the first one).
+
+        Returns:
+            bool: True if the player just lost their final life.
+        """
+        player = player or self.player
+        source.kill()
+        if not player.invincible and not self.god_mode:
+            lost_final_life = player.lose_life()
+            self.lives_lost[source_code(source)] += 1
+            assets.play_sound(self.explosion_sound)
+            telemetry.emit(HIT, player.position.x, player.position.y, source_code(source), player.lives)
+            return lost_final_life
+        return False
+
+    def collide_player(self, player):
+        """
+        Resolve everything that can touch one ship.
+
+        Args:
+            player (Player): Ship in play.
+
+        Returns:
+            str or None: GAME_OVER if it was the last ship and it ran out of lives.
+        """
+        boss = self.boss
+
+        # Asteroids vs Player
+        for asteroid in list(self.asteroids):
+            distance = player.position.distance_to(asteroid.position)
+            if distance < player.radius + asteroid.radius:
+                if player.invincible:
+                    push = player.position - asteroid.position
+                    if push.length() > 0:
+                        push.scale_to_length(10)
+                        player.position += push
+                elif self.hit_player(asteroid, player):
+                    return self.knock_out(player)
+
+        # Boss Bullets vs Player
+        for bullet in list(self.boss_bullets):
+            hit = (player.position.distance_to(bullet.position) < player.radius + max(bullet.get_rect().width, bullet.get_rect().height) / 2
+                   if hasattr(bullet, 'get_rect') else player.collide(bullet))
+            if hit and self.hit_player(bullet, player):
+                return self.knock_out(player)
+
+        # Mikito Bullets vs Player
+        for bullet in list(self.mikito_bullets):
+            if player.collide(bullet):
+                if getattr(bullet, 'is_dizzy', False):
+                    player.apply_dizzy()
+                    telemetry.emit(DIZZY, player.position.x, player.position.y)
+                elif self.hit_player(bullet, player):
+                    return self.knock_out(player)
+                bullet.kill()
+
+        # Boss vs Player
+        if boss and player.collide(boss):
+            if not player.invincible and not self.god_mode:
+                lost_final_life = player.lose_life()
+                self.lives_lost[source_code(boss)] += 1
+                assets.play_sound(self.explosion_sound)  # ✅ Play sound every time a life is lost
+                telemetry.emit(HIT, player.position.x, player.position.y, source_code(boss), player.lives)
+
+                if lost_final_life:
+                    return self.knock_out(player)
+
+            else:
+                push = player.position - boss.position
+                push.x = -abs(push.x) if push.x >= 0 else push.x
+                push.y *= 0.3
+                if push.length() > 0:
+                    push.scale_to_length(30)
+                    player.position += push
+
+        # Player vs Enemies
+        for enemy in list(self.enemies):
+            if player.collide(enemy):
+                player.push_back_from(enemy.position)
+
+        return None
+
+    def handle_collisions(self):
+        """
+        Resolve every collision pair for this frame.
+
+        Returns:
+            str or None: GAME_OVER if the last player ran out of lives, else None.
+        """
+        for player in list(self.players):
+            if self.collide_player(player) == GAME_OVER:
+                return GAME_OVER
+
+        boss = self.boss
+
+        # Shots vs Asteroids
+        for shot in list(self.shots):
+            for asteroid in list(self.asteroids):
+                if shot.alive() and asteroid.alive() and asteroid.collide(shot):
+                    asteroid.split()
+                    shot.kill()
+                    self.score += 100
+                    break
+
+        # Shots vs Enemies
+        for shot in list(self.shots):
+            for enemy in list(self.enemies):
+                if shot.alive() and enemy.alive() and enemy.collide(shot):
+                    enemy.kill()
+                    shot.kill()
+                    self.score += 250
+                    telemetry.emit(KILL, enemy.position.x, enemy.position.y, source_code(enemy), self.score)
+                    break
+
+        # Shots vs Mikito Bullets
+        for shot in list(self.shots):
+            for bullet in list(self.mikito_bullets):
+                if shot.alive() and bullet.alive() and bullet.collide(shot):
+                    bullet.kill()
+                    shot.kill()
+                    self.score += 10
+                    telemetry.emit(KILL, bullet.position.x, bullet.position.y, source_code(bullet), self.score)
+                    break
+
+        # Shots vs Boss Bullets / Boss
+        for shot in list(self.shots):
+            for bullet in list(self.boss_bullets):
+                if shot.alive() and bullet.alive() and hasattr(bullet, 'health') and bullet.collide(shot):
+                    bullet.health -= 1
+                    shot.kill()
+                    self.score += 20
+                    if bullet.health <= 0:
+                        bullet.kill()
+                        telemetry.emit(KILL, bullet.position.x, bullet.position.y, source_code(bullet), self.score)
+
+            if boss and shot.alive() and boss.collide(shot):
+                boss.take_damage(1)
+                shot.kill()
+                self.score += 100
+
+        return None
+
+    # --- Rendering ---
+
+    def draw(self, screen, font, life_icon):
+        """
+        Draw every sprite, the arena walls and the HUD (no background, no flip).
+
+        Args:
+            screen (Surface): Target surface.
+            font (Font): HUD font.
+            life_icon (Surface): Small ship icon for remaining lives.
+        """
+        for sprite in self.drawable:
+            sprite.draw(screen)
+        for bullet in self.mikito_bullets:
+            bullet.draw(screen)
+        for bullet in self.boss_bullets:
+            bullet.draw(screen)
+
+        # Draw Arena Walls during Boss Fight
+        if self.boss_active and not self.boss_defeated:
+            wall_color = (255, 100, 100)
+            wall_width = 6
+            pygame.draw.line(screen, wall_color, (0, 0), (0, SCREEN_HEIGHT), wall_width)
+            pygame.draw.line(screen, wall_color, (SCREEN_WIDTH - 1, 0), (SCREEN_WIDTH - 1, SCREEN_HEIGHT), wall_width)
+            pygame.draw.line(screen, wall_color, (0, 0), (SCREEN_WIDTH, 0), wall_width)
+            pygame.draw.line(screen, wall_color, (0, SCREEN_HEIGHT - 1), (SCREEN_WIDTH, SCREEN_HEIGHT - 1), wall_width)
+
+        # UI Info
+        screen.blit(font.render(f"Level {self.asteroid_field.level}", True, (255, 255, 0)), (10, 10))
+        screen.blit(font.render(f"Score: {self.score}", True, (255, 255, 255)), (SCREEN_WIDTH - 150, 10))
+        for row, player in enumerate(self.players):
+            for i in range(player.lives):
+                screen.blit(life_icon, (10 + i * (24 + 5), 40 + row * (24 + 5)))